@@ -1,29 +1,40 @@
-import pandas as pd
-import numpy as np
 import os
 from src.config import get_analysis_filename
+from src.analysis.market_summary import overall_stats
+from src.storage.summary_store import load_market_summary
+from src.storage.market_store import find_store_file
+
+# Overall statistics are reported for these fields (AskSum = UpAsk + DownAsk, the summary's PairCost)
+METRIC_COLUMNS = {
+    'UpAsk': 'UpAsk', 'DownAsk': 'DownAsk', 'UpBid': 'UpBid', 'DownBid': 'DownBid',
+    'UpAskLiquidity': 'UpAskLiquidity', 'DownAskLiquidity': 'DownAskLiquidity', 'AskSum': 'PairCost',
+}
 
 def analyze_market_data(filename):
     """
     Analyzes market data from a CSV file, providing summary statistics,
     and resolution analysis.
+
+    --- OPTIMIZATION: Read from the per-market summary ---
+    Every figure comes from the file's market summary (one row per market,
+    kept up to date by the data logger or built once and cached), so a
+    repeat analysis no longer re-reads and regroups every tick.
     """
-    if not os.path.exists(filename):
+    if not os.path.exists(filename) and find_store_file(filename) is None:
         print(f"Error: The file {filename} was not found.")
         return
 
     print(f"Analyzing market data from: {filename}\n")
 
     try:
-        # Load the data using pandas
-        df = pd.read_csv(filename)
+        summary = load_market_summary(filename)
     except Exception as e:
         print(f"Error loading CSV file: {e}")
         return
 
     # --- Overall Statistics ---
-    total_rows = len(df)
-    unique_markets = df['Expiration'].nunique()
+    total_rows = int(summary['Ticks'].sum())
+    unique_markets = summary['Expiration'].nunique()
 
     print("--- Overall Summary ---")
     print(f"Total data points (rows): {total_rows}")
@@ -32,34 +43,12 @@ def analyze_market_data(filename):
 
     # --- Resolution Analysis ---
     if unique_markets > 0:
-        resolved_up = 0
-        resolved_down = 0
-        resolved_up_markets = []
-        resolved_down_markets = []
-
-        # Group by market expiration to identify individual markets
-        market_groups = df.groupby('Expiration')
-
-        for name, group in market_groups:
-            # Get the last available data point for the market
-            last_record = group.sort_values(by='Timestamp').iloc[-1]
-            
-            up_price = last_record['UpAsk']
-            down_price = last_record['DownAsk']
-
-            # Determine resolution based on the final prices using the new logic
-            if up_price == 0:
-                resolved_up += 1
-                resolved_up_markets.append(name)
-            elif down_price == 0:
-                resolved_down += 1
-                resolved_down_markets.append(name)
-            elif down_price > up_price:
-                resolved_down += 1
-                resolved_down_markets.append(name)
-            else:  # up_price >= down_price (and neither is 0)
-                resolved_up += 1
-                resolved_up_markets.append(name)
+        # The summary resolves each market from its final asks, like the outcome table
+        market_names = summary['Expiration'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        resolved_up_markets = market_names[summary['WinningSide'] == 'Up'].tolist()
+        resolved_down_markets = market_names[summary['WinningSide'] == 'Down'].tolist()
+        resolved_up = len(resolved_up_markets)
+        resolved_down = len(resolved_down_markets)
 
         print("--- Market Resolution Summary ---")
         print(f"Markets likely resolved 'Up': {resolved_up}")
@@ -77,29 +66,14 @@ def analyze_market_data(filename):
 
 
     # --- Price & Liquidity Analysis ---
-    metrics = {
-        'UpAsk': ['min', 'max', 'mean', 'std'],
-        'DownAsk': ['min', 'max', 'mean', 'std'],
-        'UpBid': ['min', 'max', 'mean', 'std'],
-        'DownBid': ['min', 'max', 'mean', 'std'],
-        'UpAskLiquidity': ['min', 'max', 'mean', 'std'],
-        'DownAskLiquidity': ['min', 'max', 'mean', 'std'],
-    }
-    
-    # Add a column for the sum of 'UpAsk' and 'DownAsk'
-    df['AskSum'] = df['UpAsk'] + df['DownAsk']
-    metrics['AskSum'] = ['min', 'max', 'mean', 'std']
-
-
     print("--- Detailed Metrics ---")
     
-    # Calculate and print statistics for each specified column
-    for col, stats in metrics.items():
-        if col in df.columns:
+    # Statistics for each field are combined from its per-market min/max/sums
+    for col, field in METRIC_COLUMNS.items():
+        if summary[f'{field}Sum'].notna().any():
             print(f"\nStatistics for '{col}':")
             try:
-                # Using .agg() to compute all stats at once
-                result = df[col].agg(stats)
+                result = overall_stats(summary, field)
                 for stat_name, value in result.items():
                     print(f"  - {stat_name.capitalize()}: {value:.4f}")
             except Exception as e:
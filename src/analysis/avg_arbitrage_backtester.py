@@ -13,23 +13,22 @@ def main():
         max_capital_allocation_percentage=0.70
     )
 
-    # Initialize backtester
-    backtester = Backtester()
+    # Initialize backtester (the with block detaches its log handlers at the end)
+    with Backtester() as backtester:
+        # Load data using the centralized config (a date range when one is set)
+        try:
+            date_range = config.get_analysis_date_range()
+            print(f"Running backtest on dataset: {date_range or config.get_analysis_filename()}")
+            backtester.load_analysis_data()
+        except FileNotFoundError as e:
+            print(f"Failed to load data: {e}")
+            return
 
-    # Load data using the centralized config function
-    try:
-        data_file = config.get_analysis_filename()
-        print(f"Running backtest on dataset: {data_file}")
-        backtester.load_data(data_file)
-    except FileNotFoundError as e:
-        print(f"Failed to load data: {e}")
-        return
+        # Run backtest
+        backtester.run_strategy(strategy)
 
-    # Run backtest
-    backtester.run_strategy(strategy)
-
-    # Generate and print the report
-    backtester.generate_report()
+        # Generate and print the report
+        backtester.generate_report()
 
 if __name__ == "__main__":
     main()
@@ -7,57 +7,166 @@ from collections import deque
 from decimal import Decimal
 import logging
 import inspect
+import itertools
+import weakref
+from bisect import bisect_left
+import numpy as np
+from .columnar import ColumnarFrame, RowView
+from .price_index import MarketPriceIndex
+from src.market_frames import MarketRegistry, MARKET_ID_COLUMN
+from src.storage.market_store import find_store_file, load_market_data
+from src.storage.market_index import MarketIndex, load_date_range
+from .feature_cache import cached_preprocess
+from .data_quality import flag_mask, load_quality_mask, quality_settings, scan_quality
+from .outcomes import build_outcome_table, load_outcome_table, outcomes_by_market
+from .position_book import PositionBook
+from .trade_journal import TradeJournal
+from .ledger import TransactionLedger, BUY, RESOLUTION, SIDES
+from .streaming import MarketDataStream, STREAM_CHUNK_ROWS, STREAM_LOOKAHEAD_SECONDS
 
 DATA_FILE = config.get_analysis_filename()
 
 # Global Configuration Variables
 INITIAL_CAPITAL = config.INITIAL_CAPITAL
 
+# Execution engines accepted by Backtester.run_strategy
+ENGINES = ('columnar', 'pandas')
+
+# Run-log verbosity accepted by Backtester(log_mode=...):
+#   'full'    - every trade, resolution and strategy attribute in the text log
+#   'summary' - configuration, market summaries and the report only
+#   'journal' - 'summary' plus a JSONL trade journal written by a background thread
+#   'off'     - no log files at all (console output is unaffected)
+LOG_MODES = ('full', 'summary', 'journal', 'off')
+
+# Every Backtester logs through these two loggers. Each instance tags its
+# records with a run id and its handlers only accept records with that id.
+FILE_LOGGER_NAME = 'BacktesterFileLogger'
+CONSOLE_LOGGER_NAME = 'BacktesterConsoleLogger'
+_run_ids = itertools.count()
+
+
+class _RunLogger(logging.LoggerAdapter):
+    """
+    One Backtester's view of a shared module-level logger.
+
+    `handlers` lists only the handlers this instance attached, and
+    `disabled` silences only this instance, so several Backtesters can log
+    side by side without writing into each other's files.
+    """
+
+    def __init__(self, name, run_id):
+        super().__init__(logging.getLogger(name), {'backtester_run': run_id})
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handlers = []
+        self.disabled = False
+
+    def isEnabledFor(self, level):
+        return not self.disabled and self.logger.isEnabledFor(level)
+
+    def addHandler(self, handler):
+        run_id = self.extra['backtester_run']
+        handler.addFilter(lambda record: getattr(record, 'backtester_run', None) == run_id)
+        self.logger.addHandler(handler)
+        self.handlers.append(handler)
+
+    def removeHandler(self, handler):
+        self.logger.removeHandler(handler)
+        self.handlers.remove(handler)
+
+
+def _detach_handlers(run_loggers):
+    for run_logger in run_loggers:
+        for handler in list(run_logger.handlers):
+            run_logger.removeHandler(handler)
+            handler.close()
+
 
 class Backtester:
-    def __init__(self, initial_capital=INITIAL_CAPITAL, slippage_seconds=config.SLIPPAGE_SECONDS):
+    def __init__(self, initial_capital=INITIAL_CAPITAL, slippage_seconds=config.SLIPPAGE_SECONDS, log_mode=config.BACKTEST_LOG_MODE):
+        if log_mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode '{log_mode}'. Expected one of: {', '.join(LOG_MODES)}")
         self.initial_capital = initial_capital
-        self.capital = initial_capital
         self.slippage_seconds = slippage_seconds
-        self.transactions = [] # List of (timestamp, type, market_id, side, quantity, price, value, PnL)
-        self.open_positions = [] # Changed to a list to allow multiple open positions per market
         self.market_data = pd.DataFrame()
-        self.market_history = {} # Stores historical data grouped by market for resolution
-        self.pending_market_summaries = {} # Key: market_id_tuple, Value: list of resolved_position_info dictionaries
-        self.transactions_by_market = {} # OPTIMIZATION: Store transactions grouped by market
-        
+        self.market_registry = MarketRegistry() # Interned MarketId <-> (TargetTime, Expiration)
+        self.price_index = MarketPriceIndex() # Per-market sorted timestamps + ask arrays for slippage lookups
+        self.market_outcomes = {} # Key: MarketId, Value: outcome record (WinningSide, final asks, ResolutionTimestamp)
+        self.show_progress = True # Print the progress line while running
+        self._columnar_frame = None # (source DataFrame, ColumnarFrame) reused across runs on the same data
+        self.data_source = None # (data files, selection) the market data was loaded from, for the feature cache
+        self.reset()
+
+        self.log_mode = log_mode
+        self._log_details = log_mode == 'full' # Per-trade text lines; checked before formatting them
+        self.journal = None
+        self._setup_logging()
+
+    def reset(self):
+        """
+        Clears all run state (capital, positions, transactions, risk tracking)
+        while keeping the loaded market data and its indices, so the same
+        Backtester can run several strategies back to back.
+        """
+        self.capital = self.initial_capital
+        self.ledger = TransactionLedger(market_registry=self.market_registry) # Array-backed (timestamp, type, market, side, quantity, price, value, PnL) log
+        self.position_book = PositionBook() # Open lots netted per (market, side), heap-ordered by expiration
+        self.pending_market_summaries = {} # Key: MarketId, Value: list of resolved_position_info dictionaries
+
         # Risk tracking (from risk_engine.py)
         self.max_drawdown = 0.0
         self.portfolio_history = []  # Tracks (timestamp, capital) after each market resolution
         self.risk_events = []  # Track risk-related events
 
-        self._setup_logging()
-
     def _setup_logging(self):
-        """Sets up timestamped file logging and a console logger."""
-        os.makedirs('logs', exist_ok=True)
+        """Sets up timestamped file logging (per `log_mode`) and a console logger."""
         run_timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_filename = f'logs/backtest_run_{run_timestamp}.log'
+
+        run_id = next(_run_ids)
 
         # File Logger (detailed logs)
-        self.logger = logging.getLogger(f'BacktesterFileLogger_{id(self)}')
-        self.logger.setLevel(logging.INFO)
-        file_handler = logging.FileHandler(log_filename)
-        file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
-        self.logger.propagate = False
+        self.logger = _RunLogger(FILE_LOGGER_NAME, run_id)
+        if self.log_mode == 'off':
+            self.logger.disabled = True
+        else:
+            os.makedirs(config.BACKTEST_LOG_DIR, exist_ok=True)
+            file_handler = logging.FileHandler(os.path.join(config.BACKTEST_LOG_DIR, f'backtest_run_{run_timestamp}.log'))
+            file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(file_formatter)
+            self.logger.addHandler(file_handler)
+
+        if self.log_mode == 'journal':
+            self.journal = TradeJournal(os.path.join(config.BACKTEST_LOG_DIR, f'backtest_journal_{run_timestamp}.jsonl'))
 
         # Console Logger (for progress and summaries)
-        self.console_logger = logging.getLogger(f'BacktesterConsoleLogger_{id(self)}')
-        self.console_logger.setLevel(logging.INFO)
+        self.console_logger = _RunLogger(CONSOLE_LOGGER_NAME, run_id)
         console_handler = logging.StreamHandler()
         console_formatter = logging.Formatter('%(message)s')
         console_handler.setFormatter(console_formatter)
         self.console_logger.addHandler(console_handler)
-        self.console_logger.propagate = False
+        # Handlers live on the shared loggers, so detach them even if close() is never called
+        self._detach_logs = weakref.finalize(self, _detach_handlers, (self.logger, self.console_logger))
 
-        self.logger.info(f"Logging initialized for backtest run: {run_timestamp}")
+        self.logger.info(f"Logging initialized for backtest run: {run_timestamp} (mode: {self.log_mode})")
+
+    @property
+    def transactions(self):
+        """The ledger as a list of transaction dicts (built on access; use `ledger` in hot code)."""
+        return self.ledger.to_records()
+
+    def close(self):
+        """Flushes and detaches every log handler opened by this Backtester."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self._detach_logs()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _log_and_print(self, message, level='info'):
         """Logs a message to the file and prints it to the console."""
@@ -69,99 +178,201 @@ class Backtester:
         self.console_logger.info(message)
 
     def load_data(self, file_path):
-        if not os.path.exists(file_path):
+        if not os.path.exists(file_path) and find_store_file(file_path) is None:
             self.logger.error(f"Data file not found at {file_path}")
             raise FileNotFoundError(f"Data file not found at {file_path}")
         
-        date_columns = ['Timestamp', 'TargetTime', 'Expiration']
-        self.market_data = pd.read_csv(file_path, parse_dates=date_columns)
+        # Reads the typed columnar copy when one has been converted, else parses the CSV
+        self.market_data = load_market_data(file_path, profile=config.LOAD_PROFILE)
+        # Outcomes are resolved from every tick, including any skipped below
+        outcome_table = load_outcome_table(file_path, self.market_data)
+        if config.QUALITY_SKIP_FLAGS:
+            self.market_data = self._skip_flagged_rows(self.market_data, load_quality_mask(file_path, self.market_data))
+        self.market_data.sort_values(by='Timestamp', kind='stable', inplace=True)
+
+        self.set_market_data(self.market_data, outcome_table)
+        self.data_source = ([file_path], self._quality_selection(None))
+        self.logger.info(f"Loaded {len(self.market_data)} data points from {file_path} ({self._memory_summary()})")
+
+    def load_date_range(self, start_date=None, end_date=None, market=None):
+        """
+        Loads every market logged in the daily files from `start_date` to
+        `end_date` (yyyymmdd, inclusive, either may be None), or only `market`,
+        a (TargetTime, Expiration) pair. Rows are read through the market
+        index, so only the requested markets' rows are decoded, and each market
+        is loaded whole even if it spills into a neighbouring day's file.
+        """
+        market_data = load_date_range(start_date, end_date, market, profile=config.LOAD_PROFILE)
+        if market_data.empty:
+            self.logger.error(f"No market data found between {start_date} and {end_date}")
+            raise FileNotFoundError(f"No market data found between {start_date} and {end_date}")
+        outcome_table = None
+        if config.QUALITY_SKIP_FLAGS:
+            outcome_table = build_outcome_table(market_data)
+            market_data = self._skip_flagged_rows(market_data, scan_quality(market_data))
+        market_data = market_data.sort_values(by='Timestamp', kind='stable')
+        self.set_market_data(market_data, outcome_table)
+        self.data_source = (MarketIndex.files_for_dates(start_date, end_date),
+                            self._quality_selection((start_date, end_date, market)))
+        self.logger.info(f"Loaded {len(market_data)} data points for {start_date} to {end_date} ({self._memory_summary()})")
+
+    def _skip_flagged_rows(self, market_data, quality_mask):
+        """
+        Drops the rows carrying any of config.QUALITY_SKIP_FLAGS (see
+        data_quality.py), so strategies never see them.
 
-        for col in date_columns:
-            self.market_data[col] = self.market_data[col].dt.tz_localize('UTC')
-        
-        self.market_data.sort_values(by='Timestamp', inplace=True)
+        --- OPTIMIZATION: Precomputed quality mask ---
+        Bad ticks are removed with one boolean index over a cached per-row
+        flag array, instead of every strategy re-checking its fields per row.
+        """
+        keep = (quality_mask & flag_mask(config.QUALITY_SKIP_FLAGS)) == 0
+        if keep.all():
+            return market_data
+        self.logger.info(f"Skipping {len(keep) - int(keep.sum())} rows flagged {', '.join(config.QUALITY_SKIP_FLAGS)}")
+        return market_data[keep].reset_index(drop=True)
+
+    def _quality_selection(self, selection):
+        """Adds the skipped quality flags to a feature cache selection, since they change the rows."""
+        if not config.QUALITY_SKIP_FLAGS:
+            return selection
+        return (selection, ('quality', tuple(config.QUALITY_SKIP_FLAGS), quality_settings()))
+
+    def _memory_summary(self):
+        return f"{self.market_data.memory_usage(deep=True).sum() / 1e6:.1f} MB, {config.LOAD_PROFILE} profile"
+
+    def load_analysis_data(self):
+        """Loads the configured analysis range (config.ANALYSIS_START_DATE/END_DATE), else the single analysis file."""
+        date_range = config.get_analysis_date_range()
+        if date_range is None:
+            self.load_data(config.get_analysis_filename())
+        else:
+            self.load_date_range(*date_range)
 
-        grouped_by_market = self.market_data.groupby(['TargetTime', 'Expiration'])
-        self.market_history = {market_id: group for market_id, group in grouped_by_market}
+    def preprocess(self, preprocessors):
+        """
+        Replaces the loaded market data with the output of the feature steps
+        `preprocessors`. Results are reused from the feature cache (see
+        feature_cache.py) when the same data was preprocessed before.
+        """
+        start_time = time.perf_counter()
+        data_files, selection = self.data_source or ([], None)
+        self.market_data = cached_preprocess(self.market_data, preprocessors, data_files, selection, self.market_registry)
+        self.logger.info(f"Preprocessed {len(self.market_data)} data points in {time.perf_counter() - start_time:.2f}s")
 
-        self.logger.info(f"Loaded {len(self.market_data)} data points from {file_path}")
+    def set_market_data(self, market_data, outcome_table=None):
+        """
+        Installs an already-parsed, Timestamp-sorted market DataFrame, labels
+        every row with an interned integer MarketId, and rebuilds the slippage
+        index and outcome lookup from it. The outcome table is built from
+        `market_data` unless a precomputed one is given.
+        """
+        self.market_registry.add_column(market_data)
+        self.market_data = market_data
+        self.price_index = MarketPriceIndex.from_frame(market_data, market_columns=(MARKET_ID_COLUMN,))
+        if outcome_table is None:
+            outcome_table = build_outcome_table(market_data)
+        self.market_outcomes = outcomes_by_market(outcome_table, self.market_registry)
+        self._columnar_frame = None
+        self.data_source = None
+
+    def _resolve_single_position(self, market_id, position, current_timestamp):
+        """
+        Resolves the netted position held on one side of an expired market and
+        returns its PnL details. `position` is a PositionBook aggregate.
+        """
+        avg_entry_price = position['cost'] / position['quantity'] if position['quantity'] else 0.0
 
-    def _resolve_single_position(self, market_id_tuple, position, current_timestamp):
-        """Resolves a single expired market position and returns its PnL details."""
-        if market_id_tuple not in self.market_history:
-            self.logger.warning(f"Market ID {market_id_tuple} not found in market history for resolution.")
-            return {'pnl': 0, 'winning_side': 'Error'} 
+        # --- OPTIMIZATION: Outcome lookup ---
+        # The winner of every market is computed once at load time (see outcomes.py),
+        # so resolving a position is a dict lookup instead of slicing the market's data.
+        outcome = self.market_outcomes.get(market_id)
+        if outcome is None:
+            self.logger.warning(f"Market ID {self.market_registry[market_id]} not found in market outcomes for resolution.")
+            return {
+                'market_id': market_id, 'side': position['side'], 'quantity': position['quantity'],
+                'entry_price': avg_entry_price, 'cost': position['cost'], 'pnl': 0, 'winning_side': 'Error'
+            }
 
-        market_specific_data = self.market_history[market_id_tuple]
-        last_dp = market_specific_data.iloc[-1]
+        winning_side = outcome['WinningSide']
 
-        winning_side = None
-        up_ask = last_dp.get('UpAsk', last_dp.get('UpPrice', 0))
-        down_ask = last_dp.get('DownAsk', last_dp.get('DownPrice', 0))
-        
-        if up_ask == 0:
-            winning_side = 'Up'
-        elif down_ask == 0:
-            winning_side = 'Down'
-        elif down_ask > up_ask:
-            winning_side = 'Down'
-        else:
-            winning_side = 'Up'
-        
-        pnl = 0
         if position['side'] == winning_side:
-            pnl = position['quantity'] * (1 - position['entry_price'])
+            pnl = position['win_pnl']
+            winning_lots = position['winning_lots_if_won']
             self.capital += position['quantity']
         else:
-            pnl = - (position['quantity'] * position['entry_price'])
+            pnl = position['loss_pnl']
+            winning_lots = position['winning_lots_if_lost']
+
+        self.ledger.append(
+            current_timestamp, 'Resolution', market_id, position['side'], position['quantity'],
+            avg_entry_price, position['cost'], pnl, winning_side=winning_side,
+            lots=position['lots'], winning_lots=winning_lots
+        )
+        if self.journal is not None:
+            self.journal.record({
+                'type': 'Resolution', 'timestamp': current_timestamp, 'market_id': self.market_registry[market_id],
+                'side': position['side'], 'quantity': position['quantity'], 'avg_entry_price': avg_entry_price,
+                'lots': position['lots'], 'pnl': pnl, 'winning_side': winning_side
+            })
+        if self._log_details:
+            self.logger.info(f"RESOLUTION: {current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} Side: {position['side']}, Quantity: {position['quantity']}, AvgEntryPrice: {avg_entry_price:.4f}, Lots: {position['lots']}, PnL: {pnl:.2f}")
 
-        resolution_log_entry = {
-            'Timestamp': current_timestamp, 'Type': 'Resolution', 'MarketID': market_id_tuple,
-            'Side': position['side'], 'Quantity': position['quantity'], 'EntryPrice': position['entry_price'],
-            'Value': position['quantity'] * position['entry_price'], 'PnL': pnl, 'WinningSide': winning_side
-        }
-        self.transactions.append(resolution_log_entry)
-        self.transactions_by_market.setdefault(market_id_tuple, []).append(resolution_log_entry)
-        self.logger.info(f"RESOLUTION: {current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} Side: {position['side']}, Quantity: {position['quantity']}, EntryPrice: {position['entry_price']}, PnL: {pnl:.2f}")
-        
         return {
-            'market_id': market_id_tuple, 'side': position['side'], 'quantity': position['quantity'],
-            'entry_price': position['entry_price'], 'pnl': pnl, 'winning_side': winning_side
+            'market_id': market_id, 'side': position['side'], 'quantity': position['quantity'],
+            'entry_price': avg_entry_price, 'cost': position['cost'], 'pnl': pnl, 'winning_side': winning_side
         }
 
-    def _print_market_summary(self, market_id_tuple, resolved_positions_data):
-        """Logs and prints a consolidated summary for a fully resolved market."""
-        market_id_formatted = f"({market_id_tuple[0].strftime('%Y-%m-%d %H:%M:%S')}, {market_id_tuple[1].strftime('%Y-%m-%d %H:%M:%S')})"
+    def _resolve_market(self, market_id, positions, current_timestamp):
+        """Resolves every netted side held in one market and queues its summary."""
+        for position in positions:
+            resolved_info = self._resolve_single_position(market_id, position, current_timestamp)
+            self.pending_market_summaries.setdefault(market_id, []).append(resolved_info)
+
+    def _print_market_summaries(self):
+        """
+        Logs a summary for every market queued in `pending_market_summaries`.
+
+        --- OPTIMIZATION: Grouped ledger reductions ---
+        Per-market execution stats (trade count, size, first/last fill) come
+        from one grouped pass over the ledger arrays, and the portfolio value
+        after resolution is a binary search over `portfolio_history`.
+        """
+        buy_stats = self.ledger.buy_stats_by_market()
+        history_timestamps = [ts for ts, _ in self.portfolio_history]
+        for market_id, resolved_positions_data in self.pending_market_summaries.items():
+            market = self.market_registry[market_id]
+            history_position = bisect_left(history_timestamps, market[1])
+            portfolio_value = self.portfolio_history[history_position][1] if history_position < len(history_timestamps) else None
+            self._print_market_summary(market, resolved_positions_data, buy_stats.get(market_id), portfolio_value)
+
+    def _print_market_summary(self, market, resolved_positions_data, buy_stats, portfolio_value_at_resolution):
+        """
+        Logs a consolidated summary for a fully resolved market. `market` is its
+        (TargetTime, Expiration) tuple and `buy_stats` its
+        (n_buys, total_quantity, first_ns, last_ns) ledger entry.
+        """
+        market_id_formatted = f"({market[0].strftime('%Y-%m-%d %H:%M:%S')}, {market[1].strftime('%Y-%m-%d %H:%M:%S')})"
 
         total_up_shares, total_up_cost, total_down_shares, total_down_cost, total_market_pnl = 0, 0.0, 0, 0.0, 0.0
         for res in resolved_positions_data:
             total_market_pnl += res['pnl']
             if res['side'] == 'Up':
                 total_up_shares += res['quantity']
-                total_up_cost += res['quantity'] * res['entry_price']
+                total_up_cost += res['cost']
             else:
                 total_down_shares += res['quantity']
-                total_down_cost += res['quantity'] * res['entry_price']
+                total_down_cost += res['cost']
         
         avg_up_price = total_up_cost / total_up_shares if total_up_shares > 0 else 0.0
         avg_down_price = total_down_cost / total_down_shares if total_down_shares > 0 else 0.0
 
-        # --- OPTIMIZATION: Use pre-grouped transactions ---
-        # Instead of searching the global transactions list, this pulls from a pre-grouped
-        # dictionary, which is significantly faster.
-        market_buy_txs = [
-            t for t in self.transactions_by_market.get(market_id_tuple, [])
-            if t['Type'] == 'Buy'
-        ]
-        total_trades = len(market_buy_txs)
-        avg_trade_size = sum(t['Quantity'] for t in market_buy_txs) / total_trades if total_trades > 0 else 0
+        total_trades, total_quantity, first_ns, last_ns = buy_stats if buy_stats else (0, 0, 0, 0)
+        avg_trade_size = total_quantity / total_trades if total_trades > 0 else 0
         
         avg_time_between_trades_str = "N/A"
         if total_trades > 1:
-            market_buy_txs.sort(key=lambda x: x['Timestamp'])
-            timestamps = [t['Timestamp'] for t in market_buy_txs]
-            time_diffs = [(timestamps[i] - timestamps[i-1]).total_seconds() for i in range(1, len(timestamps))]
-            avg_seconds = sum(time_diffs) / len(time_diffs)
+            # The mean gap between consecutive fills is the span divided by the number of gaps.
+            avg_seconds = (last_ns - first_ns) / 1_000_000_000 / (total_trades - 1)
             avg_time_between_trades_str = f"{avg_seconds:.1f}s" if avg_seconds < 60 else f"{int(avg_seconds // 60)}m {int(avg_seconds % 60)}s"
 
         summary_lines = [
@@ -171,8 +382,6 @@ class Backtester:
             f"Down Shares: {total_down_shares}, Avg Entry Price: ${avg_down_price:.2f}"
         ]
 
-        resolution_timestamp = market_id_tuple[1]
-        portfolio_value_at_resolution = next((capital for ts, capital in self.portfolio_history if ts >= resolution_timestamp), None)
         if portfolio_value_at_resolution is not None:
              summary_lines.append(f"Portfolio Value After Resolution: ${portfolio_value_at_resolution:.2f}")
 
@@ -200,46 +409,65 @@ class Backtester:
                 max_drawdown = drawdown
         return max_drawdown
 
-    def _apply_slippage(self, current_timestamp, market_id_tuple, side, entry_price):
+    def _apply_slippage(self, current_timestamp, market_id, side, entry_price):
         """
         Applies slippage to the entry price by looking ahead in the data.
 
-        --- OPTIMIZATION: Use pre-grouped market history ---
-        Instead of filtering the entire `market_data` DataFrame on every call,
-        this optimized version performs a lookup in the `market_history` dictionary,
-        which is pre-grouped by market. This dramatically reduces the search space
-        from the whole dataset to just the relevant market's data, leading to a
-        significant performance improvement, especially with large datasets.
+        --- OPTIMIZATION: Binary search over a pre-built price index ---
+        `load_data` builds a MarketPriceIndex holding each market's sorted int64
+        timestamps and ask arrays, so finding the first data point at or after
+        the slippage timestamp is a `searchsorted` call instead of a boolean
+        mask over the market's DataFrame. Each trade now costs O(log n) in the
+        market's length rather than O(n).
         """
         if self.slippage_seconds <= 0:
             return entry_price
-        slippage_timestamp = current_timestamp + pd.Timedelta(seconds=self.slippage_seconds)
-
-        market_specific_data = self.market_history.get(market_id_tuple)
-        if market_specific_data is None:
-            return entry_price # Should not happen if data is consistent
-
-        # Find the first data point at or after the slippage_timestamp within the specific market
-        future_data = market_specific_data[market_specific_data['Timestamp'] >= slippage_timestamp]
+        slippage_timestamp_ns = current_timestamp.value + round(self.slippage_seconds * 1_000_000_000)
+        market_id = self.market_registry.to_id(market_id)
+        return self.price_index.first_price_at_or_after(market_id, side, slippage_timestamp_ns, entry_price)
 
-        if not future_data.empty:
-            slippage_row = future_data.iloc[0]
-            price_col = 'UpAsk' if side == 'Up' else 'DownAsk'
-            slipped_price = slippage_row.get(price_col, entry_price)
-            if slipped_price > 0:
-                return slipped_price
-        return entry_price
+    def apply_slippage_batch(self, fills):
+        """
+        Prices a list of fills at once.
 
-    def run_strategy(self, strategy_instance):
+        `fills` is an iterable of (timestamp, market_id, side, entry_price)
+        tuples, where market_id is a MarketId or a (TargetTime, Expiration)
+        tuple. Returns the slipped entry prices in the same order, computed
+        with one vectorized binary search per (market, side).
+        """
+        fills = list(fills)
+        prices = [entry_price for _, _, _, entry_price in fills]
+        if self.slippage_seconds <= 0 or not fills:
+            return prices
+
+        offset_ns = round(self.slippage_seconds * 1_000_000_000)
+        positions_by_key = {}
+        for position, (_, market_id, side, _) in enumerate(fills):
+            positions_by_key.setdefault((self.market_registry.to_id(market_id), side), []).append(position)
+
+        for (market_id, side), positions in positions_by_key.items():
+            timestamps_ns = [fills[p][0].value + offset_ns for p in positions]
+            defaults = [prices[p] for p in positions]
+            slipped = self.price_index.price_fills(market_id, side, timestamps_ns, defaults)
+            for p, price in zip(positions, slipped.tolist()):
+                prices[p] = price
+        return prices
+
+    def _log_run_configuration(self, strategy_instance, engine):
         # --- Parameter Logging ---
         self.logger.info("--- Backtest Configuration ---")
         self.logger.info(f"Initial Capital: ${self.initial_capital}")
         self.logger.info(f"Slippage (seconds): {self.slippage_seconds}")
+        self.logger.info(f"Engine: {engine}")
         # Note: Data file used is logged during load_data
 
         self.logger.info("\n--- Strategy Parameters ---")
         self.logger.info(f"Strategy Class: {strategy_instance.__class__.__name__}")
 
+        if not self._log_details:
+            self.logger.info("----------------------------\n")
+            return
+
         # Get all attributes of the strategy instance
         strategy_params = inspect.getmembers(strategy_instance, lambda a: not(inspect.isroutine(a)))
 
@@ -250,6 +478,70 @@ class Backtester:
              self.logger.info(f"  {param}: {value}")
         self.logger.info("----------------------------\n")
 
+    def _print_progress(self, i, n_unique_timestamps, start_time):
+        if not self.show_progress:
+            return
+        if n_unique_timestamps > 50 and (i + 1) % (n_unique_timestamps // 50) == 0:
+            elapsed_time = time.time() - start_time
+            progress = (i + 1) / n_unique_timestamps
+            eta = (elapsed_time / progress) * (1 - progress) if progress > 0 else 0
+            print(f"\r  -> Progress: {progress:.0%}, "
+                  f"Elapsed: {datetime.timedelta(seconds=int(elapsed_time))}, "
+                  f"ETA: {datetime.timedelta(seconds=int(eta))}", end="")
+
+    def _resolve_expired_positions(self, current_timestamp):
+        """
+        Resolves every open position whose market has expired at `current_timestamp`.
+
+        --- OPTIMIZATION: Expiration-ordered position book ---
+        Instead of scanning every open lot on every tick, the PositionBook keeps
+        markets in a heap keyed by expiration, so this is a single heap peek
+        unless a market actually expires.
+        """
+        expired_markets = self.position_book.pop_expired(current_timestamp)
+        if expired_markets:
+            for market_id, positions in expired_markets:
+                self._resolve_market(market_id, positions, current_timestamp)
+            self.portfolio_history.append((current_timestamp, self.capital))
+
+    def _execute_trade(self, strategy_instance, trade_decision, current_timestamp, market_id, expiration):
+        """
+        Validates, prices and books a single trade decision returned by a strategy.
+        Returns True if the trade was executed.
+        """
+        if current_timestamp >= expiration:
+            if self._log_details:
+                self.logger.warning(f"Trade rejected for {self.market_registry[market_id]} at {current_timestamp}: market already expired.")
+            return False
+        side, quantity, entry_price, _ = trade_decision
+        entry_price = self._apply_slippage(current_timestamp, market_id, side, entry_price)
+        cost = quantity * entry_price
+        if self.capital >= cost:
+            self.capital -= cost
+            if hasattr(strategy_instance, 'update_portfolio'):
+                strategy_instance.update_portfolio(market_id, side, quantity, entry_price)
+            self.position_book.add(market_id, side, quantity, entry_price, expiration)
+            self.ledger.append(current_timestamp, 'Buy', market_id, side, quantity, entry_price, cost, -cost)
+            if self.journal is not None:
+                self.journal.record({
+                    'type': 'Buy', 'timestamp': current_timestamp, 'market_id': self.market_registry[market_id],
+                    'side': side, 'quantity': quantity, 'entry_price': entry_price, 'value': cost
+                })
+            if self._log_details:
+                self.logger.info(f"TRADE: {current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} Side: {side}, Quantity: {quantity}, EntryPrice: {entry_price}")
+            return True
+        else:
+            event = {
+                'timestamp': current_timestamp, 'event': 'Insufficient Capital',
+                'details': f"Needed ${cost:.2f}, had ${self.capital:.2f}"
+            }
+            self.risk_events.append(event)
+            if self._log_details:
+                self.logger.warning(f"INSUFFICIENT CAPITAL: {event['details']}")
+            return False
+
+    def _run_pandas(self, strategy_instance):
+        """Reference engine: walks the DataFrame with groupby + iterrows."""
         current_timestamp = None
         # --- OPTIMIZATION: Group by Timestamp ---
         # Grouping data by timestamp once before the loop is much more efficient
@@ -259,90 +551,187 @@ class Backtester:
         n_unique_timestamps = len(grouped_by_timestamp)
         start_time = time.time()
 
-        self.console_logger.info("Running backtest...")
         for i, (current_timestamp, current_data_points) in enumerate(grouped_by_timestamp):
-            # Progress logging
-            if n_unique_timestamps > 50 and (i + 1) % (n_unique_timestamps // 50) == 0:
-                elapsed_time = time.time() - start_time
-                progress = (i + 1) / n_unique_timestamps
-                eta = (elapsed_time / progress) * (1 - progress) if progress > 0 else 0
-                print(f"\r  -> Progress: {progress:.0%}, "
-                      f"Elapsed: {datetime.timedelta(seconds=int(elapsed_time))}, "
-                      f"ETA: {datetime.timedelta(seconds=int(eta))}", end="")
+            self._print_progress(i, n_unique_timestamps, start_time)
+            self._resolve_expired_positions(current_timestamp)
 
-            positions_to_remove_indices = []
-
-            # Process open positions for expiration at current_timestamp or earlier
-            for pos_index, position in enumerate(self.open_positions):
-                if current_timestamp >= position['expiration']:
-                    market_id_tuple = position['market_id']
+            # No need to filter `market_data` anymore, as `current_data_points` is the slice.
+            for _, row in current_data_points.iterrows():
+                market_id = row[MARKET_ID_COLUMN]
+                trade_decision = strategy_instance.decide(row, self.capital)
+                if trade_decision:
+                    self._execute_trade(strategy_instance, trade_decision, current_timestamp, market_id, row['Expiration'])
+        return current_timestamp
 
-                    resolved_info = self._resolve_single_position(market_id_tuple, position, current_timestamp)
+    def _get_columnar_frame(self):
+        """
+        Returns the ColumnarFrame for the current `market_data`, extracting it
+        only when the DataFrame has been replaced (e.g. by preprocessing).
+        """
+        if self._columnar_frame is None or self._columnar_frame[0] is not self.market_data:
+            self._columnar_frame = (self.market_data, ColumnarFrame(self.market_data))
+        return self._columnar_frame[1]
 
-                    if market_id_tuple not in self.pending_market_summaries:
-                        self.pending_market_summaries[market_id_tuple] = []
-                    self.pending_market_summaries[market_id_tuple].append(resolved_info)
+    def _run_columnar(self, strategy_instance):
+        """
+        Columnar engine: extracts the frame into column arrays once and hands
+        strategies a lightweight RowView instead of a pandas Series per row.
 
-                    positions_to_remove_indices.append(pos_index)
+        --- OPTIMIZATION: No per-row Series construction ---
+        `iterrows()` builds a new Series (with dtype inference) for every tick,
+        which dominates the runtime on a full day of data. Here each row is a
+        two-slot object indexing into prebuilt Python lists.
+        """
+        return self._run_columnar_frame(strategy_instance, self._get_columnar_frame(), set())
 
-            # Remove resolved positions from self.open_positions
-            if positions_to_remove_indices:
-                for index in sorted(positions_to_remove_indices, reverse=True):
-                    del self.open_positions[index]
-                self.portfolio_history.append((current_timestamp, self.capital))
+    def _run_columnar_frame(self, strategy_instance, frame, active_markets, show_progress=True):
+        """
+        Runs the columnar loop over `frame`. `active_markets` holds markets
+        whose every row must reach decide(); it is updated in place so that
+        streamed windows can carry it from one frame to the next.
+        """
+        current_timestamp = None
+        values = frame.values
+        market_ids = values[MARKET_ID_COLUMN]
+        expirations = values['Expiration']
+        groups = list(frame.iter_groups('Timestamp'))
+        n_unique_timestamps = len(groups)
+        start_time = time.time()
 
-            # No need to filter `market_data` anymore, as `current_data_points` is the slice.
-            for _, row in current_data_points.iterrows():
-                market_id_tuple = (row['TargetTime'], row['Expiration'])
-                trade_decision = strategy_instance.decide(row, self.capital)
-                
+        # --- OPTIMIZATION: Batch signal mask ---
+        # Strategies implementing decide_batch() flag candidate rows with NumPy
+        # up front; every other row is skipped without a Python-level decide()
+        # call, unless the strategy asked to see every row of that market.
+        decide_batch = getattr(strategy_instance, 'decide_batch', None)
+        batch = decide_batch(frame) if decide_batch is not None else None
+        signal = batch['signal'].tolist() if batch is not None else None
+
+        for i, (current_timestamp, row_indices) in enumerate(groups):
+            if show_progress:
+                self._print_progress(i, n_unique_timestamps, start_time)
+            self._resolve_expired_positions(current_timestamp)
+
+            for index in row_indices:
+                if signal is not None and not signal[index] and \
+                   not (active_markets and market_ids[index] in active_markets):
+                    continue
+                trade_decision = strategy_instance.decide(RowView(values, index), self.capital)
                 if trade_decision:
-                    if current_timestamp >= row['Expiration']:
-                        self.logger.warning(f"Trade rejected for {market_id_tuple} at {current_timestamp}: market already expired.")
-                        continue
-                    side, quantity, entry_price, _ = trade_decision
-                    entry_price = self._apply_slippage(current_timestamp, market_id_tuple, side, entry_price)
-                    cost = quantity * entry_price
-                    if self.capital >= cost:
-                        self.capital -= cost
-                        if hasattr(strategy_instance, 'update_portfolio'):
-                            strategy_instance.update_portfolio(market_id_tuple, side, quantity, entry_price)
-                        self.open_positions.append({
-                            'market_id': market_id_tuple, 'side': side, 'quantity': quantity,
-                            'entry_price': entry_price, 'expiration': row['Expiration']
-                        })
-                        trade_log_entry = {
-                            'Timestamp': current_timestamp, 'Type': 'Buy', 'MarketID': market_id_tuple,
-                            'Side': side, 'Quantity': quantity, 'EntryPrice': entry_price,
-                            'Value': cost, 'PnL': -cost
-                        }
-                        self.transactions.append(trade_log_entry)
-                        self.transactions_by_market.setdefault(market_id_tuple, []).append(trade_log_entry)
-                        self.logger.info(f"TRADE: {current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} Side: {side}, Quantity: {quantity}, EntryPrice: {entry_price}")
-                    else:
-                        event = {
-                            'timestamp': current_timestamp, 'event': 'Insufficient Capital',
-                            'details': f"Needed ${cost:.2f}, had ${self.capital:.2f}"
-                        }
-                        self.risk_events.append(event)
-                        self.logger.warning(f"INSUFFICIENT CAPITAL: {event['details']}")
-        
-        final_timestamp = current_timestamp if current_timestamp else datetime.datetime.now(datetime.timezone.utc)
-        for position in self.open_positions[:]:
-            market_id_tuple = position['market_id']
-            resolved_info = self._resolve_single_position(market_id_tuple, position, final_timestamp)
-            if market_id_tuple not in self.pending_market_summaries:
-                self.pending_market_summaries[market_id_tuple] = []
-            self.pending_market_summaries[market_id_tuple].append(resolved_info)
-            self.open_positions.remove(position)
-
-        for market_id_tuple, resolutions_data in self.pending_market_summaries.items():
-            self._print_market_summary(market_id_tuple, resolutions_data)
+                    market_id = market_ids[index]
+                    executed = self._execute_trade(strategy_instance, trade_decision, current_timestamp, market_id, expirations[index])
+                    if executed and signal is not None:
+                        if strategy_instance.requires_every_row(market_id):
+                            active_markets.add(market_id)
+                        else:
+                            active_markets.discard(market_id)
+        return current_timestamp
+
+    def run_strategy(self, strategy_instance, engine='columnar'):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Expected one of: {', '.join(ENGINES)}")
+        if MARKET_ID_COLUMN not in self.market_data.columns:
+            # market_data was replaced with a frame that lost its ids
+            self.market_registry.add_column(self.market_data)
+        self._log_run_configuration(strategy_instance, engine)
+        if self.journal is not None:
+            self.journal.start()
+
+        try:
+            self.console_logger.info("Running backtest...")
+            if engine == 'columnar':
+                current_timestamp = self._run_columnar(strategy_instance)
+            else:
+                current_timestamp = self._run_pandas(strategy_instance)
+
+            self._finish_run(current_timestamp)
+        finally:
+            self._flush_logs()
+
+    def _flush_market_summaries(self):
+        # Market summaries only go to the file log, so skip building them when it is off.
+        if self.log_mode != 'off':
+            self._print_market_summaries()
         self.pending_market_summaries.clear()
 
+    def _finish_run(self, current_timestamp):
+        """Resolves every position still open at the end of the data and logs the market summaries."""
+        final_timestamp = current_timestamp if current_timestamp else datetime.datetime.now(datetime.timezone.utc)
+        for market_id, positions in self.position_book.pop_all():
+            self._resolve_market(market_id, positions, final_timestamp)
+        self._flush_market_summaries()
+
+    def _flush_logs(self):
+        # Drain the journal queue and flush the log file at the end of every run.
+        if self.journal is not None:
+            self.journal.flush()
+        for handler in self.logger.handlers:
+            handler.flush()
+
+    def run_stream(self, strategy_instance, data_files, preprocessors=(), chunk_rows=STREAM_CHUNK_ROWS,
+                   lookahead_seconds=STREAM_LOOKAHEAD_SECONDS):
+        """
+        Runs a strategy over several data files without loading them all.
+
+        The files are read in chunks by a MarketDataStream (see streaming.py)
+        and each time-ordered window goes through the columnar engine. Open
+        positions, strategy state and capital carry across windows and files.
+        The slippage index and outcome lookup only cover markets that have not
+        resolved yet, so memory does not grow with the date range.
+        `preprocessors` are the feature steps the strategy needs (see
+        strategy_registry.py); they run on each open market's full history.
+        """
+        stream = MarketDataStream(data_files, preprocessors, chunk_rows, lookahead_seconds,
+                                  market_registry=self.market_registry)
+        self.market_data = pd.DataFrame()
+        self.market_outcomes = stream.outcomes
+        self._log_run_configuration(strategy_instance, 'columnar (streaming)')
+        self.logger.info(f"Streaming {len(stream.data_files)} data files: {', '.join(stream.data_files)}")
+        if self.journal is not None:
+            self.journal.start()
+
+        try:
+            self.console_logger.info("Running streaming backtest...")
+            current_timestamp = None
+            active_markets = set()
+            current_file = None
+            for window in stream.windows():
+                if window.data_file != current_file:
+                    current_file = window.data_file
+                    self.console_logger.info(f"  -> Reading {current_file}")
+                self.price_index = MarketPriceIndex.from_frame(window.buffered, market_columns=(MARKET_ID_COLUMN,))
+                window_timestamp = self._run_columnar_frame(strategy_instance, ColumnarFrame(window.rows), active_markets, show_progress=False)
+                current_timestamp = window_timestamp or current_timestamp
+                self._flush_market_summaries()
+            self.price_index = MarketPriceIndex()
+            self._finish_run(current_timestamp)
+        finally:
+            self._flush_logs()
+
+    def get_summary(self):
+        """Returns the headline metrics of the last run as a flat dict."""
+        total_pnl = self.capital - self.initial_capital
+        self.max_drawdown = self._calculate_max_drawdown()
+        buys = self.ledger.column('type') == BUY
+        return {
+            'FinalCapital': self.capital,
+            'TotalPnL': total_pnl,
+            'ROI': (total_pnl / self.initial_capital) * 100 if self.initial_capital > 0 else 0,
+            'MaxDrawdown': self.max_drawdown,
+            'NumTrades': int(buys.sum()),
+            'NumMarketsTraded': len(np.unique(self.ledger.column('market')[buys])),
+        }
+
+    def _count_winning_trades(self):
+        """
+        Returns (winning, losing) trade counts. Trades are counted per lot
+        bought, not per netted Resolution row, so the figures do not depend
+        on how the PositionBook folds lots together.
+        """
+        resolutions = self.ledger.column('type') == RESOLUTION
+        winning = int(self.ledger.column('winning_lots')[resolutions].sum())
+        return winning, int(self.ledger.column('lots')[resolutions].sum()) - winning
+
     def generate_report(self):
-        buy_trades = [t for t in self.transactions if t['Type'] == 'Buy']
-        resolution_trades = [t for t in self.transactions if t['Type'] == 'Resolution']
         total_pnl = self.capital - self.initial_capital
         roi = (total_pnl / self.initial_capital) * 100 if self.initial_capital > 0 else 0
         self.max_drawdown = self._calculate_max_drawdown()
@@ -355,35 +744,49 @@ class Backtester:
             f"Max Drawdown:    {self.max_drawdown * 100:.2f}%"
         ]
 
-        total_up_shares = sum(t['Quantity'] for t in buy_trades if t['Side'] == 'Up')
-        total_down_shares = sum(t['Quantity'] for t in buy_trades if t['Side'] == 'Down')
-        markets_played = set(t['MarketID'] for t in buy_trades)
+        # --- OPTIMIZATION: Vectorized report ---
+        # Every figure below is a masked sum or a bincount over the ledger
+        # columns instead of a separate pass over a list of transaction dicts.
+        ledger = self.ledger
+        n_markets = len(ledger.market_ids)
+        types = ledger.column('type')
+        markets = ledger.column('market')
+        sides = ledger.column('side')
+        quantities = ledger.column('quantity')
+        pnls = ledger.column('pnl')
+        buys = types == BUY
+        resolutions = types == RESOLUTION
+
+        up_buys = buys & (sides == SIDES.index('Up'))
+        down_buys = buys & (sides == SIDES.index('Down'))
+        total_up_shares = quantities[up_buys].sum().item()
+        total_down_shares = quantities[down_buys].sum().item()
+
+        # Markets in order of their first buy, as the report lists them
+        buy_markets = markets[buys]
+        unique_markets, first_buy = np.unique(buy_markets, return_index=True)
+        markets_played = unique_markets[np.argsort(first_buy, kind='stable')]
         num_markets_played = len(markets_played)
-        market_pnl = {}
-        for t in resolution_trades:
-            market_pnl.setdefault(t['MarketID'], 0.0)
-            market_pnl[t['MarketID']] += t.get('PnL', 0.0)
-        
-        num_markets_won = sum(1 for pnl in market_pnl.values() if pnl > 0)
-        winning_trades_count = sum(1 for t in resolution_trades if t['PnL'] > 0)
-        losing_trades_count = len(resolution_trades) - winning_trades_count
+
+        resolution_markets = markets[resolutions]
+        market_pnl = np.bincount(resolution_markets, weights=pnls[resolutions], minlength=n_markets)
+        num_markets_won = int((market_pnl[np.unique(resolution_markets)] > 0).sum())
+        winning_trades_count, losing_trades_count = self._count_winning_trades()
 
         imbalanced_report_lines = []
         imbalanced_report_lines.append("\n--- Imbalanced Market Analysis ---")
 
-        market_shares = {}
-        for trade in buy_trades:
-            market_id = trade['MarketID']
-            if market_id not in market_shares:
-                market_shares[market_id] = {'Up': 0, 'Down': 0}
-            market_shares[market_id][trade['Side']] += trade['Quantity']
-
-        imbalanced_count = 0
-        for market_id, shares in market_shares.items():
-            if shares['Up'] == 0 or shares['Down'] == 0:
-                imbalanced_count += 1
-                market_id_formatted = f"({market_id[0].strftime('%Y-%m-%d %H:%M:%S')}, {market_id[1].strftime('%Y-%m-%d %H:%M:%S')})"
-                imbalanced_report_lines.append(f"Market {market_id_formatted} is imbalanced: Up={shares['Up']}, Down={shares['Down']}")
+        up_shares = np.bincount(markets[up_buys], weights=quantities[up_buys], minlength=n_markets)
+        down_shares = np.bincount(markets[down_buys], weights=quantities[down_buys], minlength=n_markets)
+        imbalanced = markets_played[(up_shares[markets_played] == 0) | (down_shares[markets_played] == 0)]
+        imbalanced_count = len(imbalanced)
+        for market_index in imbalanced.tolist():
+            market_id = ledger.market_ids[market_index]
+            market_id_formatted = f"({market_id[0].strftime('%Y-%m-%d %H:%M:%S')}, {market_id[1].strftime('%Y-%m-%d %H:%M:%S')})"
+            imbalanced_report_lines.append(
+                f"Market {market_id_formatted} is imbalanced: "
+                f"Up={_share_count(up_shares[market_index])}, Down={_share_count(down_shares[market_index])}"
+            )
         
         if imbalanced_count == 0:
             imbalanced_report_lines.append("All traded markets are balanced.")
@@ -395,7 +798,7 @@ class Backtester:
         report_lines.extend([
             f"Number of Markets Traded: {num_markets_played}",
             f"Number of Markets Won: {num_markets_won}",
-            f"Number of Trading actions: {len(buy_trades)}",
+            f"Number of Trading actions: {int(buys.sum())}",
             f"Number of Winning Trades: {winning_trades_count}",
             f"Number of Losing Trades: {losing_trades_count}",
             f"Total Up Shares: {total_up_shares}",
@@ -418,22 +821,23 @@ class Backtester:
         full_report = "\n".join(report_lines)
         self._log_and_print(full_report)
 
+
+def _share_count(value):
+    """Formats a bincount share total the way integer share sums print."""
+    return int(value) if float(value).is_integer() else float(value)
+
 if __name__ == "__main__":
     from .strategies.rebalancing_strategy import RebalancingStrategy
 
-    backtester = Backtester(initial_capital=INITIAL_CAPITAL)
-    
-    try:
-        backtester.load_data(DATA_FILE)
-    except FileNotFoundError as e:
-        # Use the logger if the backtester object was created
-        if 'backtester' in locals() and hasattr(backtester, 'logger'):
-             backtester.logger.error(f"Failed to load data: {e}")
-             backtester.console_logger.error(f"Failed to load data: {e}")
-        else:
-             print(f"Failed to load data: {e}")
-        exit()
-
-    strategy = RebalancingStrategy()
-    backtester.run_strategy(strategy)
-    backtester.generate_report()
+    # The with block detaches the log handlers once the report is written
+    with Backtester(initial_capital=INITIAL_CAPITAL) as backtester:
+        try:
+            backtester.load_analysis_data()
+        except FileNotFoundError as e:
+            backtester.logger.error(f"Failed to load data: {e}")
+            backtester.console_logger.error(f"Failed to load data: {e}")
+            exit()
+
+        strategy = RebalancingStrategy()
+        backtester.run_strategy(strategy)
+        backtester.generate_report()
@@ -0,0 +1,49 @@
+import argparse
+import glob
+import os
+import time
+import src.config as config
+from .backtester import Backtester, ENGINES
+from .strategy_registry import STRATEGIES, apply_preprocessors
+
+
+def time_engine(data_file, strategy_name, engine):
+    """Runs one backtest and returns (elapsed seconds, final capital, number of transactions)."""
+    strategy_factory, preprocessors = STRATEGIES[strategy_name]
+    backtester = Backtester(initial_capital=config.INITIAL_CAPITAL)
+    backtester.console_logger.disabled = True
+    backtester.load_data(data_file)
+    backtester.market_data = apply_preprocessors(backtester.market_data, preprocessors)
+
+    start_time = time.perf_counter()
+    backtester.run_strategy(strategy_factory(), engine=engine)
+    elapsed = time.perf_counter() - start_time
+    backtester.close()
+    return elapsed, backtester.capital, len(backtester.ledger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backtester execution engines.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default='prediction')
+    parser.add_argument("--files", nargs='*', help="Market data files (defaults to every data/market_data_*.csv).")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(config.DATA_DIR, f"{config.BASE_DATA_FILENAME}_*.csv")))
+    if not files:
+        print("No market data files found.")
+        return
+
+    print(f"Strategy: {args.strategy}")
+    print(f"{'File':<32} {'Engine':<10} {'Seconds':>9} {'Final Capital':>14} {'Trades':>7}")
+    for data_file in files:
+        timings = {}
+        for engine in ENGINES:
+            elapsed, capital, n_transactions = time_engine(data_file, args.strategy, engine)
+            timings[engine] = elapsed
+            print()  # Terminate the backtester's progress line
+            print(f"{os.path.basename(data_file):<32} {engine:<10} {elapsed:>9.3f} {capital:>14.2f} {n_transactions:>7}")
+        print(f"  -> Speedup (pandas / columnar): {timings['pandas'] / timings['columnar']:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
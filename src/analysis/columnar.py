@@ -0,0 +1,125 @@
+import mmap
+import numpy as np
+import pandas as pd
+from src.market_frames import float64_values, timestamps_to_ns
+
+
+def _is_mapped(array):
+    """True if `array` is a view of a memory-mapped file (a parameter sweep's shared columns)."""
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, mmap.mmap)
+
+
+class RowView:
+    """
+    Read-only view of a single row of a ColumnarFrame.
+
+    Supports the access patterns strategies use on a pandas Series row
+    (`row['UpAsk']`, `row.get('MinuteFromStart')`, `'SharpEvent' in row`)
+    without building a Series for every tick.
+    """
+    __slots__ = ('_values', '_index')
+
+    def __init__(self, values, index):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._values[key][self._index]
+
+    def get(self, key, default=None):
+        column = self._values.get(key)
+        if column is None:
+            return default
+        return column[self._index]
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def keys(self):
+        return self._values.keys()
+
+    def to_dict(self):
+        return {col: values[self._index] for col, values in self._values.items()}
+
+    def __repr__(self):
+        return f"RowView({self.to_dict()!r})"
+
+
+class ColumnarFrame:
+    """
+    Column-oriented snapshot of a market DataFrame.
+
+    The frame is extracted once: `arrays` holds one NumPy array per column
+    (datetime columns as int64 epoch nanoseconds) for vectorized work, and
+    the per-row values are kept as plain Python lists so that RowView lookups
+    are a dict hit plus a list index. Datetime values are materialized as
+    pd.Timestamp objects, so row values compare and hash exactly like the
+    ones produced by `DataFrame.iterrows()`.
+
+    Columns backed by a memory-mapped file are not copied into lists: a
+    memoryview over the mapping also yields Python scalars when indexed,
+    so every sweep worker keeps sharing the same pages.
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.n_rows = len(df)
+        self.arrays = {}
+        self.values = {}
+        self._factorized = {}
+
+        for col in self.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Market keys of the compact load profile
+                series = series.astype(series.dtype.categories.dtype)
+            if pd.api.types.is_datetime64_any_dtype(series):
+                # Factorize first so each distinct timestamp becomes a single
+                # pd.Timestamp object shared by all of its rows.
+                codes, uniques = pd.factorize(series)
+                keys = np.append(uniques.astype(object).to_numpy(), pd.NaT)
+                self._factorized[col] = (codes, keys[:-1].tolist())
+                self.arrays[col] = timestamps_to_ns(series)
+                self.values[col] = keys[codes].tolist()
+            else:
+                # float32 columns of the compact load profile are widened
+                # back, so strategies see the same values as a default load
+                array = float64_values(series) if series.dtype == np.float32 else series.to_numpy()
+                self.arrays[col] = array
+                self.values[col] = memoryview(array) if _is_mapped(array) else array.tolist()
+
+    def __len__(self):
+        return self.n_rows
+
+    def row(self, index):
+        return RowView(self.values, index)
+
+    def iter_groups(self, column):
+        """
+        Yields (key, row_indices) for each distinct value of `column`.
+
+        Groups come out in order of first appearance and rows keep their
+        frame order within a group, matching `df.groupby(column, sort=False)`.
+        Rows with a missing key are skipped, as groupby does by default.
+        """
+        if column in self._factorized:
+            codes, keys = self._factorized[column]
+        else:
+            codes, uniques = pd.factorize(self.arrays[column])
+            keys = list(uniques)
+        if len(keys) == 0:
+            return
+
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        first = int(np.searchsorted(sorted_codes, 0))
+        bounds = (np.flatnonzero(np.diff(sorted_codes[first:])) + first + 1).tolist()
+        starts = [first] + bounds
+        ends = bounds + [len(sorted_codes)]
+        order = order.tolist()
+
+        for key, start, end in zip(keys, starts, ends):
+            yield key, order[start:end]
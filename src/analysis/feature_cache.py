@@ -0,0 +1,137 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pandas as pd
+import src.config as config
+from src.storage.market_store import find_store_file
+from src.market_frames import MARKET_ID_COLUMN
+from .strategy_registry import apply_preprocessors
+
+try:
+    import pyarrow  # noqa: F401 (needed by DataFrame.to_parquet)
+except ImportError:  # pyarrow is optional: without it features are always recomputed
+    pyarrow = None
+
+FEATURE_CACHE_DIR_NAME = "features"
+
+
+def _source_state(data_file):
+    """(name, size, mtime_ns) of the file `data_file` is actually read from."""
+    path = data_file if os.path.exists(data_file) else find_store_file(data_file)
+    if path is None:
+        raise FileNotFoundError(f"Data file not found at {data_file}")
+    stat = os.stat(path)
+    return [os.path.basename(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _step_signature(step):
+    """
+    Describes one preprocessing step by its qualified name, a hash of its
+    source (so editing a feature function invalidates its cached results)
+    and its full parameters, defaults included. `step` is a function or a
+    functools.partial binding some of its keyword arguments.
+    """
+    function, keywords = (step.func, step.keywords) if isinstance(step, functools.partial) else (step, {})
+    try:
+        version = hashlib.sha1(inspect.getsource(function).encode()).hexdigest()[:12]
+    except (OSError, TypeError):
+        version = None
+    parameters = list(inspect.signature(function).parameters.values())[1:]  # skip the DataFrame
+    params = {p.name: keywords.get(p.name, p.default) for p in parameters if p.default is not inspect.Parameter.empty}
+    params.update(keywords)
+    return [f"{function.__module__}.{function.__qualname__}", version, {k: repr(v) for k, v in sorted(params.items())}]
+
+
+def _row_order(df):
+    """
+    Digest of the frame's index labels. After load_data's sort they record
+    which file row sits where, so a change in how ties are ordered (which
+    feature steps preserve) gets a new key.
+    """
+    return hashlib.sha1(pd.util.hash_pandas_object(df.index, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def feature_cache_key(df, preprocessors, data_files, selection=None):
+    """
+    Content address of the features `preprocessors` compute from `df`, the
+    data loaded from `data_files` (with `selection`, e.g. a date range).
+    The key changes whenever a source file is rewritten or grows, a feature
+    function changes, a parameter changes, or the input frame's shape or
+    dtypes differ (e.g. under another load profile) or its rows are in a
+    different order.
+    """
+    description = {
+        'sources': [_source_state(data_file) for data_file in data_files],
+        'selection': repr(selection),
+        'rows': len(df),
+        'row_order': _row_order(df),
+        'columns': [[str(col), str(dtype)] for col, dtype in df.dtypes.items()],
+        'steps': [_step_signature(step) for step in preprocessors],
+    }
+    return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+def feature_cache_file(data_files, key):
+    directory = os.path.join(os.path.dirname(data_files[0]), config.SIDECAR_DIR_NAME, FEATURE_CACHE_DIR_NAME)
+    return os.path.join(directory, f"{key}.parquet")
+
+
+def _prune(directory, keep):
+    """Deletes all but the `keep` most recently used cache files in `directory`."""
+    entries = [entry for entry in os.scandir(directory) if entry.name.endswith('.parquet')]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def cached_preprocess(df, preprocessors, data_files, selection=None, market_registry=None):
+    """
+    Applies `preprocessors` to `df` like strategy_registry.apply_preprocessors,
+    reusing the result of an earlier run on the same data when there is one.
+    With a `market_registry`, a cached MarketId column is relabelled from the
+    registry, whose ids depend on what it has interned before.
+
+    --- OPTIMIZATION: Content-addressed feature cache ---
+    Results are stored as Parquet under data/cache/features/, named by
+    `feature_cache_key`, so a repeat run reads its features back in one
+    columnar read instead of recomputing the grouped rolling windows. A data
+    file that grows gets a new key; old entries age out of the cache
+    (config.FEATURE_CACHE_MAX_ENTRIES, least recently used first).
+    Without pyarrow, with caching disabled or without source files, the
+    features are simply computed.
+    """
+    preprocessors = list(preprocessors)
+    if not preprocessors or not data_files or pyarrow is None or not config.FEATURE_CACHE_ENABLED:
+        return apply_preprocessors(df, preprocessors)
+
+    cache_file = feature_cache_file(data_files, feature_cache_key(df, preprocessors, data_files, selection))
+    if os.path.exists(cache_file):
+        try:
+            features = pd.read_parquet(cache_file)
+            os.utime(cache_file)  # mark as recently used
+            # Parquet stores Categoricals of datetimes (compact market keys) as plain datetimes
+            for col in features.columns.intersection(df.columns):
+                if isinstance(df[col].dtype, pd.CategoricalDtype) and not isinstance(features[col].dtype, pd.CategoricalDtype):
+                    features[col] = features[col].astype('category')
+            if market_registry is not None and MARKET_ID_COLUMN in features.columns:
+                market_registry.add_column(features)
+            return features
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not read feature cache {cache_file}: {e}")
+
+    features = apply_preprocessors(df, preprocessors)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = f"{cache_file}.tmp"
+        features.to_parquet(temp_file, compression=config.FEATURE_CACHE_COMPRESSION)
+        os.replace(temp_file, cache_file)
+        _prune(os.path.dirname(cache_file), config.FEATURE_CACHE_MAX_ENTRIES)
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not write feature cache {cache_file}: {e}")
+    return features
+
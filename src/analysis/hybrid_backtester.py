@@ -1,14 +1,15 @@
 import src.config as config
+from src.market_frames import compact_frame, is_compact, widen_frame
 from .backtester import Backtester
 from .strategies.hybrid_strategy import HybridStrategy
 
 # CONFIG
-DATA_FILE = config.get_analysis_filename()
 SHARP_MOVE_THRESHOLD = 0.04
 
 def preprocess_data(df, sharp_move_threshold=SHARP_MOVE_THRESHOLD):
     """Pre-processes the market data to add features required by the PredictionStrategy."""
-    df = df.sort_values(["TargetTime", "Expiration", "Timestamp"]).reset_index(drop=True)
+    compact = is_compact(df)
+    df = widen_frame(df).sort_values(["TargetTime", "Expiration", "Timestamp"]).reset_index(drop=True)
 
     # Minute index
     df["MinuteFromStart"] = (
@@ -33,27 +34,26 @@ def preprocess_data(df, sharp_move_threshold=SHARP_MOVE_THRESHOLD):
     # --- Signal Generation: Moved to PredictionStrategy ---
     # The strategy now calculates the signal internally.
 
-    return df
+    return compact_frame(df) if compact else df
 
 if __name__ == "__main__":
     # Instantiate the strategy
     strategy = HybridStrategy()
 
-    # Instantiate the backtester
-    backtester = Backtester(initial_capital=config.INITIAL_CAPITAL)
+    # Instantiate the backtester (the with block detaches its log handlers at the end)
+    with Backtester(initial_capital=config.INITIAL_CAPITAL) as backtester:
+        # Load data
+        try:
+            backtester.load_analysis_data()
+        except FileNotFoundError as e:
+            print(e)
+            exit()
 
-    # Load data
-    try:
-        backtester.load_data(DATA_FILE)
-    except FileNotFoundError as e:
-        print(e)
-        exit()
+        # Pre-process the data
+        backtester.preprocess([preprocess_data])
 
-    # Pre-process the data
-    backtester.market_data = preprocess_data(backtester.market_data)
+        # Run the backtest
+        backtester.run_strategy(strategy)
 
-    # Run the backtest
-    backtester.run_strategy(strategy)
-
-    # Generate and print the report
-    backtester.generate_report()
+        # Generate and print the report
+        backtester.generate_report()
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from src.market_frames import MarketRegistry
+
+TRANSACTION_TYPES = ('Buy', 'Resolution')
+SIDES = ('Up', 'Down')
+BUY, RESOLUTION = 0, 1
+NO_SIDE = -1  # WinningSide code for Buy rows
+
+_SIDE_CODES = {side: code for code, side in enumerate(SIDES)}
+_INITIAL_CAPACITY = 1024
+
+
+class TransactionLedger:
+    """
+    Append-only transaction ledger stored as parallel NumPy columns.
+
+    Each transaction is one slot in preallocated arrays (timestamp in epoch
+    nanoseconds, type, MarketId, side, quantity, price, value, PnL
+    and lot counts) that double in size when full, so a trade costs ~60 bytes
+    instead of a dict of Python objects. The `market` column holds the
+    MarketId from `market_registry` (shared with the Backtester), so reports
+    work on integers and only convert back to timestamps for display.
+    """
+
+    def __init__(self, capacity=_INITIAL_CAPACITY, market_registry=None):
+        self._size = 0
+        self.market_registry = market_registry if market_registry is not None else MarketRegistry()
+        self._columns = {
+            'timestamp_ns': np.empty(capacity, dtype=np.int64),
+            'type': np.empty(capacity, dtype=np.int8),
+            'market': np.empty(capacity, dtype=np.int32),
+            'side': np.empty(capacity, dtype=np.int8),
+            'winning_side': np.empty(capacity, dtype=np.int8),
+            'quantity': np.empty(capacity, dtype=np.int64),
+            'price': np.empty(capacity, dtype=np.float64),
+            'value': np.empty(capacity, dtype=np.float64),
+            'pnl': np.empty(capacity, dtype=np.float64),
+            'lots': np.empty(capacity, dtype=np.int32),
+            'winning_lots': np.empty(capacity, dtype=np.int32),
+        }
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def market_ids(self):
+        """MarketId -> (TargetTime, Expiration) tuple."""
+        return self.market_registry.market_ids
+
+    def intern_market(self, market_id):
+        """Returns the MarketId for `market_id` (an id or a (TargetTime, Expiration) tuple)."""
+        return self.market_registry.to_id(market_id)
+
+    def _grow(self):
+        for name, column in self._columns.items():
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, timestamp, transaction_type, market_id, side, quantity, price, value, pnl, winning_side=None,
+               lots=1, winning_lots=None):
+        """
+        Appends one transaction. A Resolution row may stand for several netted
+        lots; `lots` and `winning_lots` (defaulting to whether `pnl` is
+        positive) keep the per-lot win/loss counts.
+        """
+        if self._size == len(self._columns['type']):
+            self._grow()
+        columns = self._columns
+        if not isinstance(quantity, (int, np.integer)) and columns['quantity'].dtype != np.float64:
+            # Keep integer share counts exact; switch to floats only if a strategy trades fractions.
+            columns['quantity'] = columns['quantity'].astype(np.float64)
+
+        i = self._size
+        columns['timestamp_ns'][i] = timestamp.value
+        columns['type'][i] = RESOLUTION if transaction_type == 'Resolution' else BUY
+        columns['market'][i] = self.intern_market(market_id)
+        columns['side'][i] = _SIDE_CODES[side]
+        columns['winning_side'][i] = _SIDE_CODES[winning_side] if winning_side is not None else NO_SIDE
+        columns['quantity'][i] = quantity
+        columns['price'][i] = price
+        columns['value'][i] = value
+        columns['pnl'][i] = pnl
+        columns['lots'][i] = lots
+        columns['winning_lots'][i] = winning_lots if winning_lots is not None else lots * (pnl > 0)
+        self._size += 1
+
+    def column(self, name):
+        """Returns a view of the filled part of column `name`."""
+        return self._columns[name][:self._size]
+
+    def nbytes(self):
+        return sum(self.column(name).nbytes for name in self._columns)
+
+    def to_records(self):
+        """Returns the transactions as the list of dicts the Backtester used to keep."""
+        timestamps = pd.to_datetime(self.column('timestamp_ns'), utc=True)
+        records = []
+        for ts, kind, market, side, winning_side, quantity, price, value, pnl in zip(
+                timestamps, self.column('type').tolist(), self.column('market').tolist(),
+                self.column('side').tolist(), self.column('winning_side').tolist(),
+                self.column('quantity').tolist(), self.column('price').tolist(),
+                self.column('value').tolist(), self.column('pnl').tolist()):
+            record = {
+                'Timestamp': ts, 'Type': TRANSACTION_TYPES[kind], 'MarketID': self.market_ids[market],
+                'Side': SIDES[side], 'Quantity': quantity, 'EntryPrice': price, 'Value': value, 'PnL': pnl
+            }
+            if kind == RESOLUTION:
+                record['WinningSide'] = SIDES[winning_side]
+            records.append(record)
+        return records
+
+    def to_frame(self):
+        """Returns the ledger as a DataFrame, one row per transaction."""
+        markets = self.column('market')
+        target_times_ns = np.array([market_id[0].value for market_id in self.market_ids], dtype=np.int64)
+        expirations_ns = np.array([market_id[1].value for market_id in self.market_ids], dtype=np.int64)
+        return pd.DataFrame({
+            'Timestamp': pd.to_datetime(self.column('timestamp_ns'), utc=True),
+            'Type': np.array(TRANSACTION_TYPES, dtype=object)[self.column('type')],
+            'MarketId': markets.copy(),
+            'TargetTime': pd.to_datetime(target_times_ns[markets], utc=True),
+            'Expiration': pd.to_datetime(expirations_ns[markets], utc=True),
+            'Side': np.array(SIDES, dtype=object)[self.column('side')],
+            'Quantity': self.column('quantity').copy(),
+            'EntryPrice': self.column('price').copy(),
+            'Value': self.column('value').copy(),
+            'PnL': self.column('pnl').copy(),
+            # NO_SIDE (-1) picks the trailing None for Buy rows
+            'WinningSide': np.array(SIDES + (None,), dtype=object)[self.column('winning_side')],
+        })
+
+    def to_parquet(self, path):
+        """Writes the ledger to a Parquet file (requires pyarrow)."""
+        self.to_frame().to_parquet(path, index=False)
+
+    # --- Grouped reductions used by the Backtester reports ---
+
+    def buy_stats_by_market(self):
+        """
+        Returns {MarketId: (n_buys, total_quantity, first_ns, last_ns)}
+        for every market with at least one buy, in one grouped pass.
+        """
+        buys = self.column('type') == BUY
+        markets = self.column('market')[buys]
+        if len(markets) == 0:
+            return {}
+        n_markets = len(self.market_ids)
+        timestamps = self.column('timestamp_ns')[buys]
+        counts = np.bincount(markets, minlength=n_markets)
+        quantities = np.bincount(markets, weights=self.column('quantity')[buys], minlength=n_markets)
+        first = np.full(n_markets, np.iinfo(np.int64).max, dtype=np.int64)
+        last = np.full(n_markets, np.iinfo(np.int64).min, dtype=np.int64)
+        np.minimum.at(first, markets, timestamps)
+        np.maximum.at(last, markets, timestamps)
+        traded = np.flatnonzero(counts)
+        return {
+            int(m): (int(counts[m]), quantities[m].item(), int(first[m]), int(last[m]))
+            for m in traded
+        }
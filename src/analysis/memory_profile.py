@@ -0,0 +1,22 @@
+import argparse
+import src.config as config
+from src.storage.compact import memory_report
+from src.storage.market_store import load_market_data
+from .strategy_registry import apply_preprocessors, resolve_strategy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the memory a day of market data takes under each load profile.")
+    parser.add_argument("--file", default=None, help="Market data file. Defaults to config.get_analysis_filename().")
+    parser.add_argument("--strategy", default='moving_average', help="Strategy whose preprocessing features are included.")
+    args = parser.parse_args()
+
+    data_file = args.file or config.get_analysis_filename()
+    _, preprocessors = resolve_strategy(args.strategy)
+    default = apply_preprocessors(load_market_data(data_file, profile='default'), preprocessors)
+    compact = apply_preprocessors(load_market_data(data_file, profile='compact'), preprocessors)
+    print(memory_report(default, compact, f"{data_file}: {len(default)} rows with {args.strategy} features"))
+
+
+if __name__ == "__main__":
+    main()
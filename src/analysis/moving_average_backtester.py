@@ -11,22 +11,20 @@ if __name__ == "__main__":
         imbalance_threshold=150
     )
 
-    # Instantiate the backtester
-    backtester = Backtester(initial_capital=config.INITIAL_CAPITAL)
+    # Instantiate the backtester (the with block detaches its log handlers at the end)
+    with Backtester(initial_capital=config.INITIAL_CAPITAL) as backtester:
+        # Load data
+        try:
+            backtester.load_analysis_data()
+        except FileNotFoundError as e:
+            print(e)
+            exit()
 
-    # Load data
-    try:
-        backtester.load_data(config.get_analysis_filename())
-    except FileNotFoundError as e:
-        print(e)
-        exit()
+        # Pre-process the data
+        backtester.preprocess([preprocess_base_features, preprocess_moving_average_features])
 
-    # Pre-process the data
-    backtester.market_data = preprocess_base_features(backtester.market_data)
-    backtester.market_data = preprocess_moving_average_features(backtester.market_data)
+        # Run the backtest
+        backtester.run_strategy(strategy)
 
-    # Run the backtest
-    backtester.run_strategy(strategy)
-
-    # Generate and print the report
-    backtester.generate_report()
+        # Generate and print the report
+        backtester.generate_report()
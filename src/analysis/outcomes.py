@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.market_frames import MARKET_COLUMNS, float64_values, winning_sides
+from src.storage.market_store import data_file_mtime, load_market_data
+
+OUTCOME_COLUMNS = MARKET_COLUMNS + ['WinningSide', 'FinalUpAsk', 'FinalDownAsk', 'ResolutionTimestamp']
+
+
+def _final_price_column(df, primary, fallback):
+    if primary in df.columns:
+        return float64_values(df[primary])
+    if fallback in df.columns:
+        return float64_values(df[fallback])
+    return np.zeros(len(df))
+
+
+def build_outcome_table(df):
+    """
+    Builds the outcome table for every market in `df` in one vectorized pass.
+
+    Returns one row per (TargetTime, Expiration) with the winning side, the
+    final Up/Down asks and the timestamp of the market's last data point.
+    """
+    df = df.copy()
+    for col in ['Timestamp'] + MARKET_COLUMNS:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], utc=True)
+
+    # Stable sort keeps file order among rows sharing a timestamp, so the
+    # "last" row is the same one `.iloc[-1]` picks on a time-sorted group.
+    last_rows = df.sort_values('Timestamp', kind='stable').drop_duplicates(subset=MARKET_COLUMNS, keep='last')
+
+    final_up = _final_price_column(last_rows, 'UpAsk', 'UpPrice')
+    final_down = _final_price_column(last_rows, 'DownAsk', 'DownPrice')
+    table = pd.DataFrame({
+        'TargetTime': last_rows['TargetTime'].to_numpy(),
+        'Expiration': last_rows['Expiration'].to_numpy(),
+        'WinningSide': winning_sides(final_up, final_down),
+        'FinalUpAsk': final_up,
+        'FinalDownAsk': final_down,
+        'ResolutionTimestamp': last_rows['Timestamp'].to_numpy(),
+    })
+    for col in ['ResolutionTimestamp'] + MARKET_COLUMNS:
+        table[col] = pd.to_datetime(table[col], utc=True)
+    return table.sort_values(MARKET_COLUMNS, kind='stable').reset_index(drop=True)
+
+
+def _read_cached_table(cache_file):
+    table = pd.read_csv(cache_file)
+    for col in ['ResolutionTimestamp'] + MARKET_COLUMNS:
+        table[col] = pd.to_datetime(table[col], utc=True)
+    return table
+
+
+def load_outcome_table(data_file, df=None):
+    """
+    Returns the outcome table for `data_file`, using the cached sidecar file
+    when it is newer than the data file. Otherwise the table is built (from
+    `df` if given, or by reading `data_file`) and the cache is refreshed.
+    """
+    cache_file = config.get_sidecar_filename(data_file, 'outcomes')
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= data_file_mtime(data_file):
+        return _read_cached_table(cache_file)
+
+    if df is None:
+        df = load_market_data(data_file, columns=['Timestamp'] + MARKET_COLUMNS + ['UpAsk', 'DownAsk', 'UpPrice', 'DownPrice'])
+    table = build_outcome_table(df)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        table.to_csv(cache_file, index=False)
+    except OSError as e:
+        print(f"Warning: could not write outcome cache {cache_file}: {e}")
+    return table
+
+
+def outcomes_by_market(table, market_registry=None):
+    """
+    Turns an outcome table into a {market: record} dict for O(1) resolution.
+    Keys are (TargetTime, Expiration) tuples, or interned MarketIds when a
+    MarketRegistry is given.
+    """
+    if market_registry is None:
+        return table.set_index(MARKET_COLUMNS).to_dict('index')
+    records = table.drop(columns=MARKET_COLUMNS).to_dict('records')
+    return dict(zip(market_registry.assign(table).tolist(), records))
@@ -0,0 +1,177 @@
+import argparse
+import ast
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import src.config as config
+from .backtester import Backtester
+from .outcomes import load_outcome_table
+from .strategy_registry import resolve_strategy
+
+RESULT_COLUMNS = ['TotalPnL', 'ROI', 'MaxDrawdown', 'NumTrades', 'NumMarketsTraded', 'FinalCapital']
+MANIFEST_FILENAME = 'manifest.json'
+
+# Per-worker state, set once by _init_worker
+_worker_backtester = None
+
+
+def expand_grid(param_grid):
+    """Turns {'name': [v1, v2], ...} into the list of every parameter combination."""
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+
+
+def _parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_param_arguments(param_arguments):
+    """Parses CLI arguments of the form 'name=v1,v2,v3' into a parameter grid."""
+    param_grid = {}
+    for argument in param_arguments or []:
+        name, sep, values = argument.partition('=')
+        if not sep or not name or not values:
+            raise ValueError(f"Invalid --param '{argument}'. Expected name=value1,value2,...")
+        param_grid[name.strip()] = [_parse_value(value.strip()) for value in values.split(',')]
+    return param_grid
+
+
+# --- Shared market data ---
+# The parent process writes every column of the preprocessed DataFrame to its
+# own .npy file once. Workers memory-map those files, so numeric columns are
+# shared through the page cache instead of being pickled to every process.
+
+def write_shared_market_data(df, directory):
+    """Saves `df` column by column under `directory` and returns the manifest."""
+    manifest = []
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'column': col, 'file': f"{position}.npy", 'tz': None}
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            entry['tz'] = str(series.dt.tz)
+            values = series.dt.tz_localize(None).to_numpy()
+        else:
+            values = series.to_numpy()
+        entry['mmap'] = values.dtype != object
+        np.save(os.path.join(directory, entry['file']), values, allow_pickle=not entry['mmap'])
+        manifest.append(entry)
+
+    with open(os.path.join(directory, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def read_shared_market_data(directory):
+    """Rebuilds the DataFrame written by `write_shared_market_data`, memory-mapping numeric columns."""
+    with open(os.path.join(directory, MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+
+    columns = {}
+    for entry in manifest:
+        path = os.path.join(directory, entry['file'])
+        if entry['mmap']:
+            # Plain ndarray view of the mapping, so pandas never sees the memmap subclass
+            values = np.asarray(np.load(path, mmap_mode='r'))
+        else:
+            values = np.load(path, allow_pickle=True)
+        if entry['tz']:
+            values = pd.Series(values).dt.tz_localize(entry['tz'])
+        columns[entry['column']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _init_worker(data_directory, outcome_table, initial_capital, slippage_seconds):
+    """Builds the one Backtester each worker reuses for all of its runs."""
+    global _worker_backtester
+    _worker_backtester = Backtester(initial_capital=initial_capital, slippage_seconds=slippage_seconds, log_mode='off')
+    _worker_backtester.console_logger.disabled = True
+    _worker_backtester.show_progress = False
+    _worker_backtester.set_market_data(read_shared_market_data(data_directory), outcome_table)
+
+
+def _run_combination(strategy_spec, params):
+    strategy_cls, _ = resolve_strategy(strategy_spec)
+    _worker_backtester.reset()
+    _worker_backtester.run_strategy(strategy_cls(**params))
+    return {**params, **_worker_backtester.get_summary()}
+
+
+def run_sweep(data_file, strategy_spec, param_grid, workers=None,
+              initial_capital=config.INITIAL_CAPITAL, slippage_seconds=config.SLIPPAGE_SECONDS):
+    """
+    Backtests every combination of `param_grid` for one strategy on one data
+    file and returns the results as a DataFrame ranked by TotalPnL.
+
+    The data is loaded and preprocessed once in this process; the runs are
+    fanned out across `workers` processes (defaults to the CPU count).
+    """
+    strategy_cls, preprocessors = resolve_strategy(strategy_spec)
+    combinations = expand_grid(param_grid)
+
+    with Backtester(initial_capital=initial_capital, slippage_seconds=slippage_seconds, log_mode='off') as loader:
+        loader.load_data(data_file)
+        outcome_table = load_outcome_table(data_file, loader.market_data)
+        loader.preprocess(preprocessors)
+    market_data = loader.market_data
+
+    workers = workers or os.cpu_count() or 1
+    data_directory = tempfile.mkdtemp(prefix='sweep_')
+    try:
+        write_shared_market_data(market_data, data_directory)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(combinations)) or 1,
+            initializer=_init_worker,
+            initargs=(data_directory, outcome_table, initial_capital, slippage_seconds),
+        ) as executor:
+            results = list(executor.map(_run_combination, itertools.repeat(strategy_spec), combinations))
+    finally:
+        shutil.rmtree(data_directory, ignore_errors=True)
+
+    if not results:
+        return pd.DataFrame(columns=list(param_grid) + RESULT_COLUMNS)
+    table = pd.DataFrame(results, columns=list(param_grid) + RESULT_COLUMNS)
+    table = table.sort_values('TotalPnL', ascending=False, kind='stable').reset_index(drop=True)
+    table.index = table.index + 1
+    table.index.name = 'Rank'
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a strategy over a parameter grid in parallel.")
+    parser.add_argument("--strategy", required=True, help="Registry name (e.g. 'moving_average') or 'module:Class'.")
+    parser.add_argument("--param", action='append', metavar="NAME=V1,V2",
+                        help="Constructor argument and the values to try. Repeat for each parameter.")
+    parser.add_argument("--file", default=None, help="Market data file (defaults to the configured analysis file).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to the CPU count).")
+    parser.add_argument("--output", default=None, help="Optional CSV path for the ranked results.")
+    args = parser.parse_args()
+
+    param_grid = parse_param_arguments(args.param)
+    data_file = args.file or config.get_analysis_filename()
+    n_combinations = len(expand_grid(param_grid))
+    print(f"Sweeping {n_combinations} combinations of {args.strategy} on {data_file}...")
+
+    start_time = time.perf_counter()
+    results = run_sweep(data_file, args.strategy, param_grid, workers=args.workers)
+    elapsed = time.perf_counter() - start_time
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(results.to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"\nCompleted {n_combinations} runs in {elapsed:.1f}s")
+
+    if args.output:
+        results.to_csv(args.output)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
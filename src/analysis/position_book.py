@@ -0,0 +1,80 @@
+import heapq
+import itertools
+
+
+class PositionBook:
+    """
+    Open positions netted per (market, side), with an expiration-ordered
+    heap of markets.
+
+    Lots bought in the same market and side are folded into one aggregate
+    (quantity, cost), so the book holds at most two entries per market no
+    matter how many small lots a strategy buys. Finding expired markets is a
+    heap peek, and resolving them costs work proportional to the number of
+    markets that expire rather than the number of open lots.
+    """
+
+    def __init__(self):
+        self._heap = []  # (expiration, sequence, market_id)
+        self._markets = {}  # market_id -> {'expiration': ..., 'sides': {side: aggregate}}
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._markets)
+
+    def __contains__(self, market_id):
+        return market_id in self._markets
+
+    def add(self, market_id, side, quantity, entry_price, expiration):
+        market = self._markets.get(market_id)
+        if market is None:
+            market = {'expiration': expiration, 'sides': {}}
+            self._markets[market_id] = market
+            heapq.heappush(self._heap, (expiration, next(self._sequence), market_id))
+
+        aggregate = market['sides'].get(side)
+        if aggregate is None:
+            aggregate = {'side': side, 'quantity': 0, 'cost': 0.0, 'lots': 0, 'win_pnl': 0.0, 'loss_pnl': 0.0,
+                         'winning_lots_if_won': 0, 'winning_lots_if_lost': 0}
+            market['sides'][side] = aggregate
+
+        cost = quantity * entry_price
+        aggregate['quantity'] += quantity
+        aggregate['cost'] += cost
+        aggregate['lots'] += 1
+        # Per-lot PnL is accumulated in trade order so that resolution reports
+        # exactly the same figures as resolving every lot individually.
+        win_pnl = quantity * (1 - entry_price)
+        aggregate['win_pnl'] += win_pnl
+        aggregate['loss_pnl'] += - cost
+        # Lots with a positive PnL under each outcome, so reports can still
+        # count winning and losing trades per lot.
+        aggregate['winning_lots_if_won'] += win_pnl > 0
+        aggregate['winning_lots_if_lost'] += - cost > 0
+
+    def next_expiration(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, current_timestamp):
+        """Removes and returns [(market_id, [aggregates])] for markets expired at `current_timestamp`."""
+        expired = []
+        while self._heap and current_timestamp >= self._heap[0][0]:
+            _, _, market_id = heapq.heappop(self._heap)
+            expired.append((market_id, list(self._markets.pop(market_id)['sides'].values())))
+        return expired
+
+    def pop_all(self):
+        """Removes and returns every remaining market, in expiration order."""
+        remaining = []
+        while self._heap:
+            _, _, market_id = heapq.heappop(self._heap)
+            remaining.append((market_id, list(self._markets.pop(market_id)['sides'].values())))
+        return remaining
+
+    def positions(self):
+        """Returns a snapshot of the netted positions as a list of dicts."""
+        return [
+            {'market_id': market_id, 'expiration': market['expiration'], **aggregate}
+            for market_id, market in self._markets.items()
+            for aggregate in market['sides'].values()
+        ]
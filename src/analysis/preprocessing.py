@@ -1,10 +1,13 @@
 import pandas as pd
+from src.market_frames import compact_frame, is_compact, widen_frame
 
 SHARP_MOVE_THRESHOLD = 0.04
 
 def preprocess_base_features(df, sharp_move_threshold=SHARP_MOVE_THRESHOLD):
     """Pre-processes the market data to add features required by the PredictionStrategy."""
-    df = df.sort_values(["TargetTime", "Expiration", "Timestamp"]).reset_index(drop=True)
+    compact = is_compact(df)
+    # Features are computed from exact float64 prices, then narrowed again
+    df = widen_frame(df).sort_values(["TargetTime", "Expiration", "Timestamp"]).reset_index(drop=True)
 
     # Minute index
     df["MinuteFromStart"] = (
@@ -26,11 +29,12 @@ def preprocess_base_features(df, sharp_move_threshold=SHARP_MOVE_THRESHOLD):
         (df["DownMidDelta"].abs() >= sharp_move_threshold)
     )
 
-    return df
+    return compact_frame(df) if compact else df
 
 def preprocess_moving_average_features(df):
     """Pre-processes the market data to add features required by the MovingAverageStrategy."""
-    df = df.set_index('Timestamp')
+    compact = is_compact(df)
+    df = widen_frame(df).set_index('Timestamp')
 
     # --- Moving Averages ---
     for window in ['5s', '10s']:
@@ -75,4 +79,5 @@ def preprocess_moving_average_features(df):
     # Clean up temporary columns
     df.drop(columns=['UpAsk_MA_5s_prev', 'UpAsk_MA_10s_prev', 'DownAsk_MA_5s_prev', 'DownAsk_MA_10s_prev'], inplace=True)
 
-    return df.reset_index()
+    df = df.reset_index()
+    return compact_frame(df) if compact else df
@@ -0,0 +1,83 @@
+import numpy as np
+from .columnar import timestamps_to_ns
+from src.market_frames import float64_values
+
+PRICE_COLUMNS = {'Up': 'UpAsk', 'Down': 'DownAsk'}
+
+
+class MarketPriceIndex:
+    """
+    Per-market index of sorted int64 timestamps and ask price arrays.
+
+    Used to price fills with slippage: finding "the first tick at or after
+    T" is a binary search over the market's timestamps instead of a boolean
+    mask over the market's DataFrame.
+    """
+
+    def __init__(self):
+        # market_id -> (timestamps_ns, {'Up': up_asks, 'Down': down_asks})
+        self.markets = {}
+
+    @classmethod
+    def from_frame(cls, df, market_columns=('TargetTime', 'Expiration')):
+        """
+        Builds the index from a DataFrame already sorted by Timestamp, keyed
+        by the value of `market_columns` (a tuple of them if more than one).
+        """
+        index = cls()
+        keys = market_columns[0] if len(market_columns) == 1 else list(market_columns)
+        for market_id, group in df.groupby(keys, sort=False):
+            index.add_market(market_id, group)
+        return index
+
+    def add_market(self, market_id, market_df):
+        timestamps = timestamps_to_ns(market_df['Timestamp'])
+        prices = {
+            side: float64_values(market_df[col]) if col in market_df.columns else None
+            for side, col in PRICE_COLUMNS.items()
+        }
+        self.markets[market_id] = (timestamps, prices)
+
+    def discard(self, market_id):
+        self.markets.pop(market_id, None)
+
+    def __contains__(self, market_id):
+        return market_id in self.markets
+
+    def __len__(self):
+        return len(self.markets)
+
+    def first_price_at_or_after(self, market_id, side, timestamp_ns, default):
+        """
+        Returns the `side` ask of the first tick at or after `timestamp_ns`,
+        or `default` if there is no such tick or its price is not positive.
+        """
+        entry = self.markets.get(market_id)
+        if entry is None:
+            return default
+        timestamps, prices = entry
+        side_prices = prices.get(side)
+        if side_prices is None:
+            return default
+        position = np.searchsorted(timestamps, timestamp_ns, side='left')
+        if position < len(timestamps):
+            price = side_prices[position]
+            if price > 0:
+                return float(price)
+        return default
+
+    def price_fills(self, market_id, side, timestamps_ns, defaults):
+        """
+        Vectorized version of `first_price_at_or_after` for many fills in the
+        same market and side. Returns a float array aligned with the inputs.
+        """
+        defaults = np.asarray(defaults, dtype=float)
+        entry = self.markets.get(market_id)
+        if entry is None or entry[1].get(side) is None or len(entry[0]) == 0:
+            return defaults.copy()
+        timestamps, prices = entry
+        side_prices = prices[side]
+        positions = np.searchsorted(timestamps, np.asarray(timestamps_ns, dtype=np.int64), side='left')
+        in_range = positions < len(timestamps)
+        slipped = np.where(in_range, side_prices[np.minimum(positions, len(timestamps) - 1)], np.nan)
+        return np.where(slipped > 0, slipped, defaults)
@@ -4,6 +4,9 @@ import argparse
 import os
 import logging
 from decimal import Decimal, getcontext
+import src.config as config
+from src.storage.market_store import DATE_COLUMNS, load_market_data
+from src.storage.market_index import load_date_range
 
 # Set precision for Decimal calculations
 getcontext().prec = 28
@@ -24,20 +27,43 @@ summary_handler.setFormatter(summary_formatter)
 summary_logger.addHandler(summary_handler)
 summary_logger.addHandler(logging.StreamHandler())
 
-def analyze(market_data_path, user_data_path):
+def load_date_range_inputs(start_date, end_date):
+    """Returns the market data (via the market index) and the concatenated user trade files for a date range."""
+    user_files = config.get_data_files(start_date, end_date, base_filename=config.USER_DATA_FILENAME)
+    if not user_files:
+        raise FileNotFoundError(f"No user data files found between {start_date} and {end_date}")
+    user_df = pd.concat([pd.read_csv(f, parse_dates=['timestamp', 'TargetTime']) for f in user_files], ignore_index=True)
+    market_df = load_date_range(start_date, end_date)
+    if market_df.empty:
+        raise FileNotFoundError(f"No market data found between {start_date} and {end_date}")
+    return market_df, user_df
+
+def analyze(market_data_path=None, user_data_path=None, start_date=None, end_date=None):
     """
     Analyzes user trades against market data to reverse engineer a strategy.
+    Either give the two data files, or a yyyymmdd date range to use every
+    market and user data file in it.
     """
-    summary_logger.info(f"Starting analysis for market data: {market_data_path} and user data: {user_data_path}")
+    if market_data_path is None:
+        summary_logger.info(f"Starting analysis for dates {start_date} to {end_date}")
+    else:
+        summary_logger.info(f"Starting analysis for market data: {market_data_path} and user data: {user_data_path}")
 
     # --- Load Data ---
     try:
-        market_df = pd.read_csv(market_data_path, parse_dates=['Timestamp', 'TargetTime'])
-        user_df = pd.read_csv(user_data_path, parse_dates=['timestamp', 'TargetTime'])
+        if market_data_path is None:
+            market_df, user_df = load_date_range_inputs(start_date, end_date)
+        else:
+            market_df = load_market_data(market_data_path)
+            user_df = pd.read_csv(user_data_path, parse_dates=['timestamp', 'TargetTime'])
     except FileNotFoundError as e:
         summary_logger.error(f"Error loading data files: {e}")
         return
 
+    # User trade files hold naive UTC times; match them for the merge and the output CSV
+    for col in DATE_COLUMNS:
+        market_df[col] = market_df[col].dt.tz_localize(None)
+
     # --- Preprocessing and Merging ---
     market_df.sort_values('Timestamp', inplace=True)
     user_df.sort_values('timestamp', inplace=True)
@@ -122,8 +148,15 @@ def analyze(market_data_path, user_data_path):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Reverse engineer a trading strategy by analyzing historical data.")
-    parser.add_argument("--market-data", required=True, help="Path to the market data CSV file.")
-    parser.add_argument("--user-data", required=True, help="Path to the user trades data CSV file.")
+    parser.add_argument("--market-data", help="Path to the market data CSV file.")
+    parser.add_argument("--user-data", help="Path to the user trades data CSV file.")
+    parser.add_argument("--start", help="First date (yyyymmdd) to analyze instead of single files.")
+    parser.add_argument("--end", help="Last date (yyyymmdd) to analyze instead of single files.")
     args = parser.parse_args()
 
-    analyze(args.market_data, args.user_data)
+    if args.start or args.end:
+        analyze(start_date=args.start, end_date=args.end)
+    elif args.market_data and args.user_data:
+        analyze(args.market_data, args.user_data)
+    else:
+        parser.error("Give --market-data and --user-data, or a --start/--end date range.")
@@ -3,24 +3,11 @@ import src.config as config
 from src.analysis.preprocessing import preprocess_base_features, preprocess_moving_average_features
 from src.analysis.strategies.prediction_strategy import PredictionStrategy
 from src.analysis.strategies.moving_average_strategy import MovingAverageStrategy
-
-def get_winning_side(market_data):
-    """Determines the winning side of a market based on final ask prices."""
-    final_row = market_data.iloc[-1]
-    up_ask = final_row.get('UpAsk', 0)
-    down_ask = final_row.get('DownAsk', 0)
-
-    if up_ask == 0:
-        winning_side = 'Up'
-    elif down_ask == 0:
-        winning_side = 'Down'
-    elif down_ask > up_ask:
-        winning_side = 'Down'
-    else:
-        winning_side = 'Up'
-    return winning_side
-
-
+from src.analysis.outcomes import load_outcome_table, outcomes_by_market
+from src.market_frames import MarketRegistry, MARKET_ID_COLUMN
+from src.analysis.columnar import ColumnarFrame
+from src.analysis.feature_cache import cached_preprocess
+from src.storage.market_store import load_market_data
 
 def print_accuracy_report(strategy_name, signal_stats):
     """Prints a formatted accuracy report for a given strategy."""
@@ -61,18 +48,21 @@ def print_accuracy_report(strategy_name, signal_stats):
 def analyze_signals():
     """Analyzes the accuracy of signals from the Prediction and Moving Average strategies."""
     # Load and preprocess data
+    data_file = config.get_analysis_filename()
     try:
-        data = pd.read_csv(config.get_analysis_filename())
+        data = load_market_data(data_file)
     except FileNotFoundError as e:
         print(e)
         return
 
-    # Convert columns to datetime objects
-    for col in ['Timestamp', 'TargetTime', 'Expiration']:
-        data[col] = pd.to_datetime(data[col], utc=True)
+    # Market winners come from the shared (cached) outcome table, keyed by interned MarketId
+    market_registry = MarketRegistry()
+    market_registry.add_column(data)
+    market_outcomes = outcomes_by_market(load_outcome_table(data_file, data), market_registry)
 
-    data = preprocess_base_features(data)
-    data = preprocess_moving_average_features(data)
+    # Features are read back from the feature cache when this file was preprocessed before
+    data = cached_preprocess(data, [preprocess_base_features, preprocess_moving_average_features], [data_file],
+                             market_registry=market_registry)
 
     # Instantiate the stateless strategy
     prediction_strategy = PredictionStrategy()
@@ -83,18 +73,26 @@ def analyze_signals():
 
     mock_capital = 10000
 
-    # Group data by market
-    grouped = data.groupby(['TargetTime', 'Expiration'])
+    # Column arrays are extracted once; rows are handed to the strategies as RowViews.
+    # The prediction signal is computed for every row in one vectorized pass, so
+    # decide() only runs on the rows that actually carry a signal.
+    frame = ColumnarFrame(data)
+    prediction_signal = prediction_strategy.decide_batch(frame)['signal'].tolist()
+
+    # Group data by market (preprocessing leaves a fresh RangeIndex, so labels are row positions)
+    grouped = data.groupby(MARKET_ID_COLUMN)
 
     for market_id, market_data in grouped:
-        winning_side = get_winning_side(market_data)
+        winning_side = market_outcomes[market_id]['WinningSide']
 
         # Instantiate a new stateful strategy for each market to ensure no state leakage
         ma_strategy = MovingAverageStrategy()
 
-        for _, row in market_data.iterrows():
+        for index in market_data.index:
+            row = frame.row(index)
+
             # --- Prediction Strategy ---
-            prediction_decision = prediction_strategy.decide(row, mock_capital)
+            prediction_decision = prediction_strategy.decide(row, mock_capital) if prediction_signal[index] else None
             if prediction_decision:
                 signal, _, _, score = prediction_decision
                 key = (signal, int(score))
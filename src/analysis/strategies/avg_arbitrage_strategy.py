@@ -1,6 +1,7 @@
 import math
 from collections import defaultdict
 from src.analysis.strategies.base_strategy import Strategy
+from src.market_frames import market_key
 
 class AvgArbitrageStrategy(Strategy):
     def __init__(self, margin=0.01, initial_trade_capital_percentage=0.05, max_capital_allocation_percentage=0.50):
@@ -20,7 +21,7 @@ class AvgArbitrageStrategy(Strategy):
         })
 
     def decide(self, market_data_point, current_capital):
-        market_id = (market_data_point['TargetTime'], market_data_point['Expiration'])
+        market_id = market_key(market_data_point)
         state = self.market_states[market_id]
 
         if state['initial_capital_per_market'] is None:
@@ -4,3 +4,25 @@ class Strategy:
 
     def update_portfolio(self, market_id, side, quantity, price):
         pass
+
+    def decide_batch(self, frame):
+        """
+        Optional vectorized pre-pass over a whole ColumnarFrame.
+
+        Returns None (the default) if the strategy must see every row, or a dict
+        of arrays aligned with the frame's rows:
+            'signal': bool mask of rows on which `decide` may return a trade
+            'side', 'price', 'score': the candidate signal for each row
+        `decide` stays the source of truth for sizing and capital checks, so the
+        mask only has to be conservative: it may flag rows that `decide` then
+        rejects, but must never miss a row `decide` would trade on.
+        """
+        return None
+
+    def requires_every_row(self, market_id):
+        """
+        Used together with `decide_batch`: return True while the strategy needs
+        to see every row of `market_id` regardless of the batch signal mask
+        (e.g. to manage a position it has opened). Checked after each trade.
+        """
+        return False
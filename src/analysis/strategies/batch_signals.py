@@ -0,0 +1,69 @@
+import numpy as np
+
+PREDICTION_SIGNAL_COLUMNS = ["MinuteFromStart", "SharpEvent", "UpMidDelta", "DownMidDelta", "BidLiquidityImbalance"]
+
+
+def _truthy(values):
+    """Element-wise Python truthiness (NaN is truthy, None is not)."""
+    if values.dtype == bool:
+        return values
+    if values.dtype == object:
+        return np.array([bool(v) for v in values], dtype=bool)
+    return values != 0
+
+
+def _as_float(values):
+    if values.dtype == object:
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    return values.astype(float, copy=False)
+
+
+def prediction_signals(strategy, frame):
+    """
+    Vectorized entry signal shared by PredictionStrategy and the entry leg of
+    HybridStrategy. Mirrors their per-row filters (NaN deltas, minute window,
+    sharp event, weighted score, ask price sanity) over every row at once.
+
+    Uses the strategy's MIN_MINUTE, MAX_MINUTE, PRICE_DELTA_WEIGHT,
+    LIQUIDITY_IMBALANCE_WEIGHT and MIN_SCORE_THRESHOLD attributes.
+    """
+    n_rows = len(frame)
+    arrays = frame.arrays
+    no_signal = {
+        'signal': np.zeros(n_rows, dtype=bool),
+        'side': np.full(n_rows, None, dtype=object),
+        'price': np.full(n_rows, np.nan),
+        'score': np.zeros(n_rows),
+    }
+    if any(col not in arrays for col in PREDICTION_SIGNAL_COLUMNS):
+        return no_signal  # decide() returns None on rows without pre-processed features
+
+    minute = _as_float(arrays["MinuteFromStart"])
+    up_delta = _as_float(arrays["UpMidDelta"])
+    down_delta = _as_float(arrays["DownMidDelta"])
+    imbalance = _as_float(arrays["BidLiquidityImbalance"])
+
+    up_score = np.where(up_delta > 0, strategy.PRICE_DELTA_WEIGHT, 0) + np.where(imbalance > 0, strategy.LIQUIDITY_IMBALANCE_WEIGHT, 0)
+    down_score = np.where(down_delta > 0, strategy.PRICE_DELTA_WEIGHT, 0) + np.where(imbalance < 0, strategy.LIQUIDITY_IMBALANCE_WEIGHT, 0)
+    is_up = up_score >= strategy.MIN_SCORE_THRESHOLD
+    is_down = ~is_up & (down_score >= strategy.MIN_SCORE_THRESHOLD)
+
+    up_ask = _as_float(arrays["UpAsk"]) if "UpAsk" in arrays else np.full(n_rows, np.nan)
+    down_ask = _as_float(arrays["DownAsk"]) if "DownAsk" in arrays else np.full(n_rows, np.nan)
+    price = np.where(is_up, up_ask, down_ask)
+
+    signal = (
+        ~np.isnan(up_delta)
+        & (minute >= strategy.MIN_MINUTE) & (minute <= strategy.MAX_MINUTE)
+        & _truthy(arrays["SharpEvent"])
+        & (is_up | is_down)
+        & (price > 0) & (price < 1.0)
+    )
+    side = np.where(is_up, 'Up', np.where(is_down, 'Down', None)).astype(object)
+    side[~signal] = None
+    return {
+        'signal': signal,
+        'side': side,
+        'price': np.where(signal, price, np.nan),
+        'score': np.where(signal, np.where(is_up, up_score, down_score), 0.0),
+    }
@@ -2,6 +2,8 @@ from decimal import Decimal
 import pandas as pd
 import math
 from .base_strategy import Strategy
+from .batch_signals import prediction_signals
+from src.market_frames import market_key
 
 class HybridStrategy(Strategy):
     def __init__(self):
@@ -119,8 +121,17 @@ class HybridStrategy(Strategy):
             return False
         return new_combined_avg_p < self.MAX_HEDGING_COST
 
+    def decide_batch(self, frame):
+        # Only the entry leg is stateless; rebalancing is handled by
+        # requires_every_row() once a market has an unbalanced position.
+        return prediction_signals(self, frame)
+
+    def requires_every_row(self, market_id):
+        portfolio = self.portfolio_state.get(market_id)
+        return portfolio is not None and portfolio['qty_yes'] != portfolio['qty_no']
+
     def decide(self, market_data_point, current_capital):
-        market_id = (market_data_point['TargetTime'], market_data_point['Expiration'])
+        market_id = market_key(market_data_point)
         portfolio = self._get_or_init_portfolio(market_id)
         qty_yes = portfolio['qty_yes']
         qty_no = portfolio['qty_no']
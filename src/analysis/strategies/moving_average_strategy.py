@@ -1,4 +1,5 @@
 from .base_strategy import Strategy
+from src.market_frames import market_key
 import pandas as pd
 import math
 
@@ -62,7 +63,7 @@ class MovingAverageStrategy(Strategy):
             return None
 
         # --- Imbalance Filter ---
-        market_id = (market_data_point['TargetTime'], market_data_point['Expiration'])
+        market_id = market_key(market_data_point)
         current_position = self.portfolio.get(market_id, {'Up': 0, 'Down': 0})
         up_shares = current_position['Up']
         down_shares = current_position['Down']
@@ -1,5 +1,6 @@
 import pandas as pd
 from .base_strategy import Strategy
+from .batch_signals import prediction_signals
 import math
 
 class PredictionStrategy(Strategy):
@@ -41,6 +42,11 @@ class PredictionStrategy(Strategy):
 
         return side, score
 
+    def decide_batch(self, frame):
+        # The signal is a pure function of the row, so it can be computed for
+        # every row at once; decide() is then only called on signalled rows.
+        return prediction_signals(self, frame)
+
     def decide(self, market_data_point, current_capital):
         # We assume the dataframe passed to the backtester is pre-processed with these columns.
         minute = market_data_point.get("MinuteFromStart")
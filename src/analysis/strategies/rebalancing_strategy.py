@@ -1,5 +1,6 @@
 from decimal import Decimal
 from .base_strategy import Strategy
+from src.market_frames import market_key
 
 class RebalancingStrategy(Strategy):
     def __init__(self):
@@ -110,7 +111,7 @@ class RebalancingStrategy(Strategy):
         return new_combined_avg_p < self.SAFETY_MARGIN_M
 
     def decide(self, market_data_point, current_capital):
-        market_id = (market_data_point['TargetTime'], market_data_point['Expiration'])
+        market_id = market_key(market_data_point)
         portfolio = self._get_or_init_portfolio(market_id)
         side_to_buy = None
 
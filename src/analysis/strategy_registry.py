@@ -0,0 +1,37 @@
+import importlib
+from .preprocessing import preprocess_base_features, preprocess_moving_average_features
+from .strategies.prediction_strategy import PredictionStrategy
+from .strategies.hybrid_strategy import HybridStrategy
+from .strategies.moving_average_strategy import MovingAverageStrategy
+from .strategies.rebalancing_strategy import RebalancingStrategy
+from .strategies.avg_arbitrage_strategy import AvgArbitrageStrategy
+
+# Strategy name -> (strategy class, preprocessing steps applied after load_data)
+STRATEGIES = {
+    'prediction': (PredictionStrategy, [preprocess_base_features]),
+    'hybrid': (HybridStrategy, [preprocess_base_features]),
+    'moving_average': (MovingAverageStrategy, [preprocess_base_features, preprocess_moving_average_features]),
+    'rebalancing': (RebalancingStrategy, []),
+    'avg_arbitrage': (AvgArbitrageStrategy, []),
+}
+
+
+def resolve_strategy(spec):
+    """
+    Returns (strategy class, preprocessors) for a registry name such as
+    'prediction', or for a 'package.module:ClassName' path to any Strategy
+    subclass (which then runs on the raw loaded data).
+    """
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    if ':' not in spec:
+        raise ValueError(f"Unknown strategy '{spec}'. Use one of {', '.join(sorted(STRATEGIES))} or 'module:Class'.")
+    module_name, class_name = spec.split(':', 1)
+    strategy_cls = getattr(importlib.import_module(module_name), class_name)
+    return strategy_cls, []
+
+
+def apply_preprocessors(df, preprocessors):
+    for preprocess in preprocessors:
+        df = preprocess(df)
+    return df
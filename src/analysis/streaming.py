@@ -0,0 +1,164 @@
+import argparse
+import os
+import pandas as pd
+import src.config as config
+from src.market_frames import MarketRegistry, MARKET_ID_COLUMN
+from .outcomes import load_outcome_table, outcomes_by_market
+from src.storage.market_store import iter_market_data_chunks
+
+STREAM_CHUNK_ROWS = 5_000
+# Rows are only handed to the engine once data at least this far past them
+# has been read, so slippage look-ahead and slightly out-of-order rows
+# (the collector writes with a ~1s jitter) see the same ticks as a full load.
+STREAM_LOOKAHEAD_SECONDS = 60
+
+_READY_COLUMN = '_StreamReady'
+
+
+def read_market_data_chunks(data_file, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yields `data_file` as parsed, UTC-localized DataFrame chunks of `chunk_rows` rows."""
+    return iter_market_data_chunks(data_file, chunk_rows)
+
+
+def _sort_rows(frame):
+    """Orders streamed rows by Timestamp, keeping file order for ticks sharing a second (as every loader does)."""
+    return frame.sort_values('Timestamp', kind='stable')
+
+
+class StreamWindow:
+    """One batch of rows that are ready to be backtested."""
+    __slots__ = ('rows', 'buffered', 'data_file')
+
+    def __init__(self, rows, buffered, data_file):
+        self.rows = rows  # Preprocessed rows to run, Timestamp-ordered
+        self.buffered = buffered  # Every raw row currently held (for the slippage index)
+        self.data_file = data_file
+
+
+class MarketDataStream:
+    """
+    Reads a sequence of daily market data files in chunks and yields them as
+    time-ordered StreamWindows.
+
+    Only the rows of markets that have not yet resolved are kept: the rows
+    already run (needed so preprocessors see each market's full history),
+    and the rows read but not yet released because they are within
+    `lookahead_seconds` of the newest tick. Once the engine has run past a
+    market's expiration, its rows and outcome are dropped. Memory is bounded
+    by the chunk size plus the markets open at any one time, however many
+    files are streamed.
+
+    Market outcomes are read from each file's cached outcome table. The
+    next file's table is merged in too, so markets that straddle midnight
+    resolve from their true last tick.
+
+    Every chunk is labelled with MarketIds from `market_registry`, so ids
+    stay consistent across chunks and files.
+    """
+
+    def __init__(self, data_files, preprocessors=(), chunk_rows=STREAM_CHUNK_ROWS,
+                 lookahead_seconds=STREAM_LOOKAHEAD_SECONDS, market_registry=None):
+        self.data_files = list(data_files)
+        self.preprocessors = list(preprocessors)
+        self.chunk_rows = chunk_rows
+        self.lookahead = pd.Timedelta(seconds=lookahead_seconds)
+        self.market_registry = market_registry if market_registry is not None else MarketRegistry()
+        self.outcomes = {}  # MarketId -> outcome record, for unreleased markets only
+        self._outcome_files_loaded = set()
+        self._history = None  # Rows already run, for markets that have not been released
+        self._pending = None  # Rows read but not yet released to the engine
+
+    def _load_outcomes(self, file_index):
+        for index in (file_index, file_index + 1):
+            if index >= len(self.data_files) or index in self._outcome_files_loaded:
+                continue
+            self._outcome_files_loaded.add(index)
+            table = load_outcome_table(self.data_files[index])
+            for market_id, record in outcomes_by_market(table, self.market_registry).items():
+                existing = self.outcomes.get(market_id)
+                if existing is None or record['ResolutionTimestamp'] >= existing['ResolutionTimestamp']:
+                    self.outcomes[market_id] = record
+
+    def _take_ready(self, watermark):
+        """Splits off and returns the pending rows at or before `watermark` (all of them if None)."""
+        pending = _sort_rows(self._pending)
+        if watermark is None:
+            ready, self._pending = pending, pending.iloc[:0]
+        else:
+            is_ready = (pending['Timestamp'] <= watermark).to_numpy()
+            ready, self._pending = pending[is_ready], pending[~is_ready]
+        return ready
+
+    def _build_window(self, ready, data_file):
+        if self.preprocessors:
+            # Run the preprocessors over each open market's full history so that
+            # per-market diffs and rolling windows match a whole-file load.
+            frames = [ready.assign(**{_READY_COLUMN: True})]
+            if self._history is not None and len(self._history):
+                frames.insert(0, self._history.assign(**{_READY_COLUMN: False}))
+            df = pd.concat(frames, ignore_index=True)
+            for preprocess in self.preprocessors:
+                df = preprocess(df)
+            rows = df[df[_READY_COLUMN].to_numpy()].drop(columns=[_READY_COLUMN])
+        else:
+            rows = ready
+        rows = rows.reset_index(drop=True)
+
+        buffered_frames = [frame for frame in (self._history, ready, self._pending) if frame is not None and len(frame)]
+        buffered = _sort_rows(pd.concat(buffered_frames))
+        return StreamWindow(rows, buffered, data_file)
+
+    def _release(self, ready):
+        """Adds `ready` to the history, then drops every market that expired by its last tick."""
+        history = ready if self._history is None else pd.concat([self._history, ready], ignore_index=True)
+        last_timestamp = ready['Timestamp'].max()
+        expired = (history['Expiration'] <= last_timestamp).to_numpy()
+        for market_id in pd.unique(history[MARKET_ID_COLUMN].to_numpy()[expired]).tolist():
+            self.outcomes.pop(market_id, None)
+        self._history = history[~expired]
+
+    def windows(self):
+        """Yields StreamWindows in timestamp order until every file has been read."""
+        data_file = None
+        for file_index, data_file in enumerate(self.data_files):
+            self._load_outcomes(file_index)
+            for chunk in read_market_data_chunks(data_file, self.chunk_rows):
+                self.market_registry.add_column(chunk)
+                self._pending = chunk if self._pending is None else pd.concat([self._pending, chunk], ignore_index=True)
+                ready = self._take_ready(self._pending['Timestamp'].max() - self.lookahead)
+                if len(ready):
+                    yield self._build_window(ready, data_file)
+                    self._release(ready)
+
+        if self._pending is not None and len(self._pending):
+            ready = self._take_ready(None)
+            yield self._build_window(ready, data_file)
+            self._release(ready)
+
+
+def main():
+    from .backtester import Backtester
+    from .strategy_registry import STRATEGIES, resolve_strategy
+
+    parser = argparse.ArgumentParser(description="Backtest a strategy over a range of daily data files with bounded memory.")
+    parser.add_argument("--strategy", default='prediction', help=f"One of {', '.join(sorted(STRATEGIES))} or 'module:Class'.")
+    parser.add_argument("--start", default=None, help="First date to include (yyyymmdd). Defaults to the earliest file.")
+    parser.add_argument("--end", default=None, help="Last date to include (yyyymmdd). Defaults to the latest file.")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS, help="Rows read per chunk.")
+    args = parser.parse_args()
+
+    data_files = config.get_data_files(args.start, args.end)
+    if not data_files:
+        print("No market data files found in the requested date range.")
+        return
+    print(f"Streaming {len(data_files)} file(s): {', '.join(os.path.basename(f) for f in data_files)}")
+
+    strategy_cls, preprocessors = resolve_strategy(args.strategy)
+    backtester = Backtester(initial_capital=config.INITIAL_CAPITAL)
+    backtester.run_stream(strategy_cls(), data_files, preprocessors=preprocessors, chunk_rows=args.chunk_rows)
+    backtester.generate_report()
+    backtester.close()
+
+
+if __name__ == "__main__":
+    main()
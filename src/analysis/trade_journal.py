@@ -0,0 +1,50 @@
+import json
+import logging
+import logging.handlers
+import queue
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Serializes a record whose `msg` is a dict as one JSON line."""
+
+    def format(self, record):
+        return json.dumps(record.msg, default=str)
+
+
+class TradeJournal:
+    """
+    Structured JSONL trade journal written by a background thread.
+
+    `record()` only puts a LogRecord carrying the entry dict on a queue; a
+    QueueListener thread turns it into a JSON line and writes it to disk.
+    Records go straight onto the queue rather than through a named logger,
+    so no logger outlives the journal.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._queue = queue.SimpleQueue()
+        self._file_handler = logging.FileHandler(filename)
+        self._file_handler.setFormatter(JsonLinesFormatter())
+        self._listener = logging.handlers.QueueListener(self._queue, self._file_handler)
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._listener.start()
+            self._running = True
+
+    def record(self, entry):
+        # The entry dict is serialized by the listener thread, not here
+        self._queue.put_nowait(logging.makeLogRecord({'msg': entry, 'levelno': logging.INFO, 'levelname': 'INFO'}))
+
+    def flush(self):
+        """Stops the listener, which drains every queued entry to the file."""
+        if self._running:
+            self._listener.stop()
+            self._running = False
+        self._file_handler.flush()
+
+    def close(self):
+        self.flush()
+        self._file_handler.close()
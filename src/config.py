@@ -5,12 +5,24 @@ import glob
 # --- Data File Configuration ---
 DATA_DIR = "data"
 BASE_DATA_FILENAME = "market_data"
+USER_DATA_FILENAME = "user_data" # Tracked user's trades (see user_trade_collector.py)
 DATE_FILENAME_FORMAT = "%Y%m%d" # yyyymmdd
 
+# Columns of every market data file, in the order the data logger writes them
+MARKET_DATA_COLUMNS = [
+    "Timestamp", "TargetTime", "Expiration",
+    "UpBid", "UpAsk", "UpMid", "UpSpread", "UpBidLiquidity", "UpAskLiquidity",
+    "DownBid", "DownAsk", "DownMid", "DownSpread", "DownBidLiquidity", "DownAskLiquidity"
+]
+
 # --- Analysis Configuration ---
 # Set to 0 to use the latest available data file for analysis.
 # Set to a specific date in yyyymmdd format (e.g., 20251226) to analyze that day's data.
 ANALYSIS_DATE = 0
+# Set either bound (yyyymmdd) to analyze a date range instead; 0 leaves that side open.
+# When both are 0, ANALYSIS_DATE picks the single day.
+ANALYSIS_START_DATE = 0
+ANALYSIS_END_DATE = 0
 
 def get_logger_filename():
     """Always returns the filename for the current date, for the data logger."""
@@ -40,10 +52,138 @@ def get_analysis_filename():
         latest_file = max(files, key=os.path.basename)
         return latest_file
 
+def get_analysis_date_range():
+    """Returns the configured (start, end) analysis range, or None to use a single day."""
+    if not ANALYSIS_START_DATE and not ANALYSIS_END_DATE:
+        return None
+    return (ANALYSIS_START_DATE or None, ANALYSIS_END_DATE or None)
+
+def get_data_files(start_date=None, end_date=None, base_filename=BASE_DATA_FILENAME):
+    """
+    Returns every `base_filename` data file (market data by default) whose
+    yyyymmdd date lies in [start_date, end_date], sorted by date. Either
+    bound may be None (or 0) to leave that side of the range open.
+    """
+    search_pattern = os.path.join(DATA_DIR, f"{base_filename}_*.csv")
+    files = []
+    for file_path in glob.glob(search_pattern):
+        date_str = os.path.splitext(os.path.basename(file_path))[0][len(base_filename) + 1:]
+        if not date_str.isdigit():
+            continue
+        if start_date and int(date_str) < int(start_date):
+            continue
+        if end_date and int(date_str) > int(end_date):
+            continue
+        files.append(file_path)
+    return sorted(files, key=os.path.basename)
+
+# Derived files live in a subdirectory next to their data file, so they never
+# match the `market_data_*.csv` glob used to discover data files.
+SIDECAR_DIR_NAME = "cache"
+
+def get_sidecar_filename(data_file, kind, extension="csv"):
+    """
+    Returns the path of a derived file stored next to `data_file`.
+    Example: data/market_data_20251226.csv -> data/cache/market_data_20251226.outcomes.csv
+    """
+    directory, basename = os.path.split(data_file)
+    stem, _ = os.path.splitext(basename)
+    return os.path.join(directory, SIDECAR_DIR_NAME, f"{stem}.{kind}.{extension}")
+
+# Typed columnar copies of the daily CSVs (see src/storage/market_store.py),
+# one file per day: data/store/market_data_20251226.parquet. Parquet/Feather
+# (and the feature cache) need pyarrow, which requirements.txt installs; without
+# it the loaders fall back to the CSVs and features are recomputed.
+STORE_DIR_NAME = "store"
+STORE_FORMAT = "parquet" # "parquet", "feather", "ticks" (fixed-width, memory-mapped) or "archive" (block-compressed)
+# Block-compressed archives (src/storage/archive.py): "lzma" (smallest) or "gzip" (faster to read)
+ARCHIVE_COMPRESSION = "lzma"
+ARCHIVE_BLOCK_ROWS = 4096
+
+def get_store_filename(data_file, fmt=None):
+    """
+    Returns the path of the columnar copy of `data_file` in the given format.
+    Example: data/market_data_20251226.csv -> data/store/market_data_20251226.parquet
+    """
+    directory, basename = os.path.split(data_file)
+    stem, _ = os.path.splitext(basename)
+    return os.path.join(directory, STORE_DIR_NAME, f"{stem}.{fmt or STORE_FORMAT}")
+
+# Optional order book depth capture (see src/storage/depth_store.py): the data
+# logger also appends the top DEPTH_LEVELS price levels of every book it logs,
+# delta encoded, to data/depth/market_data_YYYYMMDD.depth.
+DEPTH_CAPTURE_ENABLED = False
+DEPTH_LEVELS = 20
+DEPTH_KEYFRAME_INTERVAL = 120 # Captures of a book between full snapshots
+DEPTH_DIR_NAME = "depth"
+
+def get_depth_filename(data_file):
+    """
+    Returns the depth capture path of `data_file`.
+    Example: data/market_data_20251226.csv -> data/depth/market_data_20251226.depth
+    """
+    directory, basename = os.path.split(data_file)
+    stem, _ = os.path.splitext(basename)
+    return os.path.join(directory, DEPTH_DIR_NAME, f"{stem}.depth")
+
+# Preprocessed feature frames are cached under data/cache/features/ (see
+# src/analysis/feature_cache.py), keyed by the source files, feature code and
+# parameters. Set FEATURE_CACHE_ENABLED = False to always recompute.
+FEATURE_CACHE_ENABLED = True
+FEATURE_CACHE_MAX_ENTRIES = 32
+FEATURE_CACHE_COMPRESSION = "zstd"
+
+# dtypes of loaded market data (see src/market_frames.py and src/storage/compact.py):
+# "default" (float64 / datetime64) or "compact" (float32 book fields and
+# features, categorical market keys), about half the memory.
+LOAD_PROFILE = "default"
+
+# Optional SQLite tick database (see src/storage/tick_db.py). When enabled, the
+# data logger also appends every batch to it, and date-range loads (backtester,
+# dashboard) query it instead of the CSVs. Import the existing files first with
+# `python -m src.storage.tick_db`.
+TICK_DB_ENABLED = False
+TICK_DB_FILE = os.path.join(DATA_DIR, "ticks.sqlite")
+
+# Data-quality scan (see src/analysis/data_quality.py). The backtester drops
+# rows carrying any of QUALITY_SKIP_FLAGS (flag names, e.g. ["EMPTY_BOOK",
+# "CROSSED"]); empty keeps every row.
+QUALITY_GAP_SECONDS = 5
+QUALITY_STALE_SECONDS = 30
+QUALITY_PAIR_COST_RANGE = (0.9, 1.2)
+QUALITY_SKIP_FLAGS = []
+
+# Shared HTTP client for the Polymarket APIs (see src/data_collection/http_client.py)
+HTTP_TIMEOUT_SECONDS = 10
+HTTP_MAX_RETRIES = 2
+HTTP_BACKOFF_SECONDS = 0.2 # Jittered exponential backoff: up to 0.2s, 0.4s, ... between attempts
+HTTP_BACKOFF_MAX_SECONDS = 2.0
+HTTP_RATE_LIMIT_PER_SECOND = 20 # Token-bucket limit over all requests; 0 disables it
+HTTP_RATE_LIMIT_BURST = 20
+HTTP_POOL_SIZE = 4 # Keep-alive connections per host per thread
+HTTP_LATENCY_REPORT_SECONDS = 300 # How often the data logger prints request latencies
+CLOB_MULTI_BOOK = True # Fetch both outcome books in one POST /books request (falls back to parallel GETs)
+
+# Market rollover (see src/data_collection/market_rollover.py): the data logger
+# resolves the token ids of the next ROLLOVER_PREWARM_MARKETS markets ahead of
+# time, checking every ROLLOVER_REFRESH_SECONDS.
+ROLLOVER_PREWARM_MARKETS = 2
+ROLLOVER_REFRESH_SECONDS = 60
+MARKET_CACHE_ENTRIES = 4 # Markets whose token ids are kept (previous, current and upcoming)
+
 # --- Other Configurations ---
 FETCH_INTERVAL_SECONDS = 1
 WRITE_INTERVAL_SECONDS = 5
 MAX_WORKERS = 15
+# Write runs of unchanged ticks as one row with LastSeen/Count columns (see src/storage/compaction.py).
+# Only applies to a new day's file; an existing file keeps the layout of its header.
+LOGGER_COMPACT_RUNS = False
+# "poll": request both books every FETCH_INTERVAL_SECONDS. "websocket": subscribe to the CLOB
+# market channel and log the latest books once per second in which they changed (needs the
+# websockets package from requirements.txt; see src/data_collection/ws_ingest.py).
+LOGGER_INGEST_MODE = "poll"
 INITIAL_CAPITAL = 1000.0
 SLIPPAGE_SECONDS = 1
+BACKTEST_LOG_MODE = "full" # One of: full, summary, journal, off (see analysis/backtester.py)
+BACKTEST_LOG_DIR = "logs" # Where Backtester run logs and trade journals are written
 TRACKED_USER_ADDRESS = "0x6031b6eed1c97e853c6e0f03ad3ce3529351f96d"
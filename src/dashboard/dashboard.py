@@ -1,4 +1,9 @@
 import src.config as config
+from src.analysis.market_summary import load_market_summaries, market_stats
+from src.market_frames import MARKET_COLUMNS
+from src.storage.market_store import load_market_data
+from src.storage.market_index import load_date_range
+from src.storage.summary_store import load_market_summary
 import numpy as np
 import os
 import streamlit as st
@@ -12,15 +17,22 @@ import datetime
 DATA_FILE = config.get_analysis_filename()
 
 
+def file_date(data_file):
+    """market_data_20251226.csv -> '20251226'"""
+    return os.path.splitext(os.path.basename(data_file))[0].rsplit('_', 1)[-1]
+
+
 st.set_page_config(page_title="Polymarket BTC Monitor", layout="wide")
 
 st.title("📊 Polymarket 15m BTC Monitor - Historical Analysis")
 
-def load_data():
+def load_data(date_range=None):
     try:
-        df = pd.read_csv(DATA_FILE)
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-        return df
+        if date_range is None:
+            return load_market_data(DATA_FILE)
+        # Multi-day ranges are read through the market index, one market slice at a time
+        df = load_date_range(*date_range)
+        return df if not df.empty else None
     except FileNotFoundError:
         return None
     except Exception as e:
@@ -31,32 +43,36 @@ def load_data():
 if st.button('🔄 Refresh Data', key='refresh_data_button'):
     st.rerun()
 
-df = load_data()
+# Date range: defaults to the configured analysis range, else the single analysis file
+available_dates = [file_date(f) for f in config.get_data_files()]
+date_range = config.get_analysis_date_range()
+if len(available_dates) > 1:
+    if date_range is None:
+        default_range = (file_date(DATA_FILE), file_date(DATA_FILE))
+    else:
+        default_range = (str(date_range[0] or available_dates[0]), str(date_range[1] or available_dates[-1]))
+    if default_range[0] not in available_dates or default_range[1] not in available_dates:
+        default_range = (available_dates[-1], available_dates[-1])
+    selected_range = st.sidebar.select_slider("Date range", options=available_dates, value=default_range)
+    # The analysis file alone is read directly, so a file still being logged stays live
+    date_range = None if selected_range == (file_date(DATA_FILE), file_date(DATA_FILE)) else selected_range
+
+df = load_data(date_range)
 
 if df is not None and not df.empty:
     # Calculate derived metrics for strategy analysis
     df['PairCost'] = df['UpAsk'] + df['DownAsk']  # Cost to buy both sides
     df['SpreadTotal'] = df['UpSpread'] + df['DownSpread']  # Total market spread
-    def calculate_imbalance(row):
-        up_liq = row['UpAskLiquidity']
-        down_liq = row['DownAskLiquidity']
-
-        if up_liq > down_liq:
-            if down_liq > 0:
-                imbalance = up_liq / down_liq
-            else:
-                imbalance = 10
-        elif down_liq > up_liq:
-            if up_liq > 0:
-                imbalance = - (down_liq / up_liq)
-            else:
-                imbalance = -10
-        else: # up_liq == down_liq
-            imbalance = 0
-
-        return max(-10, min(10, imbalance))
-
-    df['LiquidityImbalance'] = df.apply(calculate_imbalance, axis=1)
+    # Ask liquidity ratio, signed towards the deeper side and capped at +/-10
+    # (10 when the other side is empty, 0 when both are equal)
+    up_liq = df['UpAskLiquidity']
+    down_liq = df['DownAskLiquidity']
+    imbalance = np.select(
+        [(up_liq > down_liq) & (down_liq > 0), up_liq > down_liq, (down_liq > up_liq) & (up_liq > 0), down_liq > up_liq],
+        [up_liq / down_liq.where(down_liq > 0), 10, -(down_liq / up_liq.where(up_liq > 0)), -10],
+        default=0
+    )
+    df['LiquidityImbalance'] = np.clip(imbalance, -10, 10)
 
     # Replace 0 values with NaN for plotting purposes, as 0 ask/liquidity means no data for that side
     df.loc[df['UpAsk'] == 0, 'UpAsk'] = np.nan
@@ -212,6 +228,16 @@ if df is not None and not df.empty:
     
     st.plotly_chart(fig, use_container_width=True, config={'scrollZoom': True})
 
+    # === MARKET SUMMARY ===
+    # Read from the per-market summary table rather than regrouped from the ticks
+    with st.expander("📈 Market Summary"):
+        summary = load_market_summary(DATA_FILE) if date_range is None else load_market_summaries(*date_range)
+        summary = market_stats(summary)
+        summary_cols = MARKET_COLUMNS + ['Ticks', 'OpenPairCost', 'ClosePairCost', 'PairCostMin', 'PairCostMean',
+                                         'PairCostMax', 'SpreadTotalMean', 'UpAskLiquidityMean', 'DownAskLiquidityMean',
+                                         'FinalUpAsk', 'FinalDownAsk', 'WinningSide']
+        st.dataframe(summary[summary_cols].sort_values('TargetTime', ascending=False), use_container_width=True)
+
     # === DATA TABLE ===
     with st.expander("📋 View Recent Data"):
         display_cols = ['Timestamp', 'UpAsk', 'DownAsk', 'PairCost',
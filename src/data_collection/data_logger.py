@@ -5,25 +5,33 @@ import os
 import threading
 import queue
 from concurrent.futures import ThreadPoolExecutor
+from . import http_client
 from .fetch_current_polymarket import fetch_polymarket_data_struct
+from .market_rollover import RolloverScheduler
+from .ws_ingest import run_ingest
 
 import src.config as config
+from src.market_frames import MARKET_COLUMNS
+from src.storage.compaction import COMPACTED_COLUMNS, encode_runs, is_compacted_csv
+from src.storage.depth_store import DepthWriter
+from src.storage.summary_store import (
+    append_summary_file, load_market_summary, merge_summaries, read_summary_file, summary_from_rows, write_summary_file
+)
+from src.storage.tick_db import TickDatabase
 
 DATA_FILE = config.get_logger_filename()
 # Thread-safe queue for buffering data
 data_queue = queue.Queue()
 
 def init_csv():
+    """Creates the day's file if needed and returns True if it uses the compacted layout."""
     if not os.path.exists(DATA_FILE):
         with open(DATA_FILE, mode='w', newline='') as file:
             writer = csv.writer(file)
             # Enhanced headers with order book data
-            writer.writerow([
-                "Timestamp", "TargetTime", "Expiration",
-                "UpBid", "UpAsk", "UpMid", "UpSpread", "UpBidLiquidity", "UpAskLiquidity",
-                "DownBid", "DownAsk", "DownMid", "DownSpread", "DownBidLiquidity", "DownAskLiquidity"
-            ])
+            writer.writerow(COMPACTED_COLUMNS if config.LOGGER_COMPACT_RUNS else config.MARKET_DATA_COLUMNS)
         print(f"Created {DATA_FILE} with enhanced order book columns")
+    return is_compacted_csv(DATA_FILE)
 
 def fetch_worker():
     """
@@ -55,21 +63,94 @@ def fetch_worker():
         data_queue.put((timestamp_utc, fetched_data))
         
         # For logging, we can quickly access a key value
-        up_mid = fetched_data['order_books'].get('Up', {}).get('mid_price', 0.0)
-        down_mid = fetched_data['order_books'].get('Down', {}).get('mid_price', 0.0)
+        up_book = fetched_data['order_books'].get('Up', {})
+        down_book = fetched_data['order_books'].get('Down', {})
+        up_mid = up_book.get('mid_price', 0.0)
+        down_mid = down_book.get('mid_price', 0.0)
+        # How far apart the two books were received (0 for one multi-book response)
+        skew = ""
+        if up_book.get('received_at') and down_book.get('received_at'):
+            skew = f" book_skew={abs((up_book['received_at'] - down_book['received_at']).total_seconds()):.3f}s"
         
-        print(f"[{timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')}] Fetched: Up({up_mid:.3f}) Down({down_mid:.3f}) fetch_time={elapsed_time:.3f}s")
+        print(f"[{timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')}] Fetched: Up({up_mid:.3f}) Down({down_mid:.3f}) fetch_time={elapsed_time:.3f}s{skew}")
 
     except Exception as e:
         print(f"[{timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')}] Worker Exception: {e}")
 
-def writer_thread():
+def latest_per_second(batch, now):
+    """
+    Collapses WebSocket rows to the last update per market and whole second.
+    The channel can push several book changes a second, but the file's
+    Timestamps are whole seconds and the backtesters group rows by them.
+    Updates from the second `now` falls in are held back, since more may
+    still arrive. Returns (rows to write, rows held back for the next flush).
+    """
+    cutoff = now.replace(microsecond=0)
+    latest = {}
+    for timestamp_utc, data in sorted(batch, key=lambda x: x[0]):
+        market_second = (data.get('target_time_utc'), data.get('expiration_time_utc'), timestamp_utc.replace(microsecond=0))
+        latest[market_second] = (timestamp_utc, data)
+    ready = [item for item in latest.values() if item[0] < cutoff]
+    held_back = [item for item in latest.values() if item[0] >= cutoff]
+    return ready, held_back
+
+def market_keys(summary):
+    """Returns the (TargetTime, Expiration) pairs present in a summary table."""
+    return set(summary[MARKET_COLUMNS].itertuples(index=False, name=None))
+
+def update_summary(tick_rows, summarised_markets):
+    """
+    Adds `tick_rows`, just appended to the day's file, to its summary sidecar
+    and returns the markets it now covers. Batches of known markets are
+    appended as a few rows; only when a market starts (at each rollover) is
+    the sidecar read back and rewritten with one row per market.
+    """
+    batch = summary_from_rows(tick_rows)
+    markets = market_keys(batch)
+    if markets <= summarised_markets:
+        append_summary_file(DATA_FILE, batch)
+        return summarised_markets
+    current = read_summary_file(config.get_sidecar_filename(DATA_FILE, 'summary'))
+    write_summary_file(DATA_FILE, merge_summaries([current, batch]))
+    return summarised_markets | markets
+
+def writer_thread(compact_runs=False, collapse_seconds=False):
     """
     Worker thread that drains the queue, processes raw data in CPU-intensive batches,
     and writes the final, formatted rows to disk. This centralizes the data processing
     while performing a single batched disk I/O operation per flush.
+
+    With `compact_runs`, each batch is run-length encoded before writing: ticks
+    that repeat the previous book (including same-second duplicates from
+    overlapping workers) are folded into one row with LastSeen/Count columns.
+    Runs never span two flushes, so nothing is held back in memory.
+
+    With `collapse_seconds` (WebSocket ingestion), only the last update per
+    market and second is written (see latest_per_second).
+
+    With config.TICK_DB_ENABLED, every batch is also inserted into the SQLite
+    tick database (one row per tick, in one transaction).
+
+    With config.DEPTH_CAPTURE_ENABLED, the top price levels of every book in
+    the batch are appended to the day's depth file (see depth_store.py).
+
+    After each flush the batch is added to the day's per-market summary (see
+    update_summary), so summary readers never have to rescan the file.
+
+    The CSV is written first; the depth file, tick database and summary are
+    each guarded separately, so none of them can cost the CSV its rows.
     """
     print("Writer thread started.")
+    # sqlite connections belong to the thread that opens them
+    tick_db = TickDatabase() if config.TICK_DB_ENABLED else None
+    depth_writer = DepthWriter(config.get_depth_filename(DATA_FILE)) if config.DEPTH_CAPTURE_ENABLED else None
+    # Bring the day's summary up to date (rebuilt from the file if it is stale)
+    try:
+        summarised_markets = market_keys(load_market_summary(DATA_FILE))
+    except Exception as e:
+        print(f"Error loading market summary: {e}")
+        summarised_markets = set()
+    held_back = []
     while True:
         time.sleep(config.WRITE_INTERVAL_SECONDS)
         
@@ -81,6 +162,9 @@ def writer_thread():
                 data_queue.task_done()
         except queue.Empty:
             pass
+
+        if collapse_seconds:
+            raw_data_batch, held_back = latest_per_second(held_back + raw_data_batch, datetime.datetime.now(datetime.timezone.utc))
         
         if raw_data_batch:
             # --- OPTIMIZATION: Centralized CPU Work ---
@@ -92,7 +176,8 @@ def writer_thread():
             final_rows_to_write = []
             for timestamp_utc, data in raw_data_batch:
                 # 2. Perform all string formatting and rounding in this loop
-                timestamp_str = timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')
+                # (the timestamp is kept whole-second, as written, until runs are encoded)
+                timestamp_sec = timestamp_utc.replace(microsecond=0)
                 target_time = data.get('target_time_utc', '')
                 expiration = data.get('expiration_time_utc', '')
                 target_time_str = target_time.strftime('%Y-%m-%d %H:%M:%S') if target_time else ''
@@ -103,7 +188,7 @@ def writer_thread():
 
                 # Process and round all numeric data
                 row = [
-                    timestamp_str, target_time_str, expiration_str,
+                    timestamp_sec, target_time_str, expiration_str,
                     round(up_book.get('best_bid', 0.0), 3),
                     round(up_book.get('best_ask', 0.0), 3),
                     round(up_book.get('mid_price', 0.0), 3),
@@ -118,41 +203,98 @@ def writer_thread():
                     round(down_book.get('ask_liquidity', 0.0), 3)
                 ]
                 final_rows_to_write.append(row)
+
+            tick_rows = [[row[0].strftime('%Y-%m-%d %H:%M:%S')] + row[1:] for row in final_rows_to_write]
+            if compact_runs:
+                final_rows_to_write = encode_runs(final_rows_to_write)
+                for row in final_rows_to_write:
+                    if row[-2] is not None:
+                        row[-2] = row[-2].strftime('%Y-%m-%d %H:%M:%S')
+            for row in final_rows_to_write:
+                row[0] = row[0].strftime('%Y-%m-%d %H:%M:%S')
             
-            # 3. Perform the single I/O operation
+            # 3. Perform the single I/O operation, before any optional sink
+            written = False
             try:
                 with open(DATA_FILE, mode='a', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerows(final_rows_to_write)
+                written = True
                 print(f"--> Flushed {len(final_rows_to_write)} records to disk.")
             except Exception as e:
                 print(f"Error writing to CSV: {e}")
 
+            # 4. Optional sinks: a failure in one never affects the CSV or the others
+            if depth_writer is not None:
+                try:
+                    depth_writer.write_books(
+                        (timestamp_utc, data['target_time_utc'], data['expiration_time_utc'], outcome, book['bids'], book['asks'])
+                        for timestamp_utc, data in raw_data_batch
+                        for outcome, book in data.get('order_books', {}).items() if 'bids' in book
+                    )
+                except Exception as e:
+                    print(f"Error writing depth capture: {e}")
+
+            if tick_db is not None:
+                try:
+                    tick_db.insert_rows(tick_rows, DATA_FILE)
+                except Exception as e:
+                    print(f"Error writing to tick database: {e}")
+
+            # The summary only covers rows that reached the file. It is updated
+            # after the append, so its sidecar stays newer than the data.
+            if written:
+                try:
+                    summarised_markets = update_summary(tick_rows, summarised_markets)
+                except Exception as e:
+                    print(f"Error updating market summary: {e}")
+
 def main():
     print("Starting Threaded Data Logger...")
     print(f" - Fetch Interval: {config.FETCH_INTERVAL_SECONDS}s")
     print(f" - Write Buffer: {config.WRITE_INTERVAL_SECONDS}s")
     print(f" - Max Concurrent Requests: {config.MAX_WORKERS}")
     
-    init_csv()
+    compact_runs = init_csv()
+    if compact_runs:
+        print(" - Compacting runs of unchanged ticks")
+    websocket = config.LOGGER_INGEST_MODE == "websocket"
     
     # Start the writer thread
-    w_thread = threading.Thread(target=writer_thread, daemon=True)
+    w_thread = threading.Thread(target=writer_thread, args=(compact_runs, websocket), daemon=True)
     w_thread.start()
+
+    # Resolve upcoming markets ahead of each 15-minute rollover
+    RolloverScheduler().start()
     
+    if websocket:
+        # Book changes are pushed by the CLOB market channel instead of polled
+        print(" - Ingesting from the CLOB WebSocket market channel")
+        try:
+            run_ingest(data_queue.put)
+        except KeyboardInterrupt:
+            print("\nStopping logger...")
+            print("Logged stopped.")
+        return
+
     # Create a thread pool for fetch tasks, use manual shutdown control
     executor = ThreadPoolExecutor(max_workers=config.MAX_WORKERS)
     
+    last_report = time.time()
     try:
         while True:
             # Submit a new fetch task
             executor.submit(fetch_worker)
             time.sleep(config.FETCH_INTERVAL_SECONDS)
+            if time.time() - last_report >= config.HTTP_LATENCY_REPORT_SECONDS:
+                print(f"Request latencies:\n{http_client.format_latency_report()}")
+                last_report = time.time()
     except KeyboardInterrupt:
         print("\nStopping logger...")
         # Cancel pending futures and don't wait for running ones
         # This ensures we exit immediately when user hits Ctrl+C
         executor.shutdown(wait=False, cancel_futures=True)
+        print(f"Request latencies:\n{http_client.format_latency_report()}")
         print("Logged stopped.")
     except Exception as e:
         print(f"Main loop error: {e}")
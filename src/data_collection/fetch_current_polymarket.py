@@ -1,121 +1,238 @@
-import requests
+import heapq
+import threading
 import time
 import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import src.config as config
+from . import http_client
 from .get_current_markets import get_current_market_urls
 
 # Configuration
 POLYMARKET_API_URL = "https://gamma-api.polymarket.com/events"
 CLOB_API_URL = "https://clob.polymarket.com/book"
+CLOB_BOOKS_API_URL = "https://clob.polymarket.com/books"
 
-# Global cache to store token IDs for the current market slug
-_market_cache = {
-    "slug": None,
-    "clob_token_ids": None,
-    "outcomes": None
-}
+# Cleared if the CLOB rejects multi-book requests; single books are then fetched in parallel
+_multi_book_supported = True
+# Shared by all fetch workers for the parallel single-book requests
+_book_executor = ThreadPoolExecutor(max_workers=2 * config.MAX_WORKERS, thread_name_prefix="clob-book")
+
+
+class MarketTokenCache:
+    """
+    Thread-safe cache of the token ids and outcomes of the last few market
+    slugs looked up (current and pre-warmed upcoming markets, see
+    market_rollover.py), oldest evicted first.
+
+    Lookups of one slug are single-flight: when several workers miss the
+    cache for the same slug at once, one queries the Gamma API and the
+    others wait for its result instead of repeating the request.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or config.MARKET_CACHE_ENTRIES
+        self.entries = OrderedDict()  # slug -> (clob_token_ids, outcomes)
+        self.lock = threading.Lock()
+        self.slug_locks = {}
+
+    def get(self, slug):
+        with self.lock:
+            return self.entries.get(slug)
+
+    def put(self, slug, clob_token_ids, outcomes):
+        with self.lock:
+            self.entries[slug] = (clob_token_ids, outcomes)
+            self.entries.move_to_end(slug)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_lookup(self, slug, lookup):
+        """
+        Returns (clob_token_ids, outcomes, error) of `slug` from the cache, or
+        from `lookup(slug)` on a miss. Only successful lookups are cached.
+        """
+        cached = self.get(slug)
+        if cached is not None:
+            return (*cached, None)
+        with self.lock:
+            slug_lock = self.slug_locks.setdefault(slug, threading.Lock())
+        with slug_lock:
+            # Another worker may have resolved it while this one waited
+            cached = self.get(slug)
+            if cached is not None:
+                return (*cached, None)
+            clob_token_ids, outcomes, err = lookup(slug)
+            if not err:
+                self.put(slug, clob_token_ids, outcomes)
+        if not err:
+            # Later callers hit the cache before ever needing the lock
+            with self.lock:
+                self.slug_locks.pop(slug, None)
+        return clob_token_ids, outcomes, err
+
+
+# Token ids of the current and upcoming markets, shared by all fetch workers
+market_token_cache = MarketTokenCache()
+
+# Levels summed into the bid/ask liquidity fields
+LIQUIDITY_LEVELS = 5
+
+def _price_levels(levels):
+    # data structure: [{'price': '0.38', 'size': '...'}, ...]; each field is converted once
+    return [(float(level['price']), float(level['size'])) for level in levels]
+
+def summarize_levels(top_bids, top_asks):
+    """
+    Book summary from the best levels of each side, as (price, size) tuples
+    best first: bid, ask, mid, spread, and the liquidity of the top 5 levels.
+    """
+    best_bid = top_bids[0][0] if top_bids else 0.0
+    best_ask = top_asks[0][0] if top_asks else 0.0
+    
+    # Calculate mid price and spread
+    mid_price = 0.0
+    spread = 0.0
+    if best_bid > 0 and best_ask > 0:
+        mid_price = (best_bid + best_ask) / 2.0
+        spread = best_ask - best_bid
+        
+    return {
+        'best_bid': best_bid,
+        'best_ask': best_ask,
+        'mid_price': mid_price,
+        'spread': spread,
+        'bid_liquidity': sum(size for _, size in top_bids[:LIQUIDITY_LEVELS]),
+        'ask_liquidity': sum(size for _, size in top_asks[:LIQUIDITY_LEVELS])
+    }
+
+def parse_order_book(data, depth=None):
+    """
+    Summarises a CLOB order book response.
+    Returns dict with bid, ask, mid, spread, and liquidity depth. With
+    `depth`, it also holds the top `depth` levels of each side as 'bids'
+    (highest first) and 'asks' (lowest first), as (price, size) tuples.
+
+    --- OPTIMIZATION: Single-pass heap selection ---
+    Each level is converted to floats once, and one heap pass per side
+    selects the best levels (O(n log k)) instead of taking max() and then
+    fully sorting the side to sum its top 5.
+    """
+    keep = max(LIQUIDITY_LEVELS, depth or 0)
+    # Bids: the HIGHEST prices someone is willing to pay; asks: the LOWEST prices someone will sell for
+    top_bids = heapq.nlargest(keep, _price_levels(data.get('bids', [])))
+    top_asks = heapq.nsmallest(keep, _price_levels(data.get('asks', [])))
+    book = summarize_levels(top_bids, top_asks)
+    if depth:
+        book['bids'] = top_bids[:depth]
+        book['asks'] = top_asks[:depth]
+    return book
+
+def book_depth():
+    """Levels kept per side for depth capture (config.DEPTH_LEVELS), or None when it is off."""
+    return config.DEPTH_LEVELS if config.DEPTH_CAPTURE_ENABLED else None
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
 
 def get_clob_price(token_id):
     """
     Fetch order book data for a token.
-    Returns dict with bid, ask, mid, spread, and liquidity depth.
+    Returns dict with bid, ask, mid, spread, and liquidity depth, plus the
+    UTC times the request was sent and its response received.
     """
     try:
-        #t_start = time.time()
-        response = requests.get(CLOB_API_URL, params={"token_id": token_id}, timeout=10)
+        sent_at = _utc_now()
+        response = http_client.get(CLOB_API_URL, params={"token_id": token_id})
+        received_at = _utc_now()
         response.raise_for_status()
-        data = response.json()
-        
-        # data structure: {'bids': [{'price': '0.38', 'size': '...'}, ...], 'asks': ...}
-        bids = data.get('bids', [])
-        asks = data.get('asks', [])
-        
-        best_bid = 0.0
-        best_ask = 0.0
-        bid_liquidity = 0.0
-        ask_liquidity = 0.0
-        
-        if bids:
-            # Bids: We want the HIGHEST price someone is willing to pay
-            best_bid = max(float(b['price']) for b in bids)
-            # Calculate total liquidity (sum of top 5 levels)
-            bid_liquidity = sum(float(b['size']) for b in sorted(bids, key=lambda x: float(x['price']), reverse=True)[:5])
-            
-        if asks:
-            # Asks: We want the LOWEST price someone is willing to sell for
-            best_ask = min(float(a['price']) for a in asks)
-            # Calculate total liquidity (sum of top 5 levels)
-            ask_liquidity = sum(float(a['size']) for a in sorted(asks, key=lambda x: float(x['price']))[:5])
-        
-        # Calculate mid price and spread
-        mid_price = 0.0
-        spread = 0.0
-        if best_bid > 0 and best_ask > 0:
-            mid_price = (best_bid + best_ask) / 2.0
-            spread = best_ask - best_bid
-            
-        #print(f"    [Time] CLOB {token_id}: {time.time() - t_start:.3f}s")
-        return {
-            'best_bid': best_bid,
-            'best_ask': best_ask,
-            'mid_price': mid_price,
-            'spread': spread,
-            'bid_liquidity': bid_liquidity,
-            'ask_liquidity': ask_liquidity
-        }
+        return {**parse_order_book(response.json(), book_depth()), 'sent_at': sent_at, 'received_at': received_at}
     except Exception as e:
         return None
 
+def get_clob_books(token_ids):
+    """
+    Fetch the order books of several tokens at (nearly) the same instant.
+    Returns {token_id: book dict as from get_clob_price, or None on failure}.
+
+    --- OPTIMIZATION: Concurrent book fetch ---
+    All books come from one CLOB multi-book request (POST /books) when the
+    API accepts it, so every side shares one snapshot. Otherwise the single
+    book requests run in parallel. Either way a tick costs one round trip
+    instead of one per outcome, and the logged Up and Down books are taken
+    at the same time.
+    """
+    global _multi_book_supported
+    if config.CLOB_MULTI_BOOK and _multi_book_supported:
+        try:
+            sent_at = _utc_now()
+            response = http_client.post(CLOB_BOOKS_API_URL, json=[{"token_id": token_id} for token_id in token_ids])
+            received_at = _utc_now()
+            if response.status_code in (400, 404, 405):
+                # The endpoint is not available: use single book requests from now on
+                _multi_book_supported = False
+            else:
+                response.raise_for_status()
+                books = {book.get('asset_id'): book for book in response.json()}
+                if all(token_id in books for token_id in token_ids):
+                    return {token_id: {**parse_order_book(books[token_id], book_depth()), 'sent_at': sent_at, 'received_at': received_at}
+                            for token_id in token_ids}
+        except Exception as e:
+            pass
+    return dict(zip(token_ids, _book_executor.map(get_clob_price, token_ids)))
+
+def get_market_tokens(slug):
+    """
+    Returns (clob_token_ids, outcomes, error) of the market `slug`, from the
+    token cache or, on a miss, the Gamma API.
+    """
+    return market_token_cache.get_or_lookup(slug, lookup_market_tokens)
+
+def lookup_market_tokens(slug):
+    """Queries the Gamma API for the token ids and outcomes of `slug`: (clob_token_ids, outcomes, error)."""
+    # 1. Get Event Details to find Token IDs
+    t_start = time.time()
+    response = http_client.get(POLYMARKET_API_URL, params={"slug": slug})
+    response.raise_for_status()
+    data = response.json()
+    
+    if not data:
+        return None, None, "Event not found"
+
+    event = data[0]
+    markets = event.get("markets", [])
+    if not markets:
+        return None, None, "Markets not found in event"
+        
+    market = markets[0]
+    
+    # Get Token IDs
+    # clobTokenIds is a list of strings
+    clob_token_ids = eval(market.get("clobTokenIds", "[]"))
+    outcomes = eval(market.get("outcomes", "[]"))
+    
+    if len(clob_token_ids) != 2:
+        return None, None, "Unexpected number of tokens"
+        
+    print(f"   [Time] Gamma API {slug}: {time.time() - t_start:.3f}s")
+    return clob_token_ids, outcomes, None
+
 def get_polymarket_data(slug):
     """
     Fetch comprehensive market data including order book depth.
     Returns dict with prices and order book data for each outcome.
     """
-    global _market_cache
     try:
-        clob_token_ids = []
-        outcomes = []
-
-        # Check if we have cached data for this slug
-        if _market_cache["slug"] == slug:
-            clob_token_ids = _market_cache["clob_token_ids"]
-            outcomes = _market_cache["outcomes"]
-        else:
-            # 1. Get Event Details to find Token IDs
-            t_start = time.time()
-            response = requests.get(POLYMARKET_API_URL, params={"slug": slug}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data:
-                return None, "Event not found"
-
-            event = data[0]
-            markets = event.get("markets", [])
-            if not markets:
-                return None, "Markets not found in event"
-                
-            market = markets[0]
-            
-            # Get Token IDs
-            # clobTokenIds is a list of strings
-            clob_token_ids = eval(market.get("clobTokenIds", "[]"))
-            outcomes = eval(market.get("outcomes", "[]"))
-            
-            if len(clob_token_ids) != 2:
-                return None, "Unexpected number of tokens"
-                
-            print(f"   [Time] Gamma API {slug}: {time.time() - t_start:.3f}s")
-            
-            # Update cache
-            _market_cache["slug"] = slug
-            _market_cache["clob_token_ids"] = clob_token_ids
-            _market_cache["outcomes"] = outcomes
+        clob_token_ids, outcomes, err = get_market_tokens(slug)
+        if err:
+            return None, err
             
-        # 2. Fetch Order Book Data for each Token from CLOB
+        # 2. Fetch Order Book Data for all Tokens from CLOB at once
         order_books = {}
+        books = get_clob_books(clob_token_ids)
         
         for outcome, token_id in zip(outcomes, clob_token_ids):
-            book_data = get_clob_price(token_id)
+            book_data = books.get(token_id)
             if book_data is not None:
                 order_books[outcome] = book_data
             else:
@@ -126,7 +243,9 @@ def get_polymarket_data(slug):
                     'mid_price': 0.0,
                     'spread': 0.0,
                     'bid_liquidity': 0.0,
-                    'ask_liquidity': 0.0
+                    'ask_liquidity': 0.0,
+                    'sent_at': None,
+                    'received_at': None
                 }
             
         return order_books, None
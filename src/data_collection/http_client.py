@@ -0,0 +1,221 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import src.config as config
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 2000, 5000, 10000]
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: `rate` tokens per second refill a
+    bucket of `capacity`, and `acquire()` blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket histogram of request latencies (LATENCY_BUCKETS_MS)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, error=False):
+        ms = seconds * 1000
+        with self.lock:
+            self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+            self.errors += bool(error)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the `q` quantile (0-1); the maximum for the open bucket."""
+        with self.lock:
+            counts, max_ms = list(self.counts), self.max_ms
+        total = sum(counts)
+        if total == 0:
+            return None
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= q * total:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else max_ms
+        return max_ms
+
+    def summary(self):
+        count = self.count
+        return {
+            'count': count,
+            'errors': self.errors,
+            'mean_ms': self.total_ms / count if count else None,
+            'p50_ms': self.percentile(0.5),
+            'p90_ms': self.percentile(0.9),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client for the Polymarket APIs.
+
+    --- OPTIMIZATION: Pooled keep-alive sessions ---
+    Every thread keeps one `requests.Session` per host (sessions are not
+    safe to share between threads), so the fetch workers reuse open TCP/TLS
+    connections instead of opening a new one for every request. Each call
+    also takes a token from a shared rate limiter, retries connection
+    errors and RETRY_STATUSES with jittered exponential backoff, and
+    records its latency in a per-endpoint histogram.
+    """
+
+    def __init__(self, max_retries=None, backoff_seconds=None, backoff_max_seconds=None,
+                 rate_limit=None, burst=None, timeout=None):
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = config.HTTP_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.backoff_max_seconds = config.HTTP_BACKOFF_MAX_SECONDS if backoff_max_seconds is None else backoff_max_seconds
+        self.timeout = timeout or config.HTTP_TIMEOUT_SECONDS
+        rate_limit = config.HTTP_RATE_LIMIT_PER_SECOND if rate_limit is None else rate_limit
+        self.rate_limiter = TokenBucket(rate_limit, burst or config.HTTP_RATE_LIMIT_BURST) if rate_limit else None
+        self.histograms = {}
+        self.histograms_lock = threading.Lock()
+        self.local = threading.local()
+
+    def session(self, host):
+        """The calling thread's session for `host`."""
+        sessions = getattr(self.local, 'sessions', None)
+        if sessions is None:
+            sessions = self.local.sessions = {}
+        if host not in sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            sessions[host] = session
+        return sessions[host]
+
+    def histogram(self, endpoint):
+        with self.histograms_lock:
+            if endpoint not in self.histograms:
+                self.histograms[endpoint] = LatencyHistogram()
+            return self.histograms[endpoint]
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max_seconds)
+        # Full jitter keeps workers that failed together from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt))
+
+    def get(self, url, params=None, timeout=None, endpoint=None):
+        """
+        GETs `url` and returns the response, like `requests.get`. The last
+        response is returned once retries run out (callers still call
+        `raise_for_status()`), and the last connection error is raised.
+        """
+        return self.request('GET', url, params=params, timeout=timeout, endpoint=endpoint)
+
+    def post(self, url, json=None, timeout=None, endpoint=None):
+        """POSTs `json` to a read-only endpoint (retried like `get`)."""
+        return self.request('POST', url, json=json, timeout=timeout, endpoint=endpoint)
+
+    def request(self, method, url, params=None, json=None, timeout=None, endpoint=None):
+        parts = urlsplit(url)
+        histogram = self.histogram(endpoint or f"{parts.netloc}{parts.path}")
+        session = self.session(parts.netloc)
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start_time = time.perf_counter()
+            try:
+                response = session.request(method, url, params=params, json=json, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                histogram.record(time.perf_counter() - start_time, error=True)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            retry = response.status_code in RETRY_STATUSES
+            histogram.record(time.perf_counter() - start_time, error=response.status_code >= 400)
+            if not retry or attempt == self.max_retries:
+                return response
+            time.sleep(self._backoff(attempt, response))
+
+    def latency_report(self):
+        """{endpoint: histogram summary} for every endpoint called so far."""
+        with self.histograms_lock:
+            histograms = dict(self.histograms)
+        return {endpoint: histogram.summary() for endpoint, histogram in sorted(histograms.items())}
+
+    def close(self):
+        """Closes the calling thread's sessions."""
+        for session in getattr(self.local, 'sessions', {}).values():
+            session.close()
+        self.local.sessions = {}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide HttpClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get(url, params=None, timeout=None, endpoint=None):
+    """GETs `url` through the shared client (see HttpClient.get)."""
+    return get_client().get(url, params=params, timeout=timeout, endpoint=endpoint)
+
+
+def post(url, json=None, timeout=None, endpoint=None):
+    """POSTs through the shared client (see HttpClient.post)."""
+    return get_client().post(url, json=json, timeout=timeout, endpoint=endpoint)
+
+
+def format_latency_report(report=None):
+    report = get_client().latency_report() if report is None else report
+    lines = []
+    for endpoint, stats in report.items():
+        if not stats['count']:
+            continue
+        lines.append(f"  {endpoint}: n={stats['count']} errors={stats['errors']} mean={stats['mean_ms']:.1f}ms "
+                     f"p50<={stats['p50_ms']:.0f}ms p90<={stats['p90_ms']:.0f}ms p99<={stats['p99_ms']:.0f}ms "
+                     f"max={stats['max_ms']:.1f}ms")
+    return "\n".join(lines)
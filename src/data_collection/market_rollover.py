@@ -0,0 +1,70 @@
+import datetime
+import threading
+import src.config as config
+from .fetch_current_polymarket import get_market_tokens, market_token_cache
+from .find_new_market import generate_15m_slug
+
+MARKET_MINUTES = 15
+
+
+def upcoming_market_slugs(count, now=None):
+    """
+    Slugs of the `count` markets after the one running at `now` (UTC, default
+    the current time), soonest first. Like get_current_market_urls, slugs
+    use each market's start time.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    current_start = now.replace(minute=now.minute - now.minute % MARKET_MINUTES, second=0, microsecond=0)
+    return [generate_15m_slug(current_start + datetime.timedelta(minutes=MARKET_MINUTES * i)) for i in range(1, count + 1)]
+
+
+def prewarm_markets(count=None, now=None):
+    """
+    Resolves the token ids of the next `count` markets
+    (config.ROLLOVER_PREWARM_MARKETS) into the shared token cache. Markets the
+    Gamma API does not list yet are retried on the next call. Returns the
+    slugs that are cached.
+    """
+    warm = []
+    for slug in upcoming_market_slugs(count or config.ROLLOVER_PREWARM_MARKETS, now):
+        if market_token_cache.get(slug) is None:
+            try:
+                _, _, err = get_market_tokens(slug)
+            except Exception as e:
+                err = str(e)
+            if err:
+                print(f"Rollover: could not pre-warm {slug}: {err}")
+                continue
+            print(f"Rollover: pre-warmed {slug}")
+        warm.append(slug)
+    return warm
+
+
+class RolloverScheduler(threading.Thread):
+    """
+    Background thread that keeps the next markets' token ids cached.
+
+    --- OPTIMIZATION: Pre-warmed rollover ---
+    Without it, the first fetch of each new market blocks on a Gamma API
+    lookup (and concurrent workers raced to repeat it), delaying the first
+    ticks of the market, usually its most volatile ones. The scheduler
+    resolves upcoming markets every config.ROLLOVER_REFRESH_SECONDS, so at
+    each boundary the new market's tokens are already cached.
+    """
+
+    def __init__(self, count=None, interval=None):
+        super().__init__(name="market-rollover", daemon=True)
+        self.count = count or config.ROLLOVER_PREWARM_MARKETS
+        self.interval = interval or config.ROLLOVER_REFRESH_SECONDS
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                prewarm_markets(self.count)
+            except Exception as e:
+                print(f"Rollover scheduler error: {e}")
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
@@ -10,8 +10,10 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.data_collection import http_client
 from src.data_collection.find_new_market import generate_15m_slug
-from src.config import DATA_DIR, BASE_DATA_FILENAME, TRACKED_USER_ADDRESS
+from src.config import DATA_DIR, BASE_DATA_FILENAME, USER_DATA_FILENAME, TRACKED_USER_ADDRESS
+from src.storage.market_store import load_market_data
 
 # --- Polymarket API URLs ---
 GAMMA_API_URL = "https://gamma-api.polymarket.com/markets"
@@ -20,7 +22,7 @@ DATA_API_URL = "https://data-api.polymarket.com/activity"
 def get_market_details(slug: str) -> dict | None:
     """Fetches market details from the Gamma API to get the eventId."""
     try:
-        response = requests.get(GAMMA_API_URL, params={"slug": slug}, timeout=10)
+        response = http_client.get(GAMMA_API_URL, params={"slug": slug})
         response.raise_for_status()
         data = response.json()
         if not data:
@@ -59,7 +61,7 @@ def get_user_activity(event_id: str, user_address: str) -> list:
             "type": "TRADE",
         }
         try:
-            response = requests.get(DATA_API_URL, params=params, timeout=10)
+            response = http_client.get(DATA_API_URL, params=params)
             response.raise_for_status()
             activities = response.json()
             all_activities.extend(activities)
@@ -104,7 +106,7 @@ def get_slugs_for_date(date_str: str) -> dict[str, str]:
     """
     market_data_filename = os.path.join(DATA_DIR, f"{BASE_DATA_FILENAME}_{date_str}.csv")
     try:
-        df = pd.read_csv(market_data_filename)
+        df = load_market_data(market_data_filename, columns=['TargetTime'])
     except FileNotFoundError:
         print(f"Error: Market data file not found at '{market_data_filename}'")
         return {}
@@ -114,10 +116,9 @@ def get_slugs_for_date(date_str: str) -> dict[str, str]:
         return {}
 
     slug_map = {}
-    for ts_str in df['TargetTime'].unique():
-        ts_datetime = pd.to_datetime(ts_str)
+    for ts_datetime in df['TargetTime'].unique():
         slug = generate_15m_slug(ts_datetime.to_pydatetime())
-        slug_map[slug] = ts_str
+        slug_map[slug] = ts_datetime.strftime('%Y-%m-%d %H:%M:%S')
 
     print(f"Found {len(slug_map)} unique markets for {date_str}.")
     return slug_map
@@ -191,7 +192,7 @@ def main():
 
     # Create DataFrame and save to CSV
     output_df = pd.DataFrame(all_trades)
-    output_filename = os.path.join(DATA_DIR, f"user_data_{args.date}.csv")
+    output_filename = os.path.join(DATA_DIR, f"{USER_DATA_FILENAME}_{args.date}.csv")
 
     # Ensure consistent column order
     columns = ["timestamp", "trade_side", "quantity", "price", "TargetTime", "ExpirationTime"]
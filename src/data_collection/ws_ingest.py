@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import datetime
+import heapq
+import json
+import time
+from .fetch_current_polymarket import LIQUIDITY_LEVELS, book_depth, get_market_tokens, summarize_levels
+from .get_current_markets import get_current_market_urls
+
+try:
+    import websockets
+except ImportError:  # websockets is optional: without it only the polling logger runs
+    websockets = None
+
+# CLOB market channel: book snapshots and price-level changes for subscribed token ids
+CLOB_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+# The channel drops connections that stay silent; it answers a text PING with PONG
+KEEPALIVE_SECONDS = 10
+
+
+def require_websockets():
+    if websockets is None:
+        raise ImportError("WebSocket ingestion needs the 'websockets' package (pip install websockets).")
+
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _event_time(event):
+    """The server timestamp of an event (epoch milliseconds, as a string) as a UTC datetime, if present."""
+    try:
+        return datetime.datetime.fromtimestamp(int(event['timestamp']) / 1000, datetime.timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class OrderBook:
+    """One token's order book, as {price: size} per side, kept current from snapshots and changes."""
+
+    def __init__(self):
+        self.bids = {}
+        self.asks = {}
+        self.ready = False  # set by the first snapshot; changes before it are ignored
+
+    def apply_snapshot(self, bids, asks):
+        self.bids = {float(level['price']): float(level['size']) for level in bids}
+        self.asks = {float(level['price']): float(level['size']) for level in asks}
+        self.ready = True
+
+    def apply_change(self, side, price, size):
+        """Sets the size at one price level ('BUY' = bids, 'SELL' = asks); a size of 0 removes it."""
+        if not self.ready:
+            return
+        levels = self.bids if side.upper() == 'BUY' else self.asks
+        price, size = float(price), float(size)
+        if size == 0:
+            levels.pop(price, None)
+        else:
+            levels[price] = size
+
+    def summary(self, depth=None):
+        """Best bid/ask, mid, spread and top-5 liquidity (and top `depth` levels), as parse_order_book returns them."""
+        keep = max(LIQUIDITY_LEVELS, depth or 0)
+        top_bids = heapq.nlargest(keep, self.bids.items())
+        top_asks = heapq.nsmallest(keep, self.asks.items())
+        book = summarize_levels(top_bids, top_asks)
+        if depth:
+            book['bids'] = top_bids[:depth]
+            book['asks'] = top_asks[:depth]
+        return book
+
+
+class MarketBookTracker:
+    """
+    Keeps the books of one market's tokens from its WebSocket messages and
+    calls `emit((timestamp, data))` with a row in the polling logger's
+    format (see fetch_polymarket_data_struct) whenever a logged field of
+    either book changes, once both books have had a snapshot.
+    """
+
+    def __init__(self, market_info, token_ids, outcomes, emit):
+        self.market_info = market_info
+        self.outcomes = dict(zip(token_ids, outcomes))
+        self.books = {token_id: OrderBook() for token_id in token_ids}
+        self.times = {token_id: (None, None) for token_id in token_ids}  # (sent_at, received_at) of the last update
+        self.emit = emit
+        self.last_summaries = None
+        self.rows_emitted = 0
+
+    def _changed(self, asset_id, event, received_at):
+        self.times[asset_id] = (_event_time(event), received_at)
+
+    def handle_message(self, payload, received_at):
+        """Applies one decoded message (an event or a list of events) and emits a row if the logged books changed."""
+        for event in payload if isinstance(payload, list) else [payload]:
+            event_type = event.get('event_type')
+            if event_type == 'book' and event.get('asset_id') in self.books:
+                self.books[event['asset_id']].apply_snapshot(event.get('bids', []), event.get('asks', []))
+                self._changed(event['asset_id'], event, received_at)
+            elif event_type == 'price_change':
+                # Newer messages list changes for several assets; older ones hold one asset's 'changes'
+                changes = event.get('price_changes') or [dict(change, asset_id=event.get('asset_id'))
+                                                         for change in event.get('changes', [])]
+                for change in changes:
+                    if change.get('asset_id') in self.books:
+                        self.books[change['asset_id']].apply_change(change['side'], change['price'], change['size'])
+                        self._changed(change['asset_id'], event, received_at)
+        if not all(book.ready for book in self.books.values()):
+            return False
+
+        summaries = {token_id: book.summary(book_depth()) for token_id, book in self.books.items()}
+        if summaries == self.last_summaries:
+            return False
+        self.last_summaries = summaries
+        order_books = {}
+        for token_id, summary in summaries.items():
+            sent_at, book_received_at = self.times[token_id]
+            order_books[self.outcomes[token_id]] = {**summary, 'sent_at': sent_at, 'received_at': book_received_at}
+        self.emit((received_at, {
+            "order_books": order_books,
+            "slug": self.market_info.get("slug"),
+            "target_time_utc": self.market_info.get("target_time_utc"),
+            "expiration_time_utc": self.market_info.get("expiration_time_utc"),
+        }))
+        self.rows_emitted += 1
+        return True
+
+
+async def _keepalive(connection):
+    while True:
+        await asyncio.sleep(KEEPALIVE_SECONDS)
+        await connection.send("PING")
+
+
+async def stream_market(url, market_info, token_ids, outcomes, emit, until=None, record=None):
+    """
+    Subscribes to the market channel at `url` for `token_ids` and feeds every
+    message to a MarketBookTracker until `until` (a UTC datetime) or until
+    the server closes the connection. `record(received_at, raw)`, if given,
+    sees every raw message (see ws_replay.py). Returns the number of rows emitted.
+    """
+    require_websockets()
+    tracker = MarketBookTracker(market_info, token_ids, outcomes, emit)
+    async with websockets.connect(url) as connection:
+        await connection.send(json.dumps({"assets_ids": list(token_ids), "type": "market"}))
+        keepalive = asyncio.create_task(_keepalive(connection))
+        try:
+            while True:
+                timeout = None if until is None else (until - _utc_now()).total_seconds()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    raw = await asyncio.wait_for(connection.recv(), timeout)
+                except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                    break
+                if raw == "PONG":
+                    continue
+                received_at = _utc_now()
+                if record is not None:
+                    record(received_at, raw)
+                tracker.handle_message(json.loads(raw), received_at)
+        finally:
+            keepalive.cancel()
+    return tracker.rows_emitted
+
+
+def run_ingest(emit, url=None, record=None):
+    """
+    Streams the current market's books into `emit` forever, moving to the
+    next market at each expiration and reconnecting after errors.
+
+    --- OPTIMIZATION: Push instead of poll ---
+    One subscription delivers every book change as it happens, so no change
+    between polls is missed and no request round trips are spent on books
+    that did not move. Rows are only emitted when a logged field changes.
+    """
+    require_websockets()
+    url = url or CLOB_WS_URL
+    retry_seconds = 1
+    while True:
+        slug = None
+        try:
+            # Market lookups are retried like the stream itself, so a failed request never ends ingestion
+            market_info = get_current_market_urls()
+            slug = market_info["polymarket"].split("/")[-1]
+            token_ids, outcomes, err = get_market_tokens(slug)
+            if err:
+                raise RuntimeError(err)
+            print(f"Streaming books for {slug} until {market_info['expiration_time_utc']:%H:%M:%S} UTC")
+            rows = asyncio.run(stream_market(url, {**market_info, "slug": slug}, token_ids, outcomes, emit,
+                                             until=market_info["expiration_time_utc"], record=record))
+            print(f"Market {slug} done: {rows} rows")
+            retry_seconds = 1
+        except Exception as e:
+            print(f"WebSocket ingestion error for {slug or 'the current market'}: {e}. Retrying in {retry_seconds}s")
+            time.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, 30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print (and optionally record) live book rows from the CLOB market channel.")
+    parser.add_argument("--url", default=None, help="WebSocket URL. Defaults to the Polymarket market channel.")
+    parser.add_argument("--record", default=None, help="Append every raw message to this JSONL file (replayable with ws_replay).")
+    args = parser.parse_args()
+
+    def show(item):
+        timestamp, data = item
+        books = data['order_books']
+        print(f"[{timestamp:%H:%M:%S.%f}] " + " ".join(
+            f"{outcome}({book['best_bid']:.3f}/{book['best_ask']:.3f})" for outcome, book in books.items()))
+
+    record = None
+    if args.record:
+        record_file = open(args.record, 'a')
+        start_time = time.monotonic()
+
+        def record(received_at, raw):
+            record_file.write(json.dumps({"t": round(time.monotonic() - start_time, 3), "message": raw}) + "\n")
+            record_file.flush()
+
+    try:
+        run_ingest(show, url=args.url, record=record)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
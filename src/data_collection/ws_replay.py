@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import threading
+from .ws_ingest import require_websockets, websockets
+
+
+def load_recording(path):
+    """
+    Reads recorded market channel messages as [(seconds since start, raw message)].
+    Lines are either {"t": seconds, "message": raw} as ws_ingest --record
+    writes them, or a bare message (sent without delay).
+    """
+    messages = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict) and 'message' in entry:
+                messages.append((float(entry.get('t', 0)), entry['message']))
+            else:
+                messages.append((0.0, line))
+    return messages
+
+
+class ReplayServer:
+    """
+    Local stand-in for the CLOB market channel: every client that connects
+    and subscribes is sent the recorded `messages` ([(t, raw)], see
+    load_recording), then the connection is closed. `speed` scales the
+    recorded delays (2.0 = twice as fast); None sends everything at once.
+    Text PINGs are answered with PONG, like the real channel.
+
+    The server runs on its own event loop thread, so tests use it as a
+    context manager and point ws_ingest.stream_market at `url`.
+    """
+
+    def __init__(self, messages, host="127.0.0.1", port=0, speed=None):
+        require_websockets()
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.subscriptions = []
+        self._ready = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._stop = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def _answer_pings(self, connection):
+        async for raw in connection:
+            if raw == "PING":
+                await connection.send("PONG")
+
+    async def _handler(self, connection):
+        self.subscriptions.append(json.loads(await connection.recv()))
+        pings = asyncio.create_task(self._answer_pings(connection))
+        previous = 0.0
+        try:
+            for t, raw in self.messages:
+                if self.speed:
+                    await asyncio.sleep(max(t - previous, 0) / self.speed)
+                previous = t
+                await connection.send(raw)
+        finally:
+            pings.cancel()
+        await connection.close()
+
+    async def _serve(self):
+        self._stop = asyncio.get_running_loop().create_future()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._stop.set_result, None)
+            self._thread.join()
+            self._loop.close()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded market channel messages on a local WebSocket.")
+    parser.add_argument("recording", help="JSONL file of recorded messages (see ws_ingest --record).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed; 0 sends without delays.")
+    args = parser.parse_args()
+
+    server = ReplayServer(load_recording(args.recording), port=args.port, speed=args.speed or None).start()
+    print(f"Replaying {len(server.messages)} messages on {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
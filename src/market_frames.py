@@ -0,0 +1,172 @@
+"""
+Frame-level building blocks shared by src/analysis, src/storage and
+src/data_collection: the market key columns, the compact dtype helpers,
+the MarketId registry and the resolution rule. This module imports only
+config, NumPy and pandas, so both packages can use it without depending on
+each other.
+"""
+import numpy as np
+import pandas as pd
+import src.config as config
+
+# Every market is keyed by its (TargetTime, Expiration) pair
+MARKET_COLUMNS = ['TargetTime', 'Expiration']
+BOOK_COLUMNS = [col for col in config.MARKET_DATA_COLUMNS if col not in ['Timestamp'] + MARKET_COLUMNS]
+# The logger rounds every book field to 3 decimals
+BOOK_DECIMALS = 3
+
+
+def timestamps_to_ns(values):
+    """Converts a datetime column (tz-aware or naive) to int64 epoch nanoseconds."""
+    return pd.DatetimeIndex(values).as_unit('ns').asi8
+
+
+# --- Compact dtypes (see src/storage/compact.py for the load profiles) ---
+
+def is_compact(df):
+    """True if `df` holds float32 book fields, i.e. was loaded with the compact profile."""
+    return any(df[col].dtype == np.float32 for col in BOOK_COLUMNS if col in df.columns)
+
+
+def compact_frame(df):
+    """
+    Narrows a market DataFrame in place (and returns it) to the compact profile:
+
+    - float64 columns (book fields and features) become float32. Book fields
+      are logged with 3 decimals, so `float64_values` restores them exactly.
+    - object columns holding only booleans become real bool columns.
+    - int64 features take the smallest integer type that fits.
+    - the market key columns become Categoricals of their few distinct values.
+
+    The Timestamp column stays datetime64, since it is unique per row.
+    """
+    for col in list(df.columns):
+        series = df[col]
+        if col in MARKET_COLUMNS:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[col] = series.astype('category')
+        elif series.dtype == object:
+            if len(series) and series.map(type).isin([bool, np.bool_]).all():
+                df[col] = series.astype(bool)
+        elif series.dtype == np.int64:
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif series.dtype == np.float64:
+            df[col] = series.astype(np.float32)
+    return df
+
+
+def widen_frame(df):
+    """
+    Returns `df` with compact columns widened back to the default profile:
+    float64 book fields rounded to the logger's precision and datetime
+    market keys. Unchanged columns are shared, not copied.
+    """
+    widened = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == np.float32:
+            widened[col] = float64_values(series)
+        elif isinstance(series.dtype, pd.CategoricalDtype) and col in MARKET_COLUMNS:
+            widened[col] = series.astype(series.dtype.categories.dtype)
+    return df.assign(**widened) if widened else df
+
+
+def float64_values(series):
+    """
+    Returns the values of a numeric column as a float64 array. A float32
+    book column is rounded back to the logger's 3 decimals, which restores
+    every price exactly; other float32 columns are only widened.
+    """
+    values = series.to_numpy(dtype=np.float64)
+    if series.dtype == np.float32 and series.name in BOOK_COLUMNS:
+        values = np.round(values, BOOK_DECIMALS)
+    return values
+
+
+# --- Market ids ---
+
+MARKET_ID_COLUMN = 'MarketId'
+
+
+def market_key(data_point):
+    """
+    Returns the key strategies use for a row's market: the interned integer
+    `MarketId` when the data carries one, else the (TargetTime, Expiration)
+    tuple. Works on RowViews, pandas rows and plain dicts.
+    """
+    market_id = data_point.get(MARKET_ID_COLUMN)
+    if market_id is None:
+        return (data_point['TargetTime'], data_point['Expiration'])
+    return market_id
+
+
+class MarketRegistry:
+    """
+    Interns (TargetTime, Expiration) market identities as dense integers.
+
+    Ids are handed out in order of first appearance and never reused, so the
+    same registry can label several frames (or streamed chunks) consistently.
+    `market_ids[i]` converts an id back to its timestamp tuple for reports.
+    """
+
+    def __init__(self):
+        self.market_ids = []  # id -> (TargetTime, Expiration)
+        self._ids = {}  # (TargetTime ns, Expiration ns) -> id
+
+    def __len__(self):
+        return len(self.market_ids)
+
+    def __getitem__(self, market_id):
+        return self.market_ids[market_id]
+
+    def intern(self, target_time, expiration):
+        key = (target_time.value, expiration.value)
+        market_id = self._ids.get(key)
+        if market_id is None:
+            market_id = len(self.market_ids)
+            self._ids[key] = market_id
+            self.market_ids.append((target_time, expiration))
+        return market_id
+
+    def to_id(self, market):
+        """Returns the id for `market`, which may already be an id or a (TargetTime, Expiration) tuple."""
+        if isinstance(market, tuple):
+            return self.intern(*market)
+        return int(market)
+
+    def assign(self, df):
+        """
+        Returns the MarketId of every row of `df` as an int32 array, interning
+        new markets. Only one pass per distinct market runs in Python.
+        """
+        if len(df) == 0:
+            return np.empty(0, dtype=np.int32)
+        pairs = pd.MultiIndex.from_arrays([timestamps_to_ns(df['TargetTime']), timestamps_to_ns(df['Expiration'])])
+        codes, uniques = pd.factorize(pairs)
+        target_times = pd.to_datetime(uniques.get_level_values(0), utc=True)
+        expirations = pd.to_datetime(uniques.get_level_values(1), utc=True)
+        lookup = np.array([
+            self.intern(target_time, expiration) for target_time, expiration in zip(target_times, expirations)
+        ], dtype=np.int32)
+        return lookup[codes]
+
+    def add_column(self, df):
+        """Adds (or overwrites) the MarketId column of `df` in place and returns it."""
+        df[MARKET_ID_COLUMN] = self.assign(df)
+        return df
+
+
+def winning_sides(up_asks, down_asks):
+    """
+    Vectorized resolution rule applied to final ask prices.
+
+    A zero ask means that side's book was emptied because it won; otherwise
+    the side with the higher ask is the likely winner (ties go to 'Up').
+    """
+    up_asks = np.asarray(up_asks, dtype=float)
+    down_asks = np.asarray(down_asks, dtype=float)
+    return np.select(
+        [up_asks == 0, down_asks == 0, down_asks > up_asks],
+        ['Up', 'Down', 'Down'],
+        default='Up'
+    ).astype(object)
@@ -0,0 +1,225 @@
+import gzip
+import json
+import lzma
+import os
+import struct
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.market_frames import BOOK_DECIMALS, MARKET_COLUMNS
+
+# --- Block-compressed archive layout ---
+# magic | block 0 | block 1 | ... | footer (JSON) | footer length (uint64) | magic
+# Each block holds ARCHIVE_BLOCK_ROWS consecutive rows, every column compressed
+# on its own so a read only decompresses the columns it asks for. The footer
+# lists the columns and, per block, its byte offset, row range, first/last
+# Timestamp and the markets it holds (as epoch nanoseconds), so queries pick
+# blocks without touching the others.
+#
+# Columns are stored as little-endian int64 or float64 arrays:
+# - 'time'  datetimes as integers in their unit, delta encoded
+# - 'milli' book fields logged with BOOK_DECIMALS decimals, as delta-encoded
+#           integers in thousandths (exact: they decode to the same floats)
+# - 'float' any other float column, raw
+ARCHIVE_MAGIC = b'PMARCH1\0'
+ARCHIVE_VERSION = 1
+_FOOTER_LENGTH = struct.Struct('<Q')
+_SCALE = 10 ** BOOK_DECIMALS
+_CODECS = {
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    'gzip': (lambda data: gzip.compress(data, compresslevel=9, mtime=0), gzip.decompress),
+}
+
+
+def _column_kind(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'time'
+    values = series.to_numpy(dtype=np.float64)
+    if np.isfinite(values).all() and np.all(np.round(values * _SCALE) / _SCALE == values):
+        return 'milli'
+    return 'float'
+
+
+def _integers(series):
+    """int64 values of a UTC datetime column in its own unit (NaT as the int64 minimum)."""
+    return series.dt.tz_localize(None).to_numpy().view(np.int64)
+
+
+def _encode(series, kind):
+    if kind == 'float':
+        return series.to_numpy(dtype='<f8').tobytes()
+    values = _integers(series) if kind == 'time' else np.round(series.to_numpy(dtype=np.float64) * _SCALE).astype(np.int64)
+    # Deltas of slowly changing columns are mostly 0 or tiny, which compresses far better
+    return np.diff(values, prepend=np.int64(0)).astype('<i8').tobytes()
+
+
+def _decode(data, kind, dtype):
+    if kind == 'float':
+        return np.frombuffer(data, dtype='<f8').astype(np.float64)
+    values = np.cumsum(np.frombuffer(data, dtype='<i8'))
+    if kind == 'milli':
+        return values / _SCALE
+    unit = pd.api.types.pandas_dtype(dtype).unit
+    return pd.DatetimeIndex(values.view(f'datetime64[{unit}]')).tz_localize('UTC')
+
+
+def _market_pairs(df):
+    if 'TargetTime' not in df.columns or 'Expiration' not in df.columns:
+        return []
+    pairs = df[MARKET_COLUMNS].drop_duplicates()
+    return [[int(t.value), int(e.value)] for t, e in pairs.itertuples(index=False, name=None)]
+
+
+def write_archive(df, path, block_rows=None, compression=None):
+    """
+    Writes a parsed market DataFrame (see market_store.load_market_data) as a
+    block-compressed archive and returns `path`. The file is written next to
+    `path` and renamed into place.
+    """
+    block_rows = block_rows or config.ARCHIVE_BLOCK_ROWS
+    compression = compression or config.ARCHIVE_COMPRESSION
+    if compression not in _CODECS:
+        raise ValueError(f"Unknown archive compression '{compression}'. Expected one of: {', '.join(_CODECS)}")
+    compress = _CODECS[compression][0]
+    columns = [{'name': col, 'kind': _column_kind(df[col]), 'dtype': str(df[col].dtype)} for col in df.columns]
+
+    blocks = []
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(ARCHIVE_MAGIC)
+        for row_start in range(0, len(df), block_rows):
+            block = df.iloc[row_start:row_start + block_rows]
+            payloads = [compress(_encode(block[column['name']], column['kind'])) for column in columns]
+            timestamps = pd.DatetimeIndex(block['Timestamp'].dropna()).as_unit('ns').asi8 if 'Timestamp' in block.columns else []
+            blocks.append({
+                'offset': f.tell(),
+                'row_start': row_start,
+                'rows': len(block),
+                'sizes': [len(payload) for payload in payloads],
+                'first': int(timestamps.min()) if len(timestamps) else None,
+                'last': int(timestamps.max()) if len(timestamps) else None,
+                'markets': _market_pairs(block),
+            })
+            for payload in payloads:
+                f.write(payload)
+        footer = json.dumps({
+            'version': ARCHIVE_VERSION, 'compression': compression, 'rows': len(df),
+            'columns': columns, 'blocks': blocks,
+        }).encode()
+        f.write(footer)
+        f.write(_FOOTER_LENGTH.pack(len(footer)))
+        f.write(ARCHIVE_MAGIC)
+    os.replace(temp_file, path)
+    return path
+
+
+class ArchiveFile:
+    """
+    Read-only view of a block-compressed archive.
+
+    Opening one reads only its footer. `iter_chunks()` decompresses just the
+    blocks (and columns) a time-window or market query touches, and
+    `to_frame()` just the blocks covering a row range, so reading part of a
+    day of archived ticks costs a fraction of the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic = f.read(len(ARCHIVE_MAGIC))
+            f.seek(-(_FOOTER_LENGTH.size + len(ARCHIVE_MAGIC)), os.SEEK_END)
+            footer_length, = _FOOTER_LENGTH.unpack(f.read(_FOOTER_LENGTH.size))
+            end_magic = f.read(len(ARCHIVE_MAGIC))
+            f.seek(-(footer_length + _FOOTER_LENGTH.size + len(ARCHIVE_MAGIC)), os.SEEK_END)
+            footer = json.loads(f.read(footer_length))
+        if magic != ARCHIVE_MAGIC or end_magic != ARCHIVE_MAGIC or footer['version'] != ARCHIVE_VERSION:
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} market data archive.")
+        self.decompress = _CODECS[footer['compression']][1]
+        self.column_specs = footer['columns']
+        self.blocks = footer['blocks']
+        self.n_rows = footer['rows']
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def columns(self):
+        return [column['name'] for column in self.column_specs]
+
+    def _projection(self, columns):
+        if columns is None:
+            return list(range(len(self.column_specs)))
+        positions = {name: i for i, name in enumerate(self.columns)}
+        return [positions[col] for col in columns if col in positions]
+
+    def read_block(self, index, columns=None):
+        """Decompresses block `index` (only `columns`, skipping unknown names) into a DataFrame."""
+        block = self.blocks[index]
+        projection = self._projection(columns)
+        starts = np.cumsum([block['offset']] + block['sizes'])
+        data = {}
+        with open(self.path, 'rb') as f:
+            for position in projection:
+                spec = self.column_specs[position]
+                f.seek(starts[position])
+                data[spec['name']] = _decode(self.decompress(f.read(block['sizes'][position])), spec['kind'], spec['dtype'])
+        names = [self.column_specs[position]['name'] for position in projection]
+        return pd.DataFrame(data, columns=names, index=pd.RangeIndex(block['row_start'], block['row_start'] + block['rows']))
+
+    def blocks_for(self, start=None, end=None, markets=None):
+        """Indices of the blocks holding ticks in [start, end) of any of `markets` ((TargetTime, Expiration) pairs)."""
+        start_ns = None if start is None else pd.Timestamp(start).value
+        end_ns = None if end is None else pd.Timestamp(end).value
+        wanted = None if markets is None else {(pd.Timestamp(t).value, pd.Timestamp(e).value) for t, e in markets}
+        selected = []
+        for index, block in enumerate(self.blocks):
+            if start_ns is not None and (block['last'] is None or block['last'] < start_ns):
+                continue
+            if end_ns is not None and (block['first'] is None or block['first'] >= end_ns):
+                continue
+            if wanted is not None and not wanted.intersection(map(tuple, block['markets'])):
+                continue
+            selected.append(index)
+        return selected
+
+    def iter_chunks(self, columns=None, start=None, end=None, markets=None):
+        """
+        Yields the rows with Timestamps in [start, end) of `markets` (all
+        rows by default), one DataFrame per block touched, in file order.
+        """
+        read_columns = columns
+        if columns is not None and (start is not None or end is not None or markets is not None):
+            read_columns = list(dict.fromkeys(list(columns) + ['Timestamp', 'TargetTime', 'Expiration']))
+        for index in self.blocks_for(start, end, markets):
+            df = self.read_block(index, read_columns)
+            keep = np.ones(len(df), dtype=bool)
+            if start is not None:
+                keep &= (df['Timestamp'] >= pd.Timestamp(start)).to_numpy()
+            if end is not None:
+                keep &= (df['Timestamp'] < pd.Timestamp(end)).to_numpy()
+            if markets is not None:
+                keep &= pd.MultiIndex.from_frame(df[MARKET_COLUMNS]).isin(list(markets))
+            if not keep.all():
+                df = df[keep]
+            if columns is not None:
+                df = df[[col for col in columns if col in df.columns]]
+            if len(df):
+                yield df.reset_index(drop=True)
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        """Returns rows [start, stop) as a DataFrame, decompressing only the blocks that hold them."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        frames = [
+            self.read_block(index, columns)
+            for index, block in enumerate(self.blocks)
+            if block['row_start'] < stop and block['row_start'] + block['rows'] > start
+        ]
+        if not frames:
+            names = [self.column_specs[position]['name'] for position in self._projection(columns)]
+            return pd.DataFrame({name: pd.Series(dtype=self._empty_dtype(name)) for name in names}, columns=names)
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        return df.loc[start:stop - 1].reset_index(drop=True)
+
+    def _empty_dtype(self, name):
+        spec = next(column for column in self.column_specs if column['name'] == name)
+        return spec['dtype'] if spec['kind'] == 'time' else 'float64'
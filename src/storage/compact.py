@@ -0,0 +1,52 @@
+import pandas as pd
+from src.market_frames import compact_frame
+
+# --- Load profiles ---
+# 'default' keeps the loader's float64 / datetime64 frame. 'compact' narrows it
+# (see compact_frame) so that weeks of ticks plus features fit in memory.
+LOAD_PROFILES = ('default', 'compact')
+
+# The data logger writes every datetime as 'YYYY-MM-DD HH:MM:SS' (UTC)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def parse_timestamps(values):
+    """
+    Parses a column of logger datetime strings into UTC datetimes.
+
+    The format is fixed, so there is no per-value inference, and each
+    distinct string is parsed once: the market key columns hold a few dozen
+    values per day, so they cost almost nothing to parse.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(uniques, utc=True, format=TIMESTAMP_FORMAT)
+    # Missing values (code -1) become NaT
+    return pd.Series(parsed.take(codes, fill_value=pd.NaT), index=values.index, name=values.name)
+
+
+def apply_load_profile(df, profile):
+    """Applies the load profile `profile` ('default' or 'compact') to a freshly loaded frame."""
+    if profile not in LOAD_PROFILES:
+        raise ValueError(f"Unknown load profile '{profile}'. Expected one of: {', '.join(LOAD_PROFILES)}")
+    return compact_frame(df) if profile == 'compact' else df
+
+
+def memory_report(before, after, title="Memory usage"):
+    """
+    Formats a per-column comparison of the memory held by two versions of a
+    frame (e.g. default vs compact), with totals and the reduction factor.
+    """
+    usage = pd.DataFrame({
+        'Before': before.memory_usage(deep=True), 'After': after.memory_usage(deep=True)
+    }).fillna(0)
+    lines = [f"--- {title} ---", f"{'Column':<24}{'Before':>11}{'':<23}{'After':>11}"]
+    for col, row in usage.iterrows():
+        before_type = str(before[col].dtype) if col in before.columns else ''
+        after_type = str(after[col].dtype) if col in after.columns else ''
+        lines.append(f"{str(col):<24}{row['Before'] / 1e6:>8.2f} MB  {before_type:<21}"
+                     f"{row['After'] / 1e6:>8.2f} MB  {after_type}")
+    total_before, total_after = usage['Before'].sum(), usage['After'].sum()
+    lines.append(f"{'Total':<24}{total_before / 1e6:>8.2f} MB  {'':<21}{total_after / 1e6:>8.2f} MB  "
+                 f"({total_before / max(total_after, 1):.1f}x smaller)")
+    return "\n".join(lines)
+
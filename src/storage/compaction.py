@@ -0,0 +1,155 @@
+import argparse
+import datetime
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from .compact import TIMESTAMP_FORMAT
+
+# --- Compacted tick files ---
+# A compacted file has the logger's columns plus LastSeen and Count. Each row
+# stands for a run of Count consecutive rows with an identical market and
+# book: Timestamp is the first time the state was seen, LastSeen the last,
+# and the run's timestamps are evenly spaced between them (a step of 0 for
+# exact duplicates, written in the same second by overlapping fetch workers).
+# Runs are only formed when that spacing is exact, so expanding a compacted
+# file gives back exactly the rows that were logged. Both fields are left
+# empty for a single tick, so rows that are not part of a run cost 2 bytes.
+LAST_SEEN_COLUMN = 'LastSeen'
+COUNT_COLUMN = 'Count'
+RUN_COLUMNS = [LAST_SEEN_COLUMN, COUNT_COLUMN]
+COMPACTED_COLUMNS = config.MARKET_DATA_COLUMNS + RUN_COLUMNS
+
+
+def _as_ns(values):
+    return pd.DatetimeIndex(values).as_unit('ns').asi8
+
+
+def is_compacted(df):
+    return COUNT_COLUMN in df.columns
+
+
+def is_compacted_csv(data_file):
+    """True if the CSV `data_file` was written in the compacted layout (judged by its header)."""
+    with open(data_file, 'r', newline='') as f:
+        header = f.readline().strip().split(',')
+    return COUNT_COLUMN in header
+
+
+def compact_ticks(df):
+    """
+    Run-length encodes a parsed market DataFrame (see market_store) in file
+    order. Consecutive rows with the same market and book fields merge into
+    one row while their timestamps advance by a constant step; the result
+    has the LastSeen and Count columns, and `expand_ticks` reverses it.
+    """
+    if is_compacted(df):
+        return df
+    state_columns = [col for col in df.columns if col != 'Timestamp']
+    timestamps = _as_ns(df['Timestamp'])
+    n = len(df)
+
+    same = np.zeros(n, dtype=bool)
+    if n > 1:
+        current, previous = df[state_columns].iloc[1:].reset_index(drop=True), df[state_columns].iloc[:-1].reset_index(drop=True)
+        same[1:] = ((current == previous) | (current.isna() & previous.isna())).all(axis=1).to_numpy()
+    step = np.zeros(n, dtype=np.int64)
+    step[1:] = np.diff(timestamps)
+    # A row continues the run before it if its state is unchanged, time does
+    # not go backwards and, when the previous row also continued a run, the
+    # step is the same. Every run therefore has one step.
+    continues = same & (step >= 0)
+    continues[1:] &= ~continues[:-1] | (step[1:] == step[:-1])
+    starts = np.flatnonzero(~continues)
+
+    runs = df.iloc[starts].reset_index(drop=True)
+    ends = np.append(starts[1:], n) - 1
+    runs[LAST_SEEN_COLUMN] = df['Timestamp'].iloc[ends].to_numpy()
+    runs[COUNT_COLUMN] = (ends - starts + 1).astype(np.int64)
+    return runs
+
+
+def expand_ticks(df):
+    """Expands a compacted DataFrame back to one row per logged tick."""
+    if not is_compacted(df):
+        return df
+    counts = df[COUNT_COLUMN].fillna(1).to_numpy(dtype=np.int64)
+    rows = np.repeat(np.arange(len(df)), counts)
+    expanded = df.drop(columns=[col for col in RUN_COLUMNS if col in df.columns]).iloc[rows].reset_index(drop=True)
+    if 'Timestamp' in df.columns and LAST_SEEN_COLUMN in df.columns:
+        first = _as_ns(df['Timestamp'])
+        last = _as_ns(df[LAST_SEEN_COLUMN].fillna(df['Timestamp']))
+        steps = np.where(counts > 1, (last - first) // np.maximum(counts - 1, 1), 0)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        offsets = np.arange(len(rows)) - run_starts
+        values = first[rows] + offsets * steps[rows]
+        expanded['Timestamp'] = pd.to_datetime(values, utc=True).as_unit(df['Timestamp'].dt.unit)
+    return expanded
+
+
+def encode_runs(rows):
+    """
+    Run-length encodes logger rows — lists of [timestamp, target time,
+    expiration, *book fields] with whole-second datetimes, in write order —
+    the same way as `compact_ticks`. Returns the rows with LastSeen and Count
+    appended; used by the data logger's compacted mode.
+    """
+    runs = []
+    run_step = None
+    for row in rows:
+        if runs:
+            last_run = runs[-1]
+            step = row[0] - last_run[-2]
+            if row[1:] == last_run[1:-2] and step >= datetime.timedelta(0) and (run_step is None or step == run_step):
+                last_run[-2] = row[0]
+                last_run[-1] += 1
+                run_step = step
+                continue
+        runs.append(list(row) + [row[0], 1])
+        run_step = None
+    for run in runs:
+        if run[-1] == 1:
+            run[-2:] = [None, None]
+    return runs
+
+
+def compact_data_file(data_file):
+    """
+    Rewrites the CSV `data_file` in the compacted layout (atomically) and
+    returns (rows before, rows after). Already compacted files are left alone.
+    """
+    from .market_store import read_market_csv  # market_store reads compacted files through this module
+
+    if is_compacted_csv(data_file):
+        n_rows = len(pd.read_csv(data_file, usecols=[COUNT_COLUMN]))
+        return n_rows, n_rows
+    df = read_market_csv(data_file)
+    runs = compact_ticks(df)
+    for col in ['Timestamp', 'TargetTime', 'Expiration', LAST_SEEN_COLUMN]:
+        runs[col] = runs[col].dt.strftime(TIMESTAMP_FORMAT)
+    single = runs[COUNT_COLUMN] == 1
+    runs[COUNT_COLUMN] = runs[COUNT_COLUMN].astype(object).where(~single, None)
+    runs.loc[single, LAST_SEEN_COLUMN] = None
+    temp_file = f"{data_file}.tmp"
+    runs.to_csv(temp_file, index=False)
+    os.replace(temp_file, data_file)
+    return len(df), len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact finished daily market data files by run-length encoding unchanged ticks.")
+    parser.add_argument("--start", default=None, help="First date (yyyymmdd). Defaults to the earliest file.")
+    parser.add_argument("--end", default=None, help="Last date (yyyymmdd). Defaults to the latest file.")
+    args = parser.parse_args()
+
+    logger_file = config.get_logger_filename()
+    for data_file in config.get_data_files(args.start, args.end):
+        if os.path.abspath(data_file) == os.path.abspath(logger_file):
+            print(f"{data_file}: skipped, the data logger is still writing it")
+            continue
+        before, after = compact_data_file(data_file)
+        print(f"{data_file}: {before} -> {after} rows ({1 - after / max(before, 1):.1%} fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import os
+from bisect import bisect_right
+import pandas as pd
+import src.config as config
+
+# --- Depth capture layout ---
+# magic | levels (varint) | records...
+# Records are appended as the logger captures books, each a type byte and
+# unsigned LEB128 varints (signed values zigzag encoded):
+# - 'S' series:   id, TargetTime ms, Expiration ms, outcome length, outcome (utf-8)
+#                 Declares the book of one outcome of one market.
+# - 'K' keyframe: series id, Timestamp ms, then per side (bids, asks) a level
+#                 count and (price, size) pairs, prices delta coded from the
+#                 first level of the side.
+# - 'D' delta:    series id, Timestamp ms, then per side a change count and
+#                 (price delta from the previous change, size) pairs against
+#                 the series' previous book: size 0 removes the level.
+# Prices are stored in 1/PRICE_SCALE and sizes in 1/SIZE_SCALE units. Only
+# the top `levels` of each side are kept. Every series starts with a
+# keyframe, and repeats one every config.DEPTH_KEYFRAME_INTERVAL books so a
+# reader can rebuild any book from the nearest keyframe.
+DEPTH_MAGIC = b'PMDEPTH1'
+PRICE_SCALE = 10_000
+SIZE_SCALE = 1_000_000
+_SERIES, _KEYFRAME, _DELTA = b'S', b'K', b'D'
+_MS = 1_000_000  # nanoseconds per millisecond
+
+
+def _put_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_signed(out, value):
+    _put_varint(out, (value << 1) ^ (value >> 63))
+
+
+def _get_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _get_signed(data, pos):
+    value, pos = _get_varint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _epoch_ms(value):
+    return pd.Timestamp(value).value // _MS
+
+
+def _to_units(levels):
+    """{price units: size units} of (price, size) levels."""
+    return {round(float(price) * PRICE_SCALE): round(float(size) * SIZE_SCALE) for price, size in levels}
+
+
+def _top(side, book, levels):
+    return dict(sorted(book.items(), reverse=(side == 0))[:levels])
+
+
+class DepthWriter:
+    """
+    Appends the top `levels` price levels of order books to a depth file,
+    as delta records against each book's previous capture.
+
+    --- OPTIMIZATION: Delta-encoded depth ---
+    Consecutive captures of a book usually differ in a few levels, so most
+    records hold only the changed levels as small varints: a 20-level book
+    costs a few bytes per capture instead of hundreds.
+    """
+
+    def __init__(self, path, levels=None, keyframe_interval=None):
+        self.path = path
+        self.keyframe_interval = keyframe_interval or config.DEPTH_KEYFRAME_INTERVAL
+        self.series = {}   # (TargetTime ms, Expiration ms, outcome) -> id
+        self.books = {}    # id -> [bids, asks] as last written ({price units: size units})
+        self.since_keyframe = {}
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # Continue the file's series ids; every series restarts with a keyframe
+            reader = DepthReader(path)
+            self.levels = reader.levels
+            self.series = {key: series_id for series_id, key in enumerate(reader.series)}
+        else:
+            self.levels = levels or config.DEPTH_LEVELS
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            header = bytearray(DEPTH_MAGIC)
+            _put_varint(header, self.levels)
+            with open(path, 'wb') as f:
+                f.write(header)
+
+    def write_books(self, snapshots):
+        """
+        Appends one capture per snapshot in a single write.
+        `snapshots` are (timestamp, target_time, expiration, outcome, bids, asks),
+        with bids/asks as (price, size) levels in any order.
+        """
+        out = bytearray()
+        for timestamp, target_time, expiration, outcome, bids, asks in snapshots:
+            key = (_epoch_ms(target_time), _epoch_ms(expiration), outcome)
+            if key not in self.series:
+                self.series[key] = len(self.series)
+                out += _SERIES
+                for value in (self.series[key], key[0], key[1]):
+                    _put_varint(out, value)
+                name = outcome.encode()
+                _put_varint(out, len(name))
+                out += name
+            series_id = self.series[key]
+            book = [_top(0, _to_units(bids), self.levels), _top(1, _to_units(asks), self.levels)]
+            previous = self.books.get(series_id)
+            keyframe = previous is None or self.since_keyframe[series_id] >= self.keyframe_interval
+            out += _KEYFRAME if keyframe else _DELTA
+            _put_varint(out, series_id)
+            _put_varint(out, _epoch_ms(timestamp))
+            for side in (0, 1):
+                if keyframe:
+                    changes = sorted(book[side].items())
+                else:
+                    old, new = previous[side], book[side]
+                    changes = sorted([(price, size) for price, size in new.items() if old.get(price) != size]
+                                     + [(price, 0) for price in old if price not in new])
+                _put_varint(out, len(changes))
+                last_price = 0
+                for price, size in changes:
+                    _put_signed(out, price - last_price)
+                    _put_varint(out, size)
+                    last_price = price
+            self.books[series_id] = book
+            self.since_keyframe[series_id] = 0 if keyframe else self.since_keyframe[series_id] + 1
+        if out:
+            with open(self.path, 'ab') as f:
+                f.write(out)
+
+
+class DepthReader:
+    """
+    Reads a depth file. Opening one scans the record headers once and
+    indexes every capture by series and time; `book_at()` then rebuilds a
+    book from its nearest keyframe.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        if not self.data.startswith(DEPTH_MAGIC):
+            raise ValueError(f"{path} is not a depth capture file.")
+        self.levels, pos = _get_varint(self.data, len(DEPTH_MAGIC))
+        self.series = []   # id -> (TargetTime ms, Expiration ms, outcome)
+        self.captures = [] # id -> [(Timestamp ms, offset, is keyframe)]
+        while pos < len(self.data):
+            kind = self.data[pos:pos + 1]
+            start, pos = pos, pos + 1
+            if kind == _SERIES:
+                series_id, pos = _get_varint(self.data, pos)
+                target_time, pos = _get_varint(self.data, pos)
+                expiration, pos = _get_varint(self.data, pos)
+                length, pos = _get_varint(self.data, pos)
+                self.series.append((target_time, expiration, self.data[pos:pos + length].decode()))
+                self.captures.append([])
+                pos += length
+            elif kind in (_KEYFRAME, _DELTA):
+                series_id, pos = _get_varint(self.data, pos)
+                timestamp, pos = _get_varint(self.data, pos)
+                for _ in (0, 1):
+                    count, pos = _get_varint(self.data, pos)
+                    for _ in range(2 * count):
+                        _, pos = _get_varint(self.data, pos)
+                self.captures[series_id].append((timestamp, start, kind == _KEYFRAME))
+            else:
+                raise ValueError(f"{path}: unknown record type {kind!r} at byte {start}.")
+
+    def markets(self):
+        """The (TargetTime, Expiration, outcome) of every captured book, as UTC Timestamps."""
+        return [(pd.Timestamp(t * _MS, tz='UTC'), pd.Timestamp(e * _MS, tz='UTC'), outcome) for t, e, outcome in self.series]
+
+    def _series_id(self, target_time, expiration, outcome):
+        key = (_epoch_ms(target_time), _epoch_ms(expiration), outcome)
+        try:
+            return self.series.index(key)
+        except ValueError:
+            raise KeyError(f"No depth captured for {outcome} of {target_time} - {expiration}")
+
+    def _apply(self, offset, book):
+        pos = offset + 1
+        _, pos = _get_varint(self.data, pos)
+        _, pos = _get_varint(self.data, pos)
+        keyframe = self.data[offset:offset + 1] == _KEYFRAME
+        for side in (0, 1):
+            if keyframe:
+                book[side] = {}
+            count, pos = _get_varint(self.data, pos)
+            price = 0
+            for _ in range(count):
+                step, pos = _get_signed(self.data, pos)
+                size, pos = _get_varint(self.data, pos)
+                price += step
+                if size:
+                    book[side][price] = size
+                else:
+                    book[side].pop(price, None)
+
+    @staticmethod
+    def _levels(book):
+        bids = [(price / PRICE_SCALE, size / SIZE_SCALE) for price, size in sorted(book[0].items(), reverse=True)]
+        asks = [(price / PRICE_SCALE, size / SIZE_SCALE) for price, size in sorted(book[1].items())]
+        return bids, asks
+
+    def book_at(self, target_time, expiration, outcome, timestamp):
+        """
+        (capture time, bids, asks) of the last capture of the book at or before
+        `timestamp`, with bids best (highest) first and asks lowest first as
+        (price, size) tuples. Returns None before the first capture.
+        """
+        captures = self.captures[self._series_id(target_time, expiration, outcome)]
+        end = bisect_right(captures, (_epoch_ms(timestamp), float('inf'), True))
+        if end == 0:
+            return None
+        start = end - 1
+        while not captures[start][2]:
+            start -= 1
+        book = [{}, {}]
+        for _, offset, _ in captures[start:end]:
+            self._apply(offset, book)
+        return (pd.Timestamp(captures[end - 1][0] * _MS, tz='UTC'), *self._levels(book))
+
+    def iter_books(self, target_time, expiration, outcome):
+        """Yields (capture time, bids, asks) for every capture of one book, in order."""
+        book = [{}, {}]
+        for timestamp, offset, _ in self.captures[self._series_id(target_time, expiration, outcome)]:
+            self._apply(offset, book)
+            yield (pd.Timestamp(timestamp * _MS, tz='UTC'), *self._levels(book))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a depth capture file, or print one book at a time.")
+    parser.add_argument("path", help="Depth file (data/depth/market_data_YYYYMMDD.depth).")
+    parser.add_argument("--at", default=None, help="Print every captured book as of this UTC timestamp.")
+    args = parser.parse_args()
+
+    reader = DepthReader(args.path)
+    print(f"{args.path}: {os.path.getsize(args.path) / 1e6:.2f} MB, top {reader.levels} levels")
+    for (target_time, expiration, outcome), captures in zip(reader.markets(), reader.captures):
+        line = f"  {target_time:%Y-%m-%d %H:%M} - {expiration:%H:%M} {outcome}: {len(captures)} captures"
+        if args.at:
+            book = reader.book_at(target_time, expiration, outcome, pd.Timestamp(args.at, tz='UTC'))
+            if book is not None:
+                _, bids, asks = book
+                line += f", bids {bids[:3]} asks {asks[:3]}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.market_frames import MARKET_COLUMNS
+from .compact import apply_load_profile
+from .compaction import is_compacted_csv
+from .market_store import data_file_mtime, load_market_data, load_market_rows
+
+INDEX_COLUMNS = ['DataFile'] + MARKET_COLUMNS + [
+    'FirstTimestamp', 'LastTimestamp', 'Rows', 'RowStart', 'RowStop', 'ByteStart', 'ByteStop'
+]
+_DATETIME_COLUMNS = MARKET_COLUMNS + ['FirstTimestamp', 'LastTimestamp']
+
+
+def _csv_row_offsets(data_file, n_rows):
+    """
+    Returns the byte offset at which each data row of a CSV starts, plus the
+    end of the last row, or None if the file does not have `n_rows` rows.
+    """
+    with open(data_file, 'rb') as f:
+        data = f.read()
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+    line_starts = np.append(0, newlines + 1)
+    if len(data) and data[-1:] != b'\n':
+        line_starts = np.append(line_starts, len(data))
+    row_offsets = line_starts[1:]  # skip the header line
+    if len(row_offsets) < n_rows + 1:
+        return None
+    return row_offsets[:n_rows + 1]
+
+
+def build_file_index(data_file):
+    """
+    Returns one index entry per market in `data_file`: its first/last tick,
+    row count, the [RowStart, RowStop) range of rows holding it and, for a
+    CSV, the byte range of those rows (-1 when unknown, or for a compacted
+    CSV, whose lines are runs of rows).
+    """
+    df = load_market_data(data_file, columns=['Timestamp'] + MARKET_COLUMNS)
+    df['Row'] = np.arange(len(df))
+    entries = df.groupby(MARKET_COLUMNS, sort=False).agg(
+        FirstTimestamp=('Timestamp', 'min'),
+        LastTimestamp=('Timestamp', 'max'),
+        Rows=('Row', 'size'),
+        RowStart=('Row', 'min'),
+        RowStop=('Row', 'max'),
+    ).reset_index()
+    entries['RowStop'] += 1
+
+    offsets = None
+    if data_file.endswith('.csv') and os.path.exists(data_file) and not is_compacted_csv(data_file):
+        offsets = _csv_row_offsets(data_file, len(df))
+    if offsets is None:
+        entries['ByteStart'] = -1
+        entries['ByteStop'] = -1
+    else:
+        entries['ByteStart'] = offsets[entries['RowStart'].to_numpy()]
+        entries['ByteStop'] = offsets[entries['RowStop'].to_numpy()]
+    entries.insert(0, 'DataFile', data_file)
+    return entries[INDEX_COLUMNS]
+
+
+def load_file_index(data_file):
+    """
+    Returns the index entries of `data_file`, using the cached sidecar file
+    when it is newer than the data. Otherwise the index is rebuilt and cached.
+    """
+    cache_file = config.get_sidecar_filename(data_file, 'index')
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= data_file_mtime(data_file):
+        entries = pd.read_csv(cache_file)
+        for col in _DATETIME_COLUMNS:
+            entries[col] = pd.to_datetime(entries[col], utc=True)
+        entries['DataFile'] = data_file
+        return entries
+
+    entries = build_file_index(data_file)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        entries.to_csv(cache_file, index=False)
+    except OSError as e:
+        print(f"Warning: could not write market index {cache_file}: {e}")
+    return entries
+
+
+def _is_date(value):
+    return isinstance(value, (int, np.integer, str))
+
+
+def _file_date(data_file):
+    """market_data_20251226.csv -> 20251226"""
+    return int(os.path.splitext(os.path.basename(data_file))[0].rsplit('_', 1)[-1])
+
+
+class MarketIndex:
+    """
+    Index of which file, rows and bytes hold every market of a set of daily
+    data files.
+
+    `markets()` answers date-range and single-market queries from the index
+    alone; `load()` then reads only the row ranges of the selected markets,
+    so finding one market no longer means parsing a whole day.
+    """
+
+    def __init__(self, data_files):
+        self.data_files = list(data_files)
+        frames = [load_file_index(data_file) for data_file in self.data_files]
+        self.entries = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=INDEX_COLUMNS)
+
+    @staticmethod
+    def files_for_dates(start_date=None, end_date=None):
+        """
+        The data files from `start_date` to `end_date` (yyyymmdd, either may
+        be None) plus their neighbours, so markets straddling midnight at
+        either end of the range are complete.
+        """
+        all_files = config.get_data_files()
+        in_range = config.get_data_files(start_date, end_date)
+        if not in_range:
+            return []
+        first, last = all_files.index(in_range[0]), all_files.index(in_range[-1])
+        return all_files[max(first - 1, 0):last + 2]
+
+    @classmethod
+    def for_dates(cls, start_date=None, end_date=None):
+        """Indexes the files of `files_for_dates(start_date, end_date)`."""
+        return cls(cls.files_for_dates(start_date, end_date))
+
+    def markets(self, start=None, end=None, market=None):
+        """
+        Returns the (TargetTime, Expiration) pairs, ordered by TargetTime,
+        that have ticks in [start, end). `start`/`end` are timestamps or
+        yyyymmdd dates; dates select the markets logged in the files of those
+        days (inclusive), which is what a single-file load sees, since a
+        day's file runs past midnight UTC. `market` restricts the result to
+        that one (TargetTime, Expiration) pair.
+        """
+        entries = self.entries
+        if _is_date(start) or _is_date(end):
+            file_dates = entries['DataFile'].map(_file_date)
+            in_range = np.ones(len(entries), dtype=bool)
+            if _is_date(start):
+                in_range &= (file_dates >= int(start)).to_numpy()
+                start = None
+            if _is_date(end):
+                in_range &= (file_dates <= int(end)).to_numpy()
+                end = None
+            entries = entries[in_range]
+        markets = entries.groupby(MARKET_COLUMNS, sort=True).agg(
+            FirstTimestamp=('FirstTimestamp', 'min'), LastTimestamp=('LastTimestamp', 'max')
+        ).reset_index()
+        keep = np.ones(len(markets), dtype=bool)
+        if start is not None:
+            keep &= (markets['LastTimestamp'] >= start).to_numpy()
+        if end is not None:
+            keep &= (markets['FirstTimestamp'] < end).to_numpy()
+        if market is not None:
+            keep &= ((markets['TargetTime'] == market[0]) & (markets['Expiration'] == market[1])).to_numpy()
+        return list(markets.loc[keep, MARKET_COLUMNS].itertuples(index=False, name=None))
+
+    def load(self, markets, columns=None):
+        """
+        Reads every row of `markets` (pairs as returned by `markets()`) from
+        the indexed files, in file order. Only the merged row ranges of the
+        requested markets are read.
+        """
+        if not markets:
+            return pd.DataFrame(columns=columns)
+        wanted = pd.MultiIndex.from_tuples(markets, names=MARKET_COLUMNS)
+        read_columns = None if columns is None else list(dict.fromkeys(list(columns) + MARKET_COLUMNS))
+        frames = []
+        for data_file, file_entries in self.entries.groupby('DataFile', sort=False):
+            keys = pd.MultiIndex.from_frame(file_entries[MARKET_COLUMNS])
+            selected = file_entries[keys.isin(wanted)].sort_values('RowStart')
+            if selected.empty:
+                continue
+            df = load_market_rows(data_file, _merge_ranges(selected), read_columns)
+            # Merged ranges can cover interleaved rows of other markets
+            df = df[pd.MultiIndex.from_frame(df[MARKET_COLUMNS]).isin(wanted)]
+            frames.append(df if columns is None else df[[col for col in columns if col in df.columns]])
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+
+def _merge_ranges(entries):
+    """Merges overlapping/adjacent row ranges into (row_start, row_stop, byte_start, byte_stop) tuples."""
+    ranges = []
+    for row_start, row_stop, byte_start, byte_stop in entries[['RowStart', 'RowStop', 'ByteStart', 'ByteStop']].itertuples(index=False, name=None):
+        if ranges and row_start <= ranges[-1][1]:
+            last = ranges[-1]
+            if row_stop > last[1]:
+                ranges[-1] = (last[0], row_stop, last[2], byte_stop)
+        else:
+            ranges.append((row_start, row_stop, byte_start, byte_stop))
+    return ranges
+
+
+def load_date_range(start_date=None, end_date=None, market=None, columns=None, profile='default'):
+    """
+    Returns the rows of every market with ticks between `start_date` and
+    `end_date` (yyyymmdd, inclusive), or only of `market`, read through the
+    index. Rows keep their file order, days in date order. `profile` is the
+    load profile, as for market_store.load_market_data.
+
+    With config.TICK_DB_ENABLED, the same rows are queried from the SQLite
+    tick database instead (see tick_db.py).
+    """
+    if config.TICK_DB_ENABLED and os.path.exists(config.TICK_DB_FILE):
+        from .tick_db import TickDatabase  # tick_db builds on this module
+
+        with TickDatabase() as db:
+            return apply_load_profile(db.query(start_date, end_date, market, columns), profile)
+    index = MarketIndex.for_dates(start_date, end_date)
+    return apply_load_profile(index.load(index.markets(start_date, end_date, market), columns), profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the markets in a date range from the market index.")
+    parser.add_argument("--start", default=None, help="First date (yyyymmdd). Defaults to the earliest file.")
+    parser.add_argument("--end", default=None, help="Last date (yyyymmdd). Defaults to the latest file.")
+    args = parser.parse_args()
+
+    index = MarketIndex.for_dates(args.start, args.end)
+    markets = set(index.markets(args.start, args.end))
+    entries = index.entries[pd.MultiIndex.from_frame(index.entries[MARKET_COLUMNS]).isin(markets)]
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(entries.drop(columns=['ByteStart', 'ByteStop']).to_string(index=False))
+    print(f"\n{len(markets)} markets in {entries['DataFile'].nunique()} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import io
+import os
+import time
+import pandas as pd
+import src.config as config
+from .archive import ArchiveFile, write_archive
+from .compact import apply_load_profile, parse_timestamps
+from .compaction import LAST_SEEN_COLUMN, RUN_COLUMNS, expand_ticks, is_compacted_csv
+from .tick_store import TickFile, is_current_tick_file, write_tick_file
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional: without it only the CSVs and tick files are read
+    pyarrow = None
+
+DATE_COLUMNS = ['Timestamp', 'TargetTime', 'Expiration']
+# 'ticks' is the fixed-width, memory-mappable format of tick_store.py,
+# 'archive' the block-compressed format of archive.py
+STORE_FORMATS = ('parquet', 'feather', 'ticks', 'archive')
+_ARROW_FORMATS = ('parquet', 'feather')
+STORE_COMPRESSION = 'zstd'
+# Small row groups let row-range reads (see market_index.py) skip most of a Parquet file
+PARQUET_ROW_GROUP_ROWS = 16_384
+DEFAULT_CHUNK_ROWS = 5_000
+_reported = set()
+
+
+def read_market_csv(data_file, columns=None):
+    """
+    Parses a raw market data CSV with its date columns as UTC datetimes.
+    `columns` restricts (and orders) the columns returned; names the file
+    does not have are skipped. A compacted file (see compaction.py) is
+    expanded back to one row per tick.
+    """
+    return _finish_csv_frame(pd.read_csv(data_file, usecols=_usecols(columns)), columns)
+
+
+def _usecols(columns):
+    # The run columns of a compacted file are always read, to expand it
+    return None if columns is None else (lambda col: col in columns or col in RUN_COLUMNS)
+
+
+def _finish_csv_frame(df, columns):
+    for col in DATE_COLUMNS + [LAST_SEEN_COLUMN]:
+        if col in df.columns:
+            df[col] = parse_timestamps(df[col])
+    df = expand_ticks(df)
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+
+def find_store_file(data_file):
+    """
+    Returns the columnar file to read for `data_file`, or None to fall back
+    to the CSV. `data_file` may itself be a .parquet/.feather/.ticks/.archive file; for a CSV,
+    its store copy is used only while it is at least as new as the CSV, so a
+    file the data logger is still appending to is always read fresh.
+
+    A copy in another format than config.STORE_FORMAT is reported when it
+    is chosen, and tick files in an older layout are skipped.
+    """
+    if _store_format(data_file) in STORE_FORMATS:
+        return data_file if os.path.exists(data_file) and _readable(data_file) else None
+
+    csv_mtime = os.path.getmtime(data_file) if os.path.exists(data_file) else None
+    formats = [config.STORE_FORMAT] + [fmt for fmt in STORE_FORMATS if fmt != config.STORE_FORMAT]
+    for fmt in formats:
+        if pyarrow is None and fmt in _ARROW_FORMATS:
+            continue
+        store_file = config.get_store_filename(data_file, fmt)
+        if not os.path.exists(store_file) or (csv_mtime is not None and os.path.getmtime(store_file) < csv_mtime):
+            continue
+        if fmt == 'ticks' and not is_current_tick_file(store_file):
+            _report_once(f"Skipping {store_file}: it uses an older tick file layout. Convert {data_file} again.")
+            continue
+        if fmt != config.STORE_FORMAT:
+            _report_once(f"Reading {data_file} from {store_file} (no current {config.STORE_FORMAT} copy).")
+        return store_file
+    return None
+
+
+def _report_once(message):
+    # find_store_file runs on every load, so each choice is printed once per process
+    if message not in _reported:
+        _reported.add(message)
+        print(message)
+
+
+def data_file_mtime(data_file):
+    """Modification time of `data_file`, or of its store copy when only that exists."""
+    if os.path.exists(data_file):
+        return os.path.getmtime(data_file)
+    store_file = find_store_file(data_file)
+    if store_file is None:
+        raise FileNotFoundError(f"Data file not found at {data_file}")
+    return os.path.getmtime(store_file)
+
+
+def _store_format(store_file):
+    return os.path.splitext(store_file)[1].lstrip('.')
+
+
+def _readable(store_file):
+    return pyarrow is not None or _store_format(store_file) not in _ARROW_FORMATS
+
+
+def _store_columns(store_file):
+    if _store_format(store_file) == 'parquet':
+        return pq.read_schema(store_file).names
+    with pyarrow.memory_map(store_file) as source:
+        return pyarrow.ipc.open_file(source).schema.names
+
+
+def _project(store_file, columns):
+    if columns is None:
+        return None
+    available = set(_store_columns(store_file))
+    return [col for col in columns if col in available]
+
+
+def load_market_data(data_file, columns=None, profile='default'):
+    """
+    Returns the market data of `data_file` as a DataFrame with UTC datetime
+    columns, reading only `columns` (in that order, skipping names the file
+    does not have) when given. `profile='compact'` narrows the dtypes (see
+    compact.py).
+
+    --- OPTIMIZATION: Typed columnar store ---
+    When a converted Parquet/Feather copy exists it is read instead of the
+    CSV: no text parsing, no datetime inference, and only the requested
+    columns are decoded. Raises FileNotFoundError if neither file exists.
+    """
+    store_file = find_store_file(data_file)
+    if store_file is None:
+        df = read_market_csv(data_file, columns)
+    elif _store_format(store_file) == 'ticks':
+        df = TickFile(store_file).to_frame(columns)
+    elif _store_format(store_file) == 'archive':
+        df = ArchiveFile(store_file).to_frame(columns)
+    elif _store_format(store_file) == 'parquet':
+        df = pd.read_parquet(store_file, columns=_project(store_file, columns))
+    else:
+        df = pd.read_feather(store_file, columns=_project(store_file, columns))
+    return apply_load_profile(df, profile)
+
+
+def iter_market_data_chunks(data_file, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None):
+    """Yields the market data of `data_file` as DataFrames of at most `chunk_rows` rows."""
+    store_file = find_store_file(data_file)
+    if store_file is None:
+        for chunk in pd.read_csv(data_file, usecols=_usecols(columns), chunksize=chunk_rows):
+            yield _finish_csv_frame(chunk, columns)
+        return
+
+    if _store_format(store_file) == 'ticks':
+        tick_file = TickFile(store_file)
+        for start in range(0, len(tick_file), chunk_rows):
+            yield tick_file.to_frame(columns, start, start + chunk_rows)
+        return
+
+    if _store_format(store_file) == 'archive':
+        # One block is decompressed at a time
+        for block in ArchiveFile(store_file).iter_chunks(columns):
+            for start in range(0, len(block), chunk_rows):
+                yield block.iloc[start:start + chunk_rows].reset_index(drop=True)
+        return
+
+    projected = _project(store_file, columns)
+    if _store_format(store_file) == 'parquet':
+        batches = pq.ParquetFile(store_file).iter_batches(batch_size=chunk_rows, columns=projected)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        # Feather files are memory-mapped, so slicing only touches the pages of each chunk
+        table = feather.read_table(store_file, columns=projected, memory_map=True)
+        for start in range(0, table.num_rows, chunk_rows):
+            yield table.slice(start, chunk_rows).to_pandas()
+
+
+def _read_csv_rows(data_file, row_range, columns):
+    row_start, row_stop, byte_start, byte_stop = row_range
+    if byte_start < 0:
+        df = pd.read_csv(data_file, usecols=_usecols(columns), skiprows=range(1, row_start + 1), nrows=row_stop - row_start)
+        return _finish_csv_frame(df, columns)
+    # Seek straight to the rows and parse them behind the header line
+    with open(data_file, 'rb') as f:
+        header = f.readline()
+        f.seek(byte_start)
+        body = f.read(byte_stop - byte_start)
+    return _finish_csv_frame(pd.read_csv(io.BytesIO(header + body), usecols=_usecols(columns)), columns)
+
+
+def _read_parquet_rows(store_file, ranges, columns):
+    parquet_file = pq.ParquetFile(store_file)
+    metadata = parquet_file.metadata
+    group_starts = [0]
+    for group in range(metadata.num_row_groups):
+        group_starts.append(group_starts[-1] + metadata.row_group(group).num_rows)
+
+    frames = []
+    for row_start, row_stop, _, _ in ranges:
+        groups = [g for g in range(metadata.num_row_groups) if group_starts[g] < row_stop and group_starts[g + 1] > row_start]
+        table = parquet_file.read_row_groups(groups, columns=columns)
+        offset = row_start - group_starts[groups[0]] if groups else 0
+        frames.append(table.slice(offset, row_stop - row_start).to_pandas())
+    return frames
+
+
+def load_market_rows(data_file, ranges, columns=None):
+    """
+    Returns the rows of `data_file` covered by `ranges`, a list of
+    (row_start, row_stop, byte_start, byte_stop) tuples as kept by the market
+    index, concatenated in order. Only those rows are decoded: tick and
+    Feather files are sliced, Parquet and archives read the row groups or
+    blocks involved, and a CSV
+    is read from its byte offsets (or by skipping lines when they are -1).
+    The rows of a compacted CSV are only known once it is expanded, so it is
+    read whole and sliced.
+    """
+    store_file = find_store_file(data_file)
+    if store_file is None and is_compacted_csv(data_file):
+        df = read_market_csv(data_file, columns)
+        frames = [df.iloc[row_start:row_stop] for row_start, row_stop, _, _ in ranges]
+    elif store_file is None:
+        frames = [_read_csv_rows(data_file, row_range, columns) for row_range in ranges]
+    elif _store_format(store_file) == 'ticks':
+        tick_file = TickFile(store_file)
+        frames = [tick_file.to_frame(columns, row_start, row_stop) for row_start, row_stop, _, _ in ranges]
+    elif _store_format(store_file) == 'archive':
+        archive = ArchiveFile(store_file)
+        frames = [archive.to_frame(columns, row_start, row_stop) for row_start, row_stop, _, _ in ranges]
+    elif _store_format(store_file) == 'parquet':
+        frames = _read_parquet_rows(store_file, ranges, _project(store_file, columns))
+    else:
+        table = feather.read_table(store_file, columns=_project(store_file, columns), memory_map=True)
+        frames = [table.slice(row_start, row_stop - row_start).to_pandas() for row_start, row_stop, _, _ in ranges]
+    if not frames:
+        return load_market_data(data_file, columns).iloc[:0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def convert_data_file(data_file, fmt=None):
+    """
+    Writes the typed columnar copy of the CSV `data_file` and returns its path.
+    The file is written next to the target and renamed into place, so readers
+    never see a partial file.
+    """
+    fmt = fmt or config.STORE_FORMAT
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Unknown store format '{fmt}'. Expected one of: {', '.join(STORE_FORMATS)}")
+    if pyarrow is None and fmt in _ARROW_FORMATS:
+        raise ImportError("Converting market data to Parquet/Feather requires pyarrow.")
+
+    df = read_market_csv(data_file)
+    store_file = config.get_store_filename(data_file, fmt)
+    os.makedirs(os.path.dirname(store_file), exist_ok=True)
+    if fmt == 'ticks':
+        return write_tick_file(df, store_file)
+    if fmt == 'archive':
+        return write_archive(df, store_file)
+    temp_file = f"{store_file}.tmp"
+    if fmt == 'parquet':
+        df.to_parquet(temp_file, index=False, compression=STORE_COMPRESSION, row_group_size=PARQUET_ROW_GROUP_ROWS)
+    else:
+        df.to_feather(temp_file, compression=STORE_COMPRESSION)
+    os.replace(temp_file, store_file)
+    return store_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the daily market data CSVs into the typed columnar store.")
+    parser.add_argument("--format", choices=STORE_FORMATS, default=config.STORE_FORMAT, help="Store file format.")
+    parser.add_argument("--start", default=None, help="First date to convert (yyyymmdd). Defaults to the earliest file.")
+    parser.add_argument("--end", default=None, help="Last date to convert (yyyymmdd). Defaults to the latest file.")
+    parser.add_argument("--force", action='store_true', help="Rewrite files whose store copy is already up to date.")
+    args = parser.parse_args()
+
+    data_files = config.get_data_files(args.start, args.end)
+    if not data_files:
+        print("No market data files found in the requested date range.")
+        return
+
+    for data_file in data_files:
+        store_file = config.get_store_filename(data_file, args.format)
+        if not args.force and os.path.exists(store_file) and os.path.getmtime(store_file) >= os.path.getmtime(data_file):
+            print(f"{data_file}: up to date ({store_file})")
+            continue
+        start_time = time.perf_counter()
+        convert_data_file(data_file, args.format)
+        elapsed = time.perf_counter() - start_time
+        csv_size = os.path.getsize(data_file)
+        store_size = os.path.getsize(store_file)
+        print(f"{data_file} -> {store_file}: {csv_size / 1e6:.1f} MB -> {store_size / 1e6:.1f} MB "
+              f"({csv_size / store_size:.1f}x smaller) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.market_frames import MARKET_COLUMNS, widen_frame, winning_sides
+from .compact import parse_timestamps
+from .market_store import DATE_COLUMNS, data_file_mtime, load_market_data
+
+# Per-tick values summarised for every market. PairCost (UpAsk + DownAsk) and
+# SpreadTotal (UpSpread + DownSpread) are derived from the logged fields.
+STAT_COLUMNS = ['PairCost', 'SpreadTotal', 'UpAsk', 'DownAsk', 'UpBid', 'DownBid', 'UpAskLiquidity', 'DownAskLiquidity']
+_STATS = ['Min', 'Max', 'Sum', 'SumSq']
+SUMMARY_COLUMNS = MARKET_COLUMNS + [
+    'FirstTimestamp', 'LastTimestamp', 'Ticks', 'OpenPairCost', 'ClosePairCost', 'FinalUpAsk', 'FinalDownAsk', 'WinningSide'
+] + [f'{col}{stat}' for col in STAT_COLUMNS for stat in _STATS]
+_DATETIME_COLUMNS = MARKET_COLUMNS + ['FirstTimestamp', 'LastTimestamp']
+SOURCE_COLUMNS = ['Timestamp'] + MARKET_COLUMNS + [
+    'UpBid', 'UpAsk', 'DownBid', 'DownAsk', 'UpSpread', 'DownSpread', 'UpAskLiquidity', 'DownAskLiquidity'
+]
+
+
+def _with_derived_columns(df):
+    df = widen_frame(df)
+    derived = {}
+    if 'UpAsk' in df.columns and 'DownAsk' in df.columns:
+        derived['PairCost'] = df['UpAsk'] + df['DownAsk']
+    if 'UpSpread' in df.columns and 'DownSpread' in df.columns:
+        derived['SpreadTotal'] = df['UpSpread'] + df['DownSpread']
+    return df.assign(**derived)
+
+
+def _resolve(table):
+    """Sets WinningSide from the final asks (the outcome table's rule)."""
+    table['WinningSide'] = winning_sides(table['FinalUpAsk'].fillna(0), table['FinalDownAsk'].fillna(0))
+    return table
+
+
+def build_summary(df):
+    """
+    Summarises every market of a market data frame in one grouped pass.
+
+    Returns one row per (TargetTime, Expiration), ordered like the outcome
+    table, holding its first/last tick and tick count, the opening and
+    closing pair cost, the final asks and winner, and for each of
+    STAT_COLUMNS its min, max, sum and sum of squares. Sums rather than
+    means are kept so that summaries of parts of a market (batches, days)
+    combine exactly with `merge_summaries`; `market_stats` turns them into
+    means and standard deviations. Fields the frame lacks are NaN.
+    """
+    df = _with_derived_columns(df)
+    # Stable sort keeps file order among rows sharing a timestamp, as in build_outcome_table
+    ordered = df.sort_values('Timestamp', kind='stable')
+    first_rows = ordered.drop_duplicates(subset=MARKET_COLUMNS, keep='first').set_index(MARKET_COLUMNS)
+    last_rows = ordered.drop_duplicates(subset=MARKET_COLUMNS, keep='last').set_index(MARKET_COLUMNS)
+
+    stat_columns = [col for col in STAT_COLUMNS if col in df.columns]
+    values = df[MARKET_COLUMNS + stat_columns]
+    squares = values[stat_columns] ** 2
+    groups = values.groupby(MARKET_COLUMNS, sort=True)
+    table = pd.DataFrame({
+        'FirstTimestamp': first_rows['Timestamp'],
+        'LastTimestamp': last_rows['Timestamp'],
+        'Ticks': groups.size(),
+    })
+    if 'PairCost' in df.columns:
+        table['OpenPairCost'] = first_rows['PairCost']
+        table['ClosePairCost'] = last_rows['PairCost']
+    for side in ['Up', 'Down']:
+        if f'{side}Ask' in df.columns:
+            table[f'Final{side}Ask'] = last_rows[f'{side}Ask']
+    stats = {'Min': groups.min(), 'Max': groups.max(), 'Sum': groups.sum(),
+             'SumSq': squares.groupby([values[col] for col in MARKET_COLUMNS], sort=True).sum()}
+    for col in stat_columns:
+        for stat in _STATS:
+            table[f'{col}{stat}'] = stats[stat][col]
+    table = table.sort_index().reset_index().reindex(columns=SUMMARY_COLUMNS)
+    table['Ticks'] = table['Ticks'].astype(np.int64)
+    return _resolve(table)
+
+
+def summary_from_rows(rows):
+    """Summarises rows as the data logger writes them (lists in config.MARKET_DATA_COLUMNS order)."""
+    df = pd.DataFrame(rows, columns=config.MARKET_DATA_COLUMNS)
+    for col in DATE_COLUMNS:
+        df[col] = parse_timestamps(df[col])
+    return build_summary(df)
+
+
+def merge_summaries(tables):
+    """
+    Combines summaries of consecutive parts of the data (flushed batches,
+    or daily files of markets that run past midnight) into one row per
+    market: counts and sums add up, the open comes from the earliest part
+    and the close, final asks and winner from the latest.
+    """
+    tables = [table for table in tables if not table.empty]
+    if not tables:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    if len(tables) == 1 and not tables[0].duplicated(subset=MARKET_COLUMNS).any():
+        return tables[0]
+    combined = pd.concat(tables, ignore_index=True)
+    groups = combined.groupby(MARKET_COLUMNS, sort=True)
+    aggregations = {'FirstTimestamp': 'min', 'LastTimestamp': 'max', 'Ticks': 'sum'}
+    for col in STAT_COLUMNS:
+        aggregations.update({f'{col}Min': 'min', f'{col}Max': 'max'})
+    table = groups.agg(aggregations)
+    # min_count keeps fields no part had as NaN rather than 0
+    for col in STAT_COLUMNS:
+        for stat in ['Sum', 'SumSq']:
+            table[f'{col}{stat}'] = groups[f'{col}{stat}'].sum(min_count=1)
+
+    opens = combined.sort_values('FirstTimestamp', kind='stable').drop_duplicates(subset=MARKET_COLUMNS, keep='first')
+    closes = combined.sort_values('LastTimestamp', kind='stable').drop_duplicates(subset=MARKET_COLUMNS, keep='last')
+    table['OpenPairCost'] = opens.set_index(MARKET_COLUMNS)['OpenPairCost']
+    for col in ['ClosePairCost', 'FinalUpAsk', 'FinalDownAsk']:
+        table[col] = closes.set_index(MARKET_COLUMNS)[col]
+    return _resolve(table.reset_index().reindex(columns=SUMMARY_COLUMNS))
+
+
+def read_summary_file(summary_file):
+    """Reads a summary sidecar, merging the rows appended for the same market into one."""
+    table = pd.read_csv(summary_file)
+    for col in _DATETIME_COLUMNS:
+        table[col] = pd.to_datetime(table[col], utc=True)
+    return merge_summaries([table])
+
+
+def write_summary_file(data_file, table):
+    """Writes the summary sidecar of `data_file` (data/cache/market_data_YYYYMMDD.summary.csv)."""
+    summary_file = config.get_sidecar_filename(data_file, 'summary')
+    try:
+        os.makedirs(os.path.dirname(summary_file), exist_ok=True)
+        temp_file = f"{summary_file}.tmp"
+        table.to_csv(temp_file, index=False)
+        os.replace(temp_file, summary_file)
+    except OSError as e:
+        print(f"Warning: could not write market summary {summary_file}: {e}")
+
+
+def append_summary_file(data_file, table):
+    """
+    Appends `table`, the summary of rows just added to `data_file`, to its
+    sidecar. A market then has one row per append until the sidecar is next
+    rewritten; read_summary_file merges them.
+    """
+    summary_file = config.get_sidecar_filename(data_file, 'summary')
+    try:
+        os.makedirs(os.path.dirname(summary_file), exist_ok=True)
+        header = not os.path.exists(summary_file) or os.path.getsize(summary_file) == 0
+        table.reindex(columns=SUMMARY_COLUMNS).to_csv(summary_file, mode='a', header=header, index=False)
+    except OSError as e:
+        print(f"Warning: could not append to market summary {summary_file}: {e}")
+
+
+def load_market_summary(data_file, df=None):
+    """
+    Returns the market summary of `data_file`, using its sidecar file when it
+    is newer than the data (the data logger keeps the current day's sidecar
+    up to date as it writes). Otherwise the summary is built (from `df` if
+    given, or by reading `data_file`) and the sidecar is refreshed.
+    """
+    summary_file = config.get_sidecar_filename(data_file, 'summary')
+    if os.path.exists(summary_file) and os.path.getmtime(summary_file) >= data_file_mtime(data_file):
+        return read_summary_file(summary_file)
+
+    if df is None:
+        df = load_market_data(data_file, columns=SOURCE_COLUMNS)
+    table = build_summary(df)
+    write_summary_file(data_file, table)
+    return table
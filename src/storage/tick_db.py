@@ -0,0 +1,165 @@
+import argparse
+import os
+import sqlite3
+import time
+import pandas as pd
+import src.config as config
+from src.market_frames import BOOK_COLUMNS
+from .compact import TIMESTAMP_FORMAT, parse_timestamps
+from .market_index import _file_date, _is_date
+from .market_store import DATE_COLUMNS, read_market_csv
+
+TABLE = 'ticks'
+# Datetimes are stored as the logger writes them (TIMESTAMP_FORMAT), which sort like the times they name
+
+_SCHEMA = [
+    f"""CREATE TABLE IF NOT EXISTS {TABLE} (
+        FileDate INTEGER NOT NULL,
+        {', '.join(f'{col} TEXT' for col in DATE_COLUMNS)},
+        {', '.join(f'{col} REAL' for col in BOOK_COLUMNS)}
+    )""",
+    # One market, optionally within a time window
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_market_time ON {TABLE} (TargetTime, Expiration, Timestamp)",
+    # Time windows across markets
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_time ON {TABLE} (Timestamp)",
+    # Date-range queries and re-imports of a day
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_file_date ON {TABLE} (FileDate)",
+]
+_INSERT = f"INSERT INTO {TABLE} VALUES ({', '.join('?' * (1 + len(config.MARKET_DATA_COLUMNS)))})"
+
+
+def _format_time(value):
+    """A time bound (Timestamp, datetime or string; naive means UTC) in the stored text format."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert('UTC')
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+class TickDatabase:
+    """
+    The market data in one SQLite database (config.TICK_DB_FILE), with one
+    row per tick tagged by the date of the daily file it was logged to.
+
+    --- OPTIMIZATION: Indexed tick database ---
+    Ticks are indexed by market and Timestamp, so a time window or a single
+    market is found with an index lookup instead of parsing a day's CSV.
+    The database runs in WAL mode: the data logger appends batches while the
+    dashboard and analysis tools read, without either blocking the other.
+    A connection belongs to the thread that opened it.
+    """
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or config.TICK_DB_FILE
+        self.connection = sqlite3.connect(self.db_file)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            for statement in _SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def insert_rows(self, rows, data_file):
+        """
+        Appends logger rows (lists in config.MARKET_DATA_COLUMNS order, with
+        datetimes already formatted) written to the daily file `data_file`,
+        in one transaction.
+        """
+        file_date = _file_date(data_file)
+        with self.connection:
+            self.connection.executemany(_INSERT, ([file_date] + list(row) for row in rows))
+
+    def import_csv(self, data_file):
+        """
+        (Re)imports one daily data file, replacing the rows of its date, and
+        returns the number of rows imported.
+        """
+        df = read_market_csv(data_file)[config.MARKET_DATA_COLUMNS]
+        for col in DATE_COLUMNS:
+            df[col] = df[col].dt.strftime(TIMESTAMP_FORMAT)
+        file_date = _file_date(data_file)
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {TABLE} WHERE FileDate = ?", (file_date,))
+            self.connection.executemany(_INSERT, ((file_date,) + row for row in df.itertuples(index=False, name=None)))
+        return len(df)
+
+    def file_dates(self):
+        """The dates of the daily files with rows in the database."""
+        return [row[0] for row in self.connection.execute(f"SELECT DISTINCT FileDate FROM {TABLE} ORDER BY FileDate")]
+
+    def query(self, start=None, end=None, market=None, columns=None):
+        """
+        Returns ticks as a DataFrame with UTC datetime columns, in logged
+        order (days in date order). `start`/`end` are either yyyymmdd dates,
+        selecting every row of the markets logged on those days (inclusive)
+        as market_index.load_date_range does, or timestamps, selecting just
+        the ticks in [start, end). `market` restricts the result to one
+        (TargetTime, Expiration) pair.
+        """
+        columns = list(config.MARKET_DATA_COLUMNS) if columns is None else [col for col in columns if col in config.MARKET_DATA_COLUMNS]
+        conditions, params = [], []
+        if _is_date(start) or _is_date(end):
+            day_conditions = []
+            if _is_date(start):
+                day_conditions.append("FileDate >= ?")
+                params.append(int(start))
+                start = None
+            if _is_date(end):
+                day_conditions.append("FileDate <= ?")
+                params.append(int(end))
+                end = None
+            conditions.append(f"(TargetTime, Expiration) IN (SELECT DISTINCT TargetTime, Expiration FROM {TABLE} "
+                              f"WHERE {' AND '.join(day_conditions)})")
+        if start is not None:
+            conditions.append("Timestamp >= ?")
+            params.append(_format_time(start))
+        if end is not None:
+            conditions.append("Timestamp < ?")
+            params.append(_format_time(end))
+        if market is not None:
+            conditions.append("TargetTime = ? AND Expiration = ?")
+            params.extend(_format_time(value) for value in market)
+
+        sql = f"SELECT {', '.join(columns)} FROM {TABLE}"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += " ORDER BY FileDate, rowid"
+        df = pd.DataFrame(self.connection.execute(sql, params).fetchall(), columns=columns)
+        for col in columns:
+            if col in DATE_COLUMNS:
+                df[col] = parse_timestamps(df[col])
+            else:
+                df[col] = df[col].astype('float64')
+        return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the daily market data CSVs into the SQLite tick database.")
+    parser.add_argument("--start", default=None, help="First date to import (yyyymmdd). Defaults to the earliest file.")
+    parser.add_argument("--end", default=None, help="Last date to import (yyyymmdd). Defaults to the latest file.")
+    parser.add_argument("--db", default=None, help="Database file. Defaults to config.TICK_DB_FILE.")
+    args = parser.parse_args()
+
+    data_files = config.get_data_files(args.start, args.end)
+    if not data_files:
+        print("No market data files found in the requested date range.")
+        return
+
+    with TickDatabase(args.db) as db:
+        for data_file in data_files:
+            start_time = time.perf_counter()
+            n_rows = db.import_csv(data_file)
+            print(f"{data_file}: {n_rows} rows in {time.perf_counter() - start_time:.2f}s")
+        print(f"{db.db_file}: {len(db.file_dates())} day(s), {os.path.getsize(db.db_file) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import struct
+import numpy as np
+import pandas as pd
+from src.market_frames import BOOK_COLUMNS, BOOK_DECIMALS, MarketRegistry
+
+# --- Fixed-width tick file layout ---
+# header (64 bytes) | market table (n_markets x 2 int64 epoch ms) | padding | records
+# Every record is TICK_DTYPE: the Timestamp in epoch milliseconds, the file's
+# MarketId for (TargetTime, Expiration), and the logger's book fields. Prices
+# and spreads (at most 1) are float32; liquidity sums can exceed float32's
+# exact 3-decimal range, so they are float64.
+TICK_MAGIC = b'PMTICKS1'
+TICK_VERSION = 2  # 1 stored liquidity as float32
+_HEADER = struct.Struct('<8sIIQQI')  # magic, version, record size, n_records, n_markets, book column mask
+_HEADER_SIZE = 64
+_ALIGNMENT = 64
+
+LIQUIDITY_COLUMNS = [col for col in BOOK_COLUMNS if col.endswith('Liquidity')]
+TICK_DTYPE = np.dtype([('Timestamp', '<i8'), ('MarketId', '<i4')] + [
+    (col, '<f8' if col in LIQUIDITY_COLUMNS else '<f4') for col in BOOK_COLUMNS
+])
+# Reads round the book values back to the logger's BOOK_DECIMALS.
+
+_MS = 1_000_000  # nanoseconds per millisecond
+
+
+def _to_epoch_ms(values):
+    return pd.DatetimeIndex(values).as_unit('ns').asi8 // _MS
+
+
+def _from_epoch_ms(values):
+    return pd.to_datetime(np.asarray(values, dtype=np.int64) * _MS, utc=True)
+
+
+def _records_offset(n_markets):
+    end = _HEADER_SIZE + n_markets * 16
+    return -(-end // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_tick_file(df, path):
+    """
+    Writes a parsed market DataFrame (see market_store.load_market_data) as a
+    fixed-width tick file. Book columns `df` lacks are stored as 0 and left
+    out again on read.
+    """
+    registry = MarketRegistry()
+    market_ids = registry.assign(df)
+    records = np.zeros(len(df), dtype=TICK_DTYPE)
+    records['Timestamp'] = _to_epoch_ms(df['Timestamp'])
+    records['MarketId'] = market_ids
+    column_mask = 0
+    for bit, col in enumerate(BOOK_COLUMNS):
+        if col in df.columns:
+            records[col] = df[col].to_numpy(dtype=np.float64)
+            column_mask |= 1 << bit
+
+    markets = np.array(
+        [(target_time.value // _MS, expiration.value // _MS) for target_time, expiration in registry.market_ids],
+        dtype='<i8'
+    ).reshape(-1, 2)
+    offset = _records_offset(len(markets))
+
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        header = _HEADER.pack(TICK_MAGIC, TICK_VERSION, TICK_DTYPE.itemsize, len(records), len(markets), column_mask)
+        f.write(header.ljust(_HEADER_SIZE, b'\0'))
+        f.write(markets.tobytes())
+        f.write(b'\0' * (offset - f.tell()))
+        f.write(records.tobytes())
+    os.replace(temp_file, path)
+    return path
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        return _HEADER.unpack(f.read(_HEADER.size))
+
+
+def is_current_tick_file(path):
+    """True if `path` is a tick file in this version's layout (older files must be converted again)."""
+    try:
+        magic, version, record_size = _read_header(path)[:3]
+    except (OSError, struct.error):
+        return False
+    return magic == TICK_MAGIC and version == TICK_VERSION and record_size == TICK_DTYPE.itemsize
+
+
+class TickFile:
+    """
+    Read-only view of a fixed-width tick file.
+
+    `records` is a `numpy.memmap` over the file, so opening it parses
+    nothing and every process that opens the same file shares one copy in
+    the page cache. `column(name)` returns zero-copy views; `to_frame()`
+    builds the usual market DataFrame from any slice of rows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not is_current_tick_file(path):
+            raise ValueError(f"{path} is not a version {TICK_VERSION} tick file.")
+        _, _, _, n_records, n_markets, column_mask = _read_header(path)
+
+        markets = np.fromfile(path, dtype='<i8', count=n_markets * 2, offset=_HEADER_SIZE).reshape(-1, 2)
+        self.book_columns = [col for bit, col in enumerate(BOOK_COLUMNS) if column_mask & (1 << bit)]
+        self.target_times_ms = markets[:, 0]
+        self.expirations_ms = markets[:, 1]
+        if n_records:
+            self.records = np.memmap(path, dtype=TICK_DTYPE, mode='r', offset=_records_offset(n_markets), shape=(n_records,))
+        else:
+            self.records = np.zeros(0, dtype=TICK_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def columns(self):
+        return ['Timestamp', 'TargetTime', 'Expiration'] + self.book_columns
+
+    def column(self, name):
+        """Zero-copy view of a record field ('Timestamp' is epoch ms, 'MarketId' the file-local id)."""
+        return self.records[name]
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        """
+        Returns rows [start, stop) as a DataFrame in the market_store layout:
+        UTC datetime columns and float64 book fields rounded to the logger's
+        precision. `columns` projects the result, skipping unknown names.
+        """
+        records = self.records[start:stop]
+        columns = self.columns if columns is None else [col for col in columns if col in self.columns]
+        market_ids = records['MarketId']
+        data = {}
+        for col in columns:
+            if col == 'Timestamp':
+                data[col] = _from_epoch_ms(records['Timestamp'])
+            elif col == 'TargetTime':
+                data[col] = _from_epoch_ms(self.target_times_ms[market_ids])
+            elif col == 'Expiration':
+                data[col] = _from_epoch_ms(self.expirations_ms[market_ids])
+            else:
+                data[col] = np.round(records[col].astype(np.float64), BOOK_DECIMALS)
+        return pd.DataFrame(data, columns=columns)
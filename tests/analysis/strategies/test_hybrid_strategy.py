@@ -64,3 +64,13 @@ def test_stop_loss_not_triggered(strategy):
     assert decision[1] > 0
     assert decision[2] == 0.4
     assert decision[3] == 0
+
+def test_requires_every_row_only_while_unbalanced(strategy):
+    market_id = ('2023-01-01 12:00:00', '2023-01-01 12:15:00')
+    assert not strategy.requires_every_row(market_id)
+
+    strategy.update_portfolio(market_id, 'Up', 100, 0.4)
+    assert strategy.requires_every_row(market_id)
+
+    strategy.update_portfolio(market_id, 'Down', 100, 0.5)
+    assert not strategy.requires_every_row(market_id)
@@ -61,3 +61,32 @@ def test_decide_no_signal(strategy):
     }
     decision = strategy.decide(market_data, 1000)
     assert decision is None
+
+def test_decide_batch_flags_every_row_decide_trades_on(strategy):
+    import pandas as pd
+    from src.analysis.columnar import ColumnarFrame
+
+    base = {
+        'MinuteFromStart': 5, 'SharpEvent': True, 'UpMidDelta': 0.01, 'DownMidDelta': -0.01,
+        'BidLiquidityImbalance': 0.1, 'UpAsk': 0.5, 'DownAsk': 0.5,
+    }
+    rows = [
+        base,
+        {**base, 'MinuteFromStart': 1},
+        {**base, 'SharpEvent': False},
+        {**base, 'UpMidDelta': float('nan')},
+        {**base, 'UpMidDelta': 0, 'DownMidDelta': 0.02, 'BidLiquidityImbalance': -1},
+        {**base, 'UpMidDelta': 0, 'DownMidDelta': 0, 'BidLiquidityImbalance': 0},
+        {**base, 'UpAsk': 1.0},
+        {**base, 'UpAsk': 0.0},
+    ]
+    frame = ColumnarFrame(pd.DataFrame(rows))
+    batch = strategy.decide_batch(frame)
+
+    for index, row in enumerate(rows):
+        decision = strategy.decide(frame.row(index), 1000)
+        assert bool(batch['signal'][index]) == (decision is not None)
+        if decision is not None:
+            assert batch['side'][index] == decision[0]
+            assert batch['price'][index] == decision[2]
+            assert batch['score'][index] == decision[3]
@@ -0,0 +1,47 @@
+import math
+import pandas as pd
+import pytest
+from src.analysis.columnar import ColumnarFrame, RowView, timestamps_to_ns
+
+
+@pytest.fixture
+def frame():
+    df = pd.DataFrame({
+        'Timestamp': pd.to_datetime(['2025-12-26 10:00:01', '2025-12-26 10:00:00', '2025-12-26 10:00:01'], utc=True),
+        'UpAsk': [0.5, 0.6, float('nan')],
+        'SharpEvent': [True, False, True],
+    })
+    return ColumnarFrame(df)
+
+
+def test_row_view_matches_series_access(frame):
+    row = frame.row(0)
+    assert row['UpAsk'] == 0.5
+    assert row['Timestamp'] == pd.Timestamp('2025-12-26 10:00:01', tz='UTC')
+    assert row.get('SharpEvent') is True
+    assert row.get('Missing') is None
+    assert row.get('Missing', 0) == 0
+    assert 'UpAsk' in row
+    assert math.isnan(frame.row(2)['UpAsk'])
+    with pytest.raises(KeyError):
+        row['Missing']
+
+
+def test_row_view_is_read_only(frame):
+    row = frame.row(0)
+    with pytest.raises(TypeError):
+        row['UpAsk'] = 1.0
+    assert isinstance(row, RowView)
+
+
+def test_iter_groups_matches_groupby_order(frame):
+    groups = [(key, rows) for key, rows in frame.iter_groups('Timestamp')]
+    assert groups == [
+        (pd.Timestamp('2025-12-26 10:00:01', tz='UTC'), [0, 2]),
+        (pd.Timestamp('2025-12-26 10:00:00', tz='UTC'), [1]),
+    ]
+
+
+def test_datetime_columns_exposed_as_epoch_ns(frame):
+    expected = timestamps_to_ns(pd.to_datetime(['2025-12-26 10:00:01'], utc=True))[0]
+    assert frame.arrays['Timestamp'][0] == expected
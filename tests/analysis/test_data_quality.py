@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.analysis.backtester import Backtester
+from src.analysis.data_quality import QUALITY_FLAGS, flag_mask, load_quality_mask, scan_quality
+from src.analysis.outcomes import build_outcome_table
+from src.storage.market_store import read_market_csv
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+GAP, ZERO_ASK, EMPTY_BOOK, CROSSED, PAIR_COST, DUPLICATE_TIME, STALE = QUALITY_FLAGS.values()
+
+
+def test_scan_flags_each_problem():
+    df = read_market_csv(TEST_DATA_FILE)
+    # The resolution ticks have an emptied side and follow a gap
+    expected = [0, 0, 0, GAP | ZERO_ASK | EMPTY_BOOK, 0, 0, GAP | ZERO_ASK | EMPTY_BOOK]
+    assert scan_quality(df).tolist() == expected
+
+    df.loc[1, 'UpBid'] = 0.9                 # bid above the 0.55 ask
+    df.loc[2, 'Timestamp'] = df.loc[1, 'Timestamp']
+    df.loc[5, ['UpAsk', 'DownAsk']] = 0.7    # pair cost 1.4
+    assert scan_quality(df).tolist()[:6] == [0, CROSSED, DUPLICATE_TIME, GAP | ZERO_ASK | EMPTY_BOOK, 0, PAIR_COST]
+
+    # An unchanged book is flagged once it has been stale for QUALITY_STALE_SECONDS
+    step = pd.Timedelta(seconds=config.QUALITY_GAP_SECONDS)
+    stale = pd.concat([df.iloc[[0]]] * 10, ignore_index=True)
+    stale['Timestamp'] = df.loc[0, 'Timestamp'] + step * np.arange(10)
+    flags = scan_quality(stale)
+    first_stale = int(np.ceil(config.QUALITY_STALE_SECONDS / config.QUALITY_GAP_SECONDS))
+    assert (flags[:first_stale] == 0).all() and (flags[first_stale:] == STALE).all()
+
+
+def test_mask_sidecar_and_backtester_skip(tmp_path, monkeypatch):
+    data_file = tmp_path / 'market_data_20251226.csv'
+    pd.read_csv(TEST_DATA_FILE).to_csv(data_file, index=False)
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+
+    mask = load_quality_mask(str(data_file))
+    assert os.path.exists(config.get_sidecar_filename(str(data_file), 'quality', 'npz'))
+    np.testing.assert_array_equal(load_quality_mask(str(data_file)), mask)
+    # Changing a threshold rescans instead of reusing the cached mask
+    gap_seconds = config.QUALITY_GAP_SECONDS
+    monkeypatch.setattr(config, 'QUALITY_GAP_SECONDS', 1)
+    np.testing.assert_array_equal(load_quality_mask(str(data_file)), scan_quality(read_market_csv(str(data_file))))
+    assert not np.array_equal(load_quality_mask(str(data_file)), mask)
+    monkeypatch.setattr(config, 'QUALITY_GAP_SECONDS', gap_seconds)
+    assert flag_mask(['GAP', 'STALE']) == GAP | STALE
+
+    monkeypatch.setattr(config, 'QUALITY_SKIP_FLAGS', ['EMPTY_BOOK'])
+    with Backtester(log_mode='off') as backtester:
+        backtester.load_data(str(data_file))
+        assert len(backtester.market_data) == 5
+        # Outcomes still come from the skipped resolution ticks
+        winners = [record['WinningSide'] for record in backtester.market_outcomes.values()]
+        assert winners == build_outcome_table(read_market_csv(TEST_DATA_FILE))['WinningSide'].tolist()
@@ -0,0 +1,80 @@
+import functools
+import os
+import shutil
+import pandas as pd
+import pytest
+import src.config as config
+from src.analysis.feature_cache import cached_preprocess, feature_cache_file, feature_cache_key
+from src.market_frames import MARKET_ID_COLUMN, MarketRegistry
+from src.storage.market_store import load_market_data
+
+pytest.importorskip('pyarrow')
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+calls = []
+
+
+def add_spread(df, scale=1.0):
+    calls.append(scale)
+    df = df.sort_values(['TargetTime', 'Expiration', 'Timestamp']).reset_index(drop=True)
+    df['Spread'] = (df['UpAsk'] - df['UpBid']) * scale
+    return df
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    calls.clear()
+    path = tmp_path / 'market_data_20251226.csv'
+    shutil.copy(TEST_DATA_FILE, path)
+    return str(path)
+
+
+def test_repeat_runs_read_cached_features(data_file):
+    df = load_market_data(data_file)
+    first = cached_preprocess(df, [add_spread], [data_file])
+    second = cached_preprocess(load_market_data(data_file), [add_spread], [data_file])
+    assert calls == [1.0]
+    pd.testing.assert_frame_equal(second, first)
+    assert os.path.exists(feature_cache_file([data_file], feature_cache_key(df, [add_spread], [data_file])))
+
+
+def test_parameters_and_data_changes_invalidate(data_file):
+    df = load_market_data(data_file)
+    cached_preprocess(df, [add_spread], [data_file])
+    cached_preprocess(df, [functools.partial(add_spread, scale=2.0)], [data_file])
+    assert calls == [1.0, 2.0]
+
+    # The logger appending a row changes the key
+    with open(data_file, 'a') as f:
+        f.write('2025-12-26 11:00:01,2025-12-26 11:00:00,2025-12-26 11:00:00,1.0,0.98,0.0,0.0\n')
+    grown = load_market_data(data_file)
+    features = cached_preprocess(grown, [add_spread], [data_file])
+    assert calls == [1.0, 2.0, 1.0]
+    assert len(features) == len(df) + 1
+
+
+def test_reordered_rows_invalidate(data_file):
+    df = load_market_data(data_file)
+    cached_preprocess(df, [add_spread], [data_file])
+    cached_preprocess(df.iloc[::-1], [add_spread], [data_file])
+    assert calls == [1.0, 1.0]
+
+
+def test_market_ids_are_relabelled_from_the_registry(data_file):
+    registry = MarketRegistry()
+    cached_preprocess(registry.add_column(load_market_data(data_file)), [add_spread], [data_file], market_registry=registry)
+
+    # A registry that already knows other markets hands out different ids
+    other = MarketRegistry()
+    other.intern(pd.Timestamp('2025-12-25', tz='UTC'), pd.Timestamp('2025-12-25', tz='UTC'))
+    features = cached_preprocess(other.add_column(load_market_data(data_file)), [add_spread], [data_file], market_registry=other)
+    assert calls == [1.0]
+    assert features[MARKET_ID_COLUMN].tolist() == [1, 1, 1, 1, 2, 2, 2]
+
+
+def test_cache_can_be_disabled(data_file, monkeypatch):
+    monkeypatch.setattr(config, 'FEATURE_CACHE_ENABLED', False)
+    df = load_market_data(data_file)
+    cached_preprocess(df, [add_spread], [data_file])
+    cached_preprocess(df, [add_spread], [data_file])
+    assert calls == [1.0, 1.0]
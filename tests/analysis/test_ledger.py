@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from src.analysis.ledger import TransactionLedger
+
+MARKET1 = (pd.Timestamp('2025-12-26 10:45:00', tz='UTC'), pd.Timestamp('2025-12-26 10:45:00', tz='UTC'))
+MARKET2 = (pd.Timestamp('2025-12-26 11:00:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00:00', tz='UTC'))
+
+
+def _filled_ledger(capacity=2):
+    ledger = TransactionLedger(capacity=capacity)
+    ledger.append(pd.Timestamp('2025-12-26 10:34:14', tz='UTC'), 'Buy', MARKET1, 'Up', 10, 0.5, 5.0, -5.0)
+    ledger.append(pd.Timestamp('2025-12-26 10:34:20', tz='UTC'), 'Buy', MARKET1, 'Down', 4, 0.25, 1.0, -1.0)
+    ledger.append(pd.Timestamp('2025-12-26 10:45:14', tz='UTC'), 'Buy', MARKET2, 'Down', 6, 0.5, 3.0, -3.0)
+    ledger.append(pd.Timestamp('2025-12-26 10:45:00', tz='UTC'), 'Resolution', MARKET1, 'Up', 10, 0.5, 5.0, 5.0,
+                  winning_side='Up')
+    return ledger
+
+
+def test_ledger_grows_and_round_trips_records():
+    ledger = _filled_ledger(capacity=2)
+    assert len(ledger) == 4
+    assert ledger.market_ids == [MARKET1, MARKET2]
+
+    records = ledger.to_records()
+    assert records[0] == {
+        'Timestamp': pd.Timestamp('2025-12-26 10:34:14', tz='UTC'), 'Type': 'Buy', 'MarketID': MARKET1,
+        'Side': 'Up', 'Quantity': 10, 'EntryPrice': 0.5, 'Value': 5.0, 'PnL': -5.0
+    }
+    assert records[3]['Type'] == 'Resolution' and records[3]['WinningSide'] == 'Up'
+
+
+def test_ledger_to_frame_and_parquet(tmp_path):
+    ledger = _filled_ledger()
+    df = ledger.to_frame()
+    assert list(df['Type']) == ['Buy', 'Buy', 'Buy', 'Resolution']
+    assert list(df['Expiration']) == [MARKET1[1], MARKET1[1], MARKET2[1], MARKET1[1]]
+    assert pd.isna(df['WinningSide'].iloc[0]) and df['WinningSide'].iloc[3] == 'Up'
+
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'ledger.parquet'
+    ledger.to_parquet(path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), df, check_dtype=False)
+
+
+def test_buy_stats_by_market():
+    stats = _filled_ledger().buy_stats_by_market()
+    assert stats[0] == (2, 14, pd.Timestamp('2025-12-26 10:34:14', tz='UTC').value,
+                        pd.Timestamp('2025-12-26 10:34:20', tz='UTC').value)
+    assert stats[1][:2] == (1, 6)
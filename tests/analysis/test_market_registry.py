@@ -0,0 +1,45 @@
+import pandas as pd
+from src.analysis.backtester import Backtester
+from src.market_frames import MarketRegistry, market_key, MARKET_ID_COLUMN
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+MARKET1 = (pd.Timestamp('2025-12-26 10:45:00', tz='UTC'), pd.Timestamp('2025-12-26 10:45:00', tz='UTC'))
+MARKET2 = (pd.Timestamp('2025-12-26 11:00:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00:00', tz='UTC'))
+
+
+def test_registry_assigns_dense_ids_in_order_of_appearance():
+    registry = MarketRegistry()
+    df = pd.DataFrame({
+        'TargetTime': [MARKET2[0], MARKET1[0], MARKET2[0]],
+        'Expiration': [MARKET2[1], MARKET1[1], MARKET2[1]],
+    })
+    assert registry.assign(df).tolist() == [0, 1, 0]
+    assert registry.market_ids == [MARKET2, MARKET1]
+
+    # Ids are stable across frames and for tuples interned one at a time
+    assert registry.to_id(MARKET1) == 1
+    assert registry.to_id(1) == 1
+    assert registry.assign(df.iloc[[1]]).tolist() == [1]
+    assert len(registry) == 2
+
+
+def test_market_key_prefers_market_id():
+    row = {'TargetTime': MARKET1[0], 'Expiration': MARKET1[1]}
+    assert market_key(row) == MARKET1
+    assert market_key({**row, MARKET_ID_COLUMN: 3}) == 3
+
+
+def test_backtester_labels_rows_and_keys_outcomes_by_id():
+    backtester = Backtester()
+    backtester.load_data(TEST_DATA_FILE)
+    registry = backtester.market_registry
+
+    assert registry.market_ids == [MARKET1, MARKET2]
+    ids = backtester.market_data[MARKET_ID_COLUMN]
+    expected = [registry.to_id((tt, exp)) for tt, exp in zip(backtester.market_data['TargetTime'], backtester.market_data['Expiration'])]
+    assert ids.tolist() == expected
+    assert set(backtester.market_outcomes) == {0, 1}
+    assert backtester.market_outcomes[0]['WinningSide'] == 'Up'
+    assert 1 in backtester.price_index
+    backtester.close()
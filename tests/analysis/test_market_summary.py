@@ -0,0 +1,47 @@
+import os
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.analysis.market_summary import load_market_summaries, market_stats, overall_stats
+from src.analysis.outcomes import build_outcome_table
+from src.storage.market_store import read_market_csv
+from src.storage.summary_store import build_summary, load_market_summary
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def test_summary_matches_grouped_ticks():
+    df = read_market_csv(TEST_DATA_FILE)
+    summary = market_stats(build_summary(df))
+    df['PairCost'] = df['UpAsk'] + df['DownAsk']
+    groups = df.groupby(['TargetTime', 'Expiration'])
+
+    assert summary['Ticks'].tolist() == groups.size().tolist()
+    np.testing.assert_allclose(summary['PairCostMean'], groups['PairCost'].mean())
+    np.testing.assert_allclose(summary['PairCostStd'], groups['PairCost'].std())
+    assert summary['PairCostMax'].tolist() == groups['PairCost'].max().tolist()
+    assert summary['OpenPairCost'].tolist() == groups['PairCost'].first().tolist()
+    assert summary['ClosePairCost'].tolist() == groups['PairCost'].last().tolist()
+    assert summary['WinningSide'].tolist() == build_outcome_table(df)['WinningSide'].tolist()
+    # The test data has no spreads
+    assert summary['SpreadTotalSum'].isna().all()
+
+    stats = overall_stats(summary, 'UpAsk')
+    assert stats['min'] == df['UpAsk'].min() and stats['max'] == df['UpAsk'].max()
+    assert np.isclose(stats['mean'], df['UpAsk'].mean()) and np.isclose(stats['std'], df['UpAsk'].std())
+
+
+def test_summary_sidecar_is_cached_and_merged_across_days(tmp_path, monkeypatch):
+    df = pd.read_csv(TEST_DATA_FILE)
+    first_day, second_day = tmp_path / 'market_data_20251226.csv', tmp_path / 'market_data_20251227.csv'
+    df.iloc[:5].to_csv(first_day, index=False)
+    df.iloc[5:].to_csv(second_day, index=False)  # the rest of the 11:00 market
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+
+    summary = load_market_summary(str(first_day))
+    assert os.path.exists(config.get_sidecar_filename(str(first_day), 'summary'))
+    pd.testing.assert_frame_equal(load_market_summary(str(first_day)), summary, check_dtype=False)
+
+    expected = build_summary(read_market_csv(TEST_DATA_FILE))
+    pd.testing.assert_frame_equal(load_market_summaries(), expected, check_dtype=False)
+    assert load_market_summaries(20251227)['Ticks'].tolist() == [len(df) - 5]
@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+from src.analysis.outcomes import build_outcome_table, load_outcome_table, outcomes_by_market
+from src.market_frames import winning_sides
+import src.config as config
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def test_winning_sides_rules():
+    sides = winning_sides([0.0, 0.4, 0.3, 0.7, 0.5], [0.6, 0.0, 0.7, 0.3, 0.5])
+    assert list(sides) == ['Up', 'Down', 'Down', 'Up', 'Up']
+
+
+def test_build_outcome_table_uses_last_row_per_market():
+    table = build_outcome_table(pd.read_csv(TEST_DATA_FILE))
+    outcomes = outcomes_by_market(table)
+
+    market1_id = (pd.Timestamp('2025-12-26 10:45:00', tz='UTC'), pd.Timestamp('2025-12-26 10:45:00', tz='UTC'))
+    market2_id = (pd.Timestamp('2025-12-26 11:00:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00:00', tz='UTC'))
+    assert len(outcomes) == 2
+    assert outcomes[market1_id]['WinningSide'] == 'Up'
+    assert outcomes[market2_id]['WinningSide'] == 'Down'
+    assert outcomes[market1_id]['ResolutionTimestamp'] == pd.Timestamp('2025-12-26 10:45:00', tz='UTC')
+
+
+def test_outcome_table_is_cached_and_refreshed(tmp_path):
+    data_file = tmp_path / 'market_data_20251226.csv'
+    df = pd.read_csv(TEST_DATA_FILE)
+    df.to_csv(data_file, index=False)
+
+    table = load_outcome_table(str(data_file))
+    cache_file = config.get_sidecar_filename(str(data_file), 'outcomes')
+    assert os.path.exists(cache_file)
+    pd.testing.assert_frame_equal(load_outcome_table(str(data_file)), table, check_dtype=False)
+
+    # Appending data makes the data file newer than the cache, forcing a rebuild
+    extra = df.iloc[[-1]].copy()
+    extra['Timestamp'] = '2025-12-26 11:00:01'
+    extra['UpAsk'], extra['DownAsk'] = 0.0, 0.99
+    extra.to_csv(data_file, mode='a', header=False, index=False)
+    os.utime(data_file, (os.path.getmtime(cache_file) + 1,) * 2)
+
+    refreshed = outcomes_by_market(load_outcome_table(str(data_file)))
+    market2_id = (pd.Timestamp('2025-12-26 11:00:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00:00', tz='UTC'))
+    assert refreshed[market2_id]['WinningSide'] == 'Up'
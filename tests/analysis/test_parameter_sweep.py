@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+from src.analysis.backtester import Backtester
+from src.analysis.columnar import ColumnarFrame
+from src.analysis.parameter_sweep import (
+    expand_grid, parse_param_arguments, read_shared_market_data, run_sweep, write_shared_market_data
+)
+from src.analysis.strategies.base_strategy import Strategy
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+class ThresholdStrategy(Strategy):
+    """Buys `quantity` Up shares whenever the Up ask is at or below `max_price`."""
+    def __init__(self, max_price=0.5, quantity=10):
+        self.max_price = max_price
+        self.quantity = quantity
+
+    def decide(self, data_point, capital):
+        if 0 < data_point['UpAsk'] <= self.max_price:
+            return ('Up', self.quantity, data_point['UpAsk'], 0)
+        return None
+
+
+STRATEGY_SPEC = f"{__name__}:ThresholdStrategy"
+
+
+def test_expand_grid_and_parse_params():
+    grid = parse_param_arguments(['margin=0.01,0.02', 'label=fast'])
+    assert grid == {'margin': [0.01, 0.02], 'label': ['fast']}
+    assert expand_grid(grid) == [{'margin': 0.01, 'label': 'fast'}, {'margin': 0.02, 'label': 'fast'}]
+    with pytest.raises(ValueError):
+        parse_param_arguments(['margin'])
+
+
+def test_shared_market_data_round_trip(tmp_path):
+    backtester = Backtester()
+    backtester.load_data(TEST_DATA_FILE)
+    df = backtester.market_data
+
+    write_shared_market_data(df, str(tmp_path))
+    restored = read_shared_market_data(str(tmp_path))
+    pd.testing.assert_frame_equal(restored, df.reset_index(drop=True))
+
+    # Row values index the mapped columns in place and match a regular frame
+    shared, regular = ColumnarFrame(restored), ColumnarFrame(df)
+    assert isinstance(shared.values['UpAsk'], memoryview)
+    for index in range(len(df)):
+        assert shared.row(index).to_dict() == regular.row(index).to_dict()
+        assert type(shared.row(index)['UpAsk']) is float
+
+
+def test_sweep_matches_direct_backtests():
+    param_grid = {'max_price': [0.45, 0.55], 'quantity': [10, 20]}
+    results = run_sweep(TEST_DATA_FILE, STRATEGY_SPEC, param_grid, workers=1)
+
+    assert len(results) == 4
+    assert list(results['TotalPnL']) == sorted(results['TotalPnL'], reverse=True)
+    for params in expand_grid(param_grid):
+        backtester = Backtester()
+        backtester.load_data(TEST_DATA_FILE)
+        backtester.run_strategy(ThresholdStrategy(**params))
+        summary = backtester.get_summary()
+
+        row = results[(results['max_price'] == params['max_price']) &
+                      (results['quantity'] == params['quantity'])].iloc[0]
+        assert row['TotalPnL'] == pytest.approx(summary['TotalPnL'])
+        assert row['NumTrades'] == summary['NumTrades']
+
+
+def test_reset_clears_run_state():
+    backtester = Backtester()
+    backtester.load_data(TEST_DATA_FILE)
+    backtester.run_strategy(ThresholdStrategy())
+    first = backtester.get_summary()
+
+    backtester.reset()
+    assert backtester.capital == backtester.initial_capital
+    assert backtester.transactions == [] and len(backtester.position_book) == 0
+    backtester.run_strategy(ThresholdStrategy())
+    assert first['NumTrades'] > 0
+    assert backtester.get_summary() == first
@@ -0,0 +1,45 @@
+import pandas as pd
+from src.analysis.position_book import PositionBook
+
+EARLY = pd.Timestamp('2025-12-26 10:45:00', tz='UTC')
+LATE = pd.Timestamp('2025-12-26 11:00:00', tz='UTC')
+
+
+def test_lots_are_netted_per_market_and_side():
+    book = PositionBook()
+    for _ in range(1000):
+        book.add('m1', 'Up', 2, 0.4, EARLY)
+    book.add('m1', 'Down', 5, 0.5, EARLY)
+
+    assert len(book) == 1
+    aggregates = {p['side']: p for p in book.positions()}
+    assert aggregates['Up']['quantity'] == 2000
+    assert aggregates['Up']['lots'] == 1000
+    assert round(aggregates['Up']['cost'], 6) == 800.0
+    assert aggregates['Down']['loss_pnl'] == -2.5
+
+
+def test_pop_expired_returns_markets_in_expiration_order():
+    book = PositionBook()
+    book.add('late', 'Up', 1, 0.5, LATE)
+    book.add('early', 'Down', 1, 0.5, EARLY)
+
+    assert book.next_expiration() == EARLY
+    assert book.pop_expired(EARLY - pd.Timedelta(seconds=1)) == []
+
+    expired = book.pop_expired(EARLY)
+    assert [market_id for market_id, _ in expired] == ['early']
+    assert 'late' in book
+    assert [market_id for market_id, _ in book.pop_all()] == ['late']
+    assert len(book) == 0
+
+
+def test_lots_with_positive_pnl_are_counted_per_outcome():
+    book = PositionBook()
+    book.add('m1', 'Up', 2, 0.4, EARLY)
+    book.add('m1', 'Up', 3, 1.0, EARLY)  # No profit even if Up wins
+
+    aggregate = book.positions()[0]
+    assert aggregate['lots'] == 2
+    assert aggregate['winning_lots_if_won'] == 1
+    assert aggregate['winning_lots_if_lost'] == 0
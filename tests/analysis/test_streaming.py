@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import src.config as config
+from src.analysis.backtester import Backtester
+from src.analysis.streaming import MarketDataStream
+from src.analysis.strategies.base_strategy import Strategy
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+class BuyEveryRowStrategy(Strategy):
+    def decide(self, data_point, capital):
+        if data_point['UpAsk'] < 0.6:
+            return ('Up', 1, data_point['UpAsk'], 0)
+        return ('Down', 1, data_point['DownAsk'], 0)
+
+
+def _split_test_data(tmp_path, split_row):
+    """Writes the test data as two daily files, cutting the second market in half."""
+    df = pd.read_csv(TEST_DATA_FILE)
+    first, second = tmp_path / 'market_data_20251226.csv', tmp_path / 'market_data_20251227.csv'
+    df.iloc[:split_row].to_csv(first, index=False)
+    df.iloc[split_row:].to_csv(second, index=False)
+    return [str(first), str(second)]
+
+
+def test_get_data_files_filters_by_date(tmp_path, monkeypatch):
+    for date in ['20251225', '20251226', '20251227']:
+        (tmp_path / f'market_data_{date}.csv').write_text('')
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+
+    names = lambda files: [f[-12:-4] for f in files]
+    assert names(config.get_data_files()) == ['20251225', '20251226', '20251227']
+    assert names(config.get_data_files(20251226)) == ['20251226', '20251227']
+    assert names(config.get_data_files('20251225', '20251226')) == ['20251225', '20251226']
+
+
+def test_stream_across_files_matches_full_load(tmp_path):
+    data_files = _split_test_data(tmp_path, split_row=5)
+
+    full = Backtester(initial_capital=100, slippage_seconds=2, log_mode='off')
+    full.load_data(TEST_DATA_FILE)
+    full.run_strategy(BuyEveryRowStrategy())
+
+    streamed = Backtester(initial_capital=100, slippage_seconds=2, log_mode='off')
+    streamed.run_stream(BuyEveryRowStrategy(), data_files, chunk_rows=2, lookahead_seconds=5)
+
+    assert streamed.capital == full.capital
+    assert streamed.transactions == full.transactions
+    assert streamed.portfolio_history == full.portfolio_history
+
+
+def test_stream_releases_resolved_markets(tmp_path):
+    data_files = _split_test_data(tmp_path, split_row=5)
+    stream = MarketDataStream(data_files, chunk_rows=2, lookahead_seconds=5)
+
+    open_markets = []
+    for window in stream.windows():
+        open_markets.append(len(window.buffered.groupby(['TargetTime', 'Expiration'])))
+    assert max(open_markets) <= 2
+    # Both markets expired by the last tick, so nothing is left behind
+    assert stream.outcomes == {}
+    assert len(stream._history) == 0
+
+
+def test_stream_keeps_load_data_order_for_same_second_ticks(tmp_path):
+    # Many ticks per second, shuffled within each second, so ties are only ordered by file position
+    df = pd.concat([pd.read_csv(TEST_DATA_FILE)] * 20, ignore_index=True).sample(frac=1, random_state=0)
+    df = df.sort_values('Timestamp', kind='stable')
+    df['UpBid'] = np.arange(len(df)) / 1000  # tells the copies apart
+    data_file = tmp_path / 'market_data_20251226.csv'
+    df.to_csv(data_file, index=False)
+
+    backtester = Backtester(log_mode='off')
+    backtester.load_data(str(data_file))
+    stream = MarketDataStream([str(data_file)], chunk_rows=7, lookahead_seconds=0)
+    streamed = pd.concat([window.rows for window in stream.windows()], ignore_index=True)
+
+    assert streamed['UpBid'].tolist() == backtester.market_data['UpBid'].tolist()
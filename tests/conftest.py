@@ -0,0 +1,10 @@
+import pytest
+import src.config as config
+
+
+@pytest.fixture(autouse=True)
+def backtest_log_dir(tmp_path, monkeypatch):
+    """Keeps Backtester run logs out of the repository's logs/ directory."""
+    log_dir = tmp_path / 'logs'
+    monkeypatch.setattr(config, 'BACKTEST_LOG_DIR', str(log_dir))
+    return log_dir
@@ -0,0 +1,27 @@
+import os
+import pandas as pd
+import src.config as config
+from src.data_collection import data_logger
+from src.storage.market_store import read_market_csv
+from src.storage.summary_store import build_summary, load_market_summary, read_summary_file
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def test_summary_sidecar_follows_flushed_batches(tmp_path, monkeypatch):
+    df = pd.read_csv(TEST_DATA_FILE).reindex(columns=config.MARKET_DATA_COLUMNS)
+    data_file = str(tmp_path / 'market_data_20251226.csv')
+    summary_file = config.get_sidecar_filename(data_file, 'summary')
+    monkeypatch.setattr(data_logger, 'DATA_FILE', data_file)
+    df.iloc[:0].to_csv(data_file, index=False)
+    markets = data_logger.market_keys(load_market_summary(data_file))
+
+    for start in range(0, len(df), 3):
+        batch = df.iloc[start:start + 3]
+        batch.to_csv(data_file, mode='a', header=False, index=False)
+        markets = data_logger.update_summary(batch.values.tolist(), markets)
+        assert os.path.getmtime(summary_file) >= os.path.getmtime(data_file)
+
+    expected = build_summary(read_market_csv(data_file))
+    assert markets == data_logger.market_keys(expected)
+    pd.testing.assert_frame_equal(read_summary_file(summary_file), expected, check_dtype=False)
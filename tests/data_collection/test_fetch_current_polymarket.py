@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock, patch
+import src.data_collection.fetch_current_polymarket as fetch
+
+UP_BOOK = {'asset_id': 'up', 'bids': [{'price': '0.48', 'size': '10'}], 'asks': [{'price': '0.50', 'size': '20'}]}
+DOWN_BOOK = {'asset_id': 'down', 'bids': [{'price': '0.49', 'size': '5'}], 'asks': [{'price': '0.52', 'size': '7'}]}
+
+
+def make_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+@patch("src.data_collection.http_client.get")
+@patch("src.data_collection.http_client.post")
+def test_books_come_from_one_multi_book_request(mock_post, mock_get, monkeypatch):
+    monkeypatch.setattr(fetch, '_multi_book_supported', True)
+    mock_post.return_value = make_response([DOWN_BOOK, UP_BOOK])
+
+    books = fetch.get_clob_books(['up', 'down'])
+    assert mock_post.call_count == 1 and mock_get.call_count == 0
+    assert books['up']['best_ask'] == 0.50 and books['down']['best_bid'] == 0.49
+    # One response: both sides share the same snapshot times
+    assert books['up']['received_at'] == books['down']['received_at']
+    assert books['up']['sent_at'] <= books['up']['received_at']
+
+
+@patch("src.data_collection.http_client.get")
+@patch("src.data_collection.http_client.post")
+def test_falls_back_to_parallel_single_book_requests(mock_post, mock_get, monkeypatch):
+    monkeypatch.setattr(fetch, '_multi_book_supported', True)
+    mock_post.return_value = make_response(None, status_code=404)
+    mock_get.side_effect = lambda url, params: make_response(UP_BOOK if params['token_id'] == 'up' else DOWN_BOOK)
+
+    books = fetch.get_clob_books(['up', 'down'])
+    assert books['up']['ask_liquidity'] == 20.0 and books['down']['spread'] == 0.52 - 0.49
+    assert books['up']['received_at'] is not None and books['down']['received_at'] is not None
+    # The multi-book endpoint is not tried again
+    fetch.get_clob_books(['up', 'down'])
+    assert mock_post.call_count == 1 and mock_get.call_count == 4
+
+
+def test_parse_order_book_matches_full_sort():
+    levels = [{'price': f'{p / 100:.2f}', 'size': f'{(p * 37) % 101 + 0.5}'} for p in range(1, 99)]
+    book = fetch.parse_order_book({'bids': levels[:50][::-1], 'asks': levels[50:]}, depth=10)
+    bids = sorted(((float(l['price']), float(l['size'])) for l in levels[:50]), reverse=True)
+    asks = sorted((float(l['price']), float(l['size'])) for l in levels[50:])
+    assert (book['best_bid'], book['best_ask']) == (bids[0][0], asks[0][0])
+    assert book['bid_liquidity'] == sum(size for _, size in bids[:5])
+    assert book['ask_liquidity'] == sum(size for _, size in asks[:5])
+    assert book['bids'] == bids[:10] and book['asks'] == asks[:10]
+    assert 'bids' not in fetch.parse_order_book({'bids': levels[:50], 'asks': []})
@@ -0,0 +1,59 @@
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+import requests
+from src.data_collection.http_client import HttpClient, LatencyHistogram, TokenBucket
+
+
+def make_response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    return response
+
+
+def test_retries_transient_failures_and_records_latency():
+    client = HttpClient(max_retries=2, backoff_seconds=0, rate_limit=0)
+    session = client.session('clob.example.com')
+    session.request = MagicMock(side_effect=[requests.ConnectionError(), make_response(503), make_response(200)])
+
+    response = client.get('https://clob.example.com/book', params={'token_id': '1'})
+    assert response.status_code == 200
+    assert session.request.call_count == 3
+    stats = client.latency_report()['clob.example.com/book']
+    assert stats['count'] == 3 and stats['errors'] == 2
+
+    # Out of retries: the last error response is returned, the last connection error raised
+    session.request = MagicMock(return_value=make_response(503))
+    assert client.get('https://clob.example.com/book').status_code == 503
+    assert session.request.call_count == 3
+    session.request = MagicMock(side_effect=requests.Timeout())
+    with pytest.raises(requests.Timeout):
+        client.get('https://clob.example.com/book')
+
+
+def test_sessions_are_per_thread_and_host():
+    client = HttpClient(rate_limit=0)
+    assert client.session('a.example.com') is client.session('a.example.com')
+    assert client.session('a.example.com') is not client.session('b.example.com')
+    other = []
+    thread = threading.Thread(target=lambda: other.append(client.session('a.example.com')))
+    thread.start()
+    thread.join()
+    assert other[0] is not client.session('a.example.com')
+
+
+def test_token_bucket_and_histogram():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        bucket.acquire()
+    # 5 tokens from the full bucket, then 5 more at 50 per second
+    assert time.monotonic() - start >= 0.09
+
+    histogram = LatencyHistogram()
+    for ms in [5, 20, 20, 40, 400]:
+        histogram.record(ms / 1000)
+    assert histogram.percentile(0.5) == 25
+    assert histogram.summary()['max_ms'] == pytest.approx(400)
@@ -0,0 +1,49 @@
+import datetime
+import threading
+import time
+from unittest.mock import patch
+import src.data_collection.fetch_current_polymarket as fetch
+from src.data_collection.fetch_current_polymarket import MarketTokenCache
+from src.data_collection.market_rollover import prewarm_markets, upcoming_market_slugs
+
+NOW = datetime.datetime(2025, 12, 26, 10, 44, 30, tzinfo=datetime.timezone.utc)
+
+
+def test_concurrent_misses_share_one_lookup():
+    cache = MarketTokenCache(max_entries=2)
+    calls = []
+
+    def slow_lookup(slug):
+        calls.append(slug)
+        time.sleep(0.05)
+        return [f'{slug}-up', f'{slug}-down'], ['Up', 'Down'], None
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_lookup('a', slow_lookup))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['a']
+    assert results == [(['a-up', 'a-down'], ['Up', 'Down'], None)] * 8
+
+    # Failures are not cached; the oldest entry is evicted
+    assert cache.get_or_lookup('b', lambda slug: (None, None, "Event not found"))[2] == "Event not found"
+    cache.get_or_lookup('b', slow_lookup)
+    cache.get_or_lookup('c', slow_lookup)
+    assert calls == ['a', 'b', 'c'] and cache.get('a') is None
+
+
+def test_prewarmed_markets_need_no_lookup_at_rollover(monkeypatch):
+    monkeypatch.setattr(fetch, 'market_token_cache', MarketTokenCache())
+    # The 10:30 market is running: the 10:45 and 11:00 markets come next (slugs use start times)
+    assert upcoming_market_slugs(2, NOW) == ['btc-updown-15m-1766745900', 'btc-updown-15m-1766746800']
+
+    lookup = lambda slug: ([f'{slug}-up', f'{slug}-down'], ['Up', 'Down'], None)
+    with patch.object(fetch, 'lookup_market_tokens', side_effect=lookup) as mock_lookup:
+        with patch('src.data_collection.market_rollover.market_token_cache', fetch.market_token_cache):
+            assert prewarm_markets(2, NOW) == upcoming_market_slugs(2, NOW)
+        assert mock_lookup.call_count == 2
+        token_ids, outcomes, err = fetch.get_market_tokens('btc-updown-15m-1766745900')
+        assert err is None and token_ids == ['btc-updown-15m-1766745900-up', 'btc-updown-15m-1766745900-down']
+        assert mock_lookup.call_count == 2
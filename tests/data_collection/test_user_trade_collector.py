@@ -48,7 +48,7 @@ class TestUserTradeCollector(unittest.TestCase):
         slug_map = get_slugs_for_date("20251230")
         self.assertEqual(len(slug_map), 1)
 
-    @patch("requests.get")
+    @patch("src.data_collection.http_client.get")
     def test_get_market_details_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = [self.mock_market_details_response]
@@ -56,7 +56,7 @@ class TestUserTradeCollector(unittest.TestCase):
         details = get_market_details("test-slug")
         self.assertEqual(details["eventId"], "test-event-id")
 
-    @patch("requests.get")
+    @patch("src.data_collection.http_client.get")
     def test_get_user_activity_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = self.mock_user_activity_response
@@ -99,7 +99,7 @@ class TestUserTradeCollector(unittest.TestCase):
         self.assertEqual(constructor_call_args[0]["trade_side"], "Up")
         self.assertEqual(constructor_call_args[0]["quantity"], 100.0)
 
-    @patch("requests.get")
+    @patch("src.data_collection.http_client.get")
     def test_get_user_activity_pagination(self, mock_get):
         """Test that get_user_activity handles pagination and sorting correctly."""
         # Create a mock response for a full page
@@ -138,7 +138,7 @@ class TestUserTradeCollector(unittest.TestCase):
         self.assertEqual(activities[1]["timestamp"], 1)
         self.assertEqual(activities[501]["timestamp"], 502) # The one with timestamp 502 should be last
 
-    @patch("requests.get")
+    @patch("src.data_collection.http_client.get")
     def test_get_user_activity_merging_duplicates(self, mock_get):
         """Test that get_user_activity correctly merges duplicates by summing their 'size'."""
         # Page 1 with a trade, 500 times
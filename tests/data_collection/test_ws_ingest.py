@@ -0,0 +1,75 @@
+import asyncio
+import datetime
+import queue
+import pytest
+from src.data_collection import ws_ingest
+from src.data_collection.data_logger import latest_per_second
+from src.data_collection.fetch_current_polymarket import parse_order_book
+from src.data_collection.ws_ingest import OrderBook, stream_market
+from src.data_collection.ws_replay import ReplayServer, load_recording
+
+RECORDING_FILE = 'tests/data/ws_market_messages.jsonl'
+MARKET_INFO = {'slug': 'btc-updown-15m-test', 'target_time_utc': None, 'expiration_time_utc': None}
+
+
+def test_book_summary_matches_rest_parsing():
+    levels = {'bids': [{'price': f'0.{40 + i}', 'size': f'{10 + i}'} for i in range(8)],
+              'asks': [{'price': f'0.{50 + i}', 'size': f'{20 + i}'} for i in range(8)]}
+    book = OrderBook()
+    book.apply_change('BUY', '0.3', '5')  # ignored until the first snapshot
+    book.apply_snapshot(levels['bids'], levels['asks'])
+    assert book.summary() == parse_order_book(levels)
+
+    book.apply_change('SELL', '0.5', '0')
+    book.apply_change('BUY', '0.47', '4')
+    levels['asks'] = levels['asks'][1:]
+    levels['bids'][-1]['size'] = '4'
+    assert book.summary() == parse_order_book(levels)
+
+
+def test_replayed_channel_emits_a_row_per_book_change():
+    rows = queue.Queue()
+    with ReplayServer(load_recording(RECORDING_FILE)) as server:
+        emitted = asyncio.run(stream_market(server.url, MARKET_INFO, ['up', 'down'], ['Up', 'Down'], rows.put))
+    assert server.subscriptions == [{'assets_ids': ['up', 'down'], 'type': 'market'}]
+
+    # Snapshot, first change; a trade and an unchanged level emit nothing; the emptied Down bids
+    assert emitted == rows.qsize() == 3
+    books = [rows.get()[1]['order_books'] for _ in range(emitted)]
+    assert (books[0]['Up']['best_bid'], books[0]['Down']['best_ask']) == (0.48, 0.52)
+    assert books[1]['Up']['best_bid'] == 0.49 and books[1]['Up']['bid_liquidity'] == 175
+    assert books[1]['Down']['best_ask'] == 0.53 and books[1]['Down']['ask_liquidity'] == 30
+    assert books[2]['Down']['best_bid'] == 0.0 and books[2]['Down']['mid_price'] == 0.0
+    # Each side keeps the server and arrival times of its own last update
+    assert books[2]['Up']['sent_at'] < books[2]['Down']['sent_at']
+    assert books[2]['Up']['received_at'] <= books[2]['Down']['received_at']
+
+
+def test_market_lookup_errors_are_retried(monkeypatch):
+    lookups = []
+
+    def get_current_market_urls():
+        lookups.append(1)
+        if len(lookups) == 1:
+            raise ConnectionError("Gamma API timed out")
+        raise KeyboardInterrupt  # ends the test once the lookup was retried
+
+    sleeps = []
+    monkeypatch.setattr(ws_ingest, 'get_current_market_urls', get_current_market_urls)
+    monkeypatch.setattr(ws_ingest.time, 'sleep', sleeps.append)
+    with pytest.raises(KeyboardInterrupt):
+        ws_ingest.run_ingest(lambda item: None)
+    assert len(lookups) == 2 and sleeps == [1]
+
+
+def test_websocket_rows_collapse_to_one_per_market_and_second():
+    start = datetime.datetime(2025, 12, 26, 10, 30, 0, tzinfo=datetime.timezone.utc)
+    market = {'target_time_utc': start, 'expiration_time_utc': start + datetime.timedelta(minutes=15)}
+    at = lambda seconds: start + datetime.timedelta(seconds=seconds)
+    batch = [(at(1.7), dict(market, n=2)), (at(1.2), dict(market, n=1)), (at(2.1), dict(market, n=3)),
+             (at(3.4), dict(market, n=4))]
+
+    ready, held_back = latest_per_second(batch, now=at(3.9))
+    assert [data['n'] for _, data in ready] == [2, 3]
+    # The current second may still get updates, so it waits for the next flush
+    assert [data['n'] for _, data in held_back] == [4]
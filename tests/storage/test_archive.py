@@ -0,0 +1,59 @@
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+import src.config as config
+from src.storage.archive import ArchiveFile, write_archive
+from src.storage.market_store import convert_data_file, iter_market_data_chunks, load_market_data, load_market_rows, read_market_csv
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+SECOND_MARKET = (pd.Timestamp('2025-12-26 11:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00', tz='UTC'))
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'market_data_20251226.csv'
+    shutil.copy(TEST_DATA_FILE, path)
+    return str(path)
+
+
+@pytest.mark.parametrize('compression', ['lzma', 'gzip'])
+def test_archive_round_trips_exactly(data_file, tmp_path, compression):
+    expected = read_market_csv(data_file)
+    expected.loc[2, 'UpAsk'] = 1 / 3  # not a 3-decimal price: stored as raw float64
+    archive = ArchiveFile(write_archive(expected, str(tmp_path / 'day.archive'), block_rows=3, compression=compression))
+
+    assert len(archive) == len(expected) and len(archive.blocks) == 3
+    assert [spec['kind'] for spec in archive.column_specs][:4] == ['time', 'time', 'time', 'float']
+    pd.testing.assert_frame_equal(archive.to_frame(), expected)
+    pd.testing.assert_frame_equal(archive.to_frame(['DownBid', 'Timestamp'], start=2, stop=5),
+                                  expected[['DownBid', 'Timestamp']].iloc[2:5].reset_index(drop=True))
+
+
+def test_queries_only_read_the_blocks_they_touch(data_file, tmp_path):
+    expected = read_market_csv(data_file)
+    archive = ArchiveFile(write_archive(expected, str(tmp_path / 'day.archive'), block_rows=3))
+
+    # Rows 4-6 hold the second market
+    assert archive.blocks_for(markets=[SECOND_MARKET]) == [1, 2]
+    market = pd.concat(archive.iter_chunks(['Timestamp', 'UpAsk'], markets=[SECOND_MARKET]), ignore_index=True)
+    pd.testing.assert_frame_equal(market, expected[['Timestamp', 'UpAsk']].iloc[4:].reset_index(drop=True))
+
+    start, end = expected['Timestamp'].iloc[1], expected['Timestamp'].iloc[3]
+    assert archive.blocks_for(start, end) == [0]
+    window = pd.concat(archive.iter_chunks(start=start, end=end), ignore_index=True)
+    pd.testing.assert_frame_equal(window, expected[(expected['Timestamp'] >= start) & (expected['Timestamp'] < end)].reset_index(drop=True))
+
+
+def test_loaders_read_archive_store(data_file, monkeypatch):
+    expected = read_market_csv(data_file)
+    monkeypatch.setattr(config, 'ARCHIVE_BLOCK_ROWS', 3)
+    convert_data_file(data_file, 'archive')
+
+    pd.testing.assert_frame_equal(load_market_data(data_file), expected)
+    chunks = list(iter_market_data_chunks(data_file, chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1, 2, 1, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    rows = load_market_rows(data_file, [(1, 2, -1, -1), (4, 7, -1, -1)], ['UpBid'])
+    assert rows['UpBid'].tolist() == expected['UpBid'].iloc[[1, 4, 5, 6]].tolist()
+    assert np.issubdtype(rows['UpBid'].dtype, np.floating)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from src.analysis.preprocessing import preprocess_base_features
+from src.market_frames import compact_frame, float64_values, is_compact, widen_frame
+from src.storage.compact import memory_report, parse_timestamps
+from src.storage.market_store import load_market_data
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def test_parse_timestamps_matches_pandas():
+    raw = pd.read_csv(TEST_DATA_FILE)
+    for col in ['Timestamp', 'TargetTime', 'Expiration']:
+        pd.testing.assert_series_equal(parse_timestamps(raw[col]), pd.to_datetime(raw[col], utc=True))
+
+
+def test_compact_profile_narrows_and_restores_prices():
+    expected = load_market_data(TEST_DATA_FILE)
+    df = load_market_data(TEST_DATA_FILE, profile='compact')
+    assert is_compact(df) and not is_compact(expected)
+    assert df['UpAsk'].dtype == np.float32
+    assert isinstance(df['TargetTime'].dtype, pd.CategoricalDtype)
+    assert df['Timestamp'].dtype == expected['Timestamp'].dtype
+
+    # float32 prices round back to the logged values exactly
+    for col in ['UpAsk', 'UpBid', 'DownAsk', 'DownBid']:
+        assert (float64_values(df[col]) == expected[col].to_numpy()).all(), col
+    pd.testing.assert_frame_equal(widen_frame(df), expected)
+
+
+def test_features_are_computed_exactly_then_narrowed():
+    default = load_market_data(TEST_DATA_FILE)
+    default['UpMid'] = (default['UpAsk'] + default['UpBid']) / 2
+    default['DownMid'] = (default['DownAsk'] + default['DownBid']) / 2
+    default['UpBidLiquidity'] = default['DownBidLiquidity'] = 100.0
+    compact = compact_frame(default.copy())
+
+    expected = preprocess_base_features(default)
+    features = preprocess_base_features(compact)
+    assert features['MinuteFromStart'].dtype == np.int8
+    assert features['UpMidDelta'].dtype == np.float32
+    assert features['SharpEvent'].tolist() == expected['SharpEvent'].tolist()
+    assert features['MinuteFromStart'].tolist() == expected['MinuteFromStart'].tolist()
+    np.testing.assert_allclose(features['UpMidDelta'], expected['UpMidDelta'], rtol=1e-6)
+
+
+def test_memory_report_compares_totals():
+    default = load_market_data(TEST_DATA_FILE)
+    report = memory_report(default, compact_frame(default.copy()))
+    assert 'UpAsk' in report and 'float32' in report
+    assert report.splitlines()[-1].startswith('Total')
@@ -0,0 +1,59 @@
+import datetime
+import pandas as pd
+from src.analysis.backtester import Backtester
+from src.analysis.strategies.rebalancing_strategy import RebalancingStrategy
+from src.storage.compaction import compact_data_file, compact_ticks, encode_runs, expand_ticks
+from src.storage.market_index import build_file_index
+from src.storage.market_store import iter_market_data_chunks, load_market_rows, read_market_csv
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def _with_repeats(df):
+    """The test data with a 3-tick unchanged run, an exact duplicate and a repeat after a 2s gap."""
+    one_second = pd.Timedelta(seconds=1)
+    row = df.iloc[[0]]
+    extra = pd.concat([row.assign(Timestamp=row['Timestamp'] + k * one_second) for k in [1, 2, 2, 4]])
+    return pd.concat([row, extra, df.iloc[1:]], ignore_index=True)
+
+
+def test_compact_ticks_round_trips():
+    df = _with_repeats(read_market_csv(TEST_DATA_FILE))
+    runs = compact_ticks(df)
+    assert runs['Count'].iloc[:3].tolist() == [3, 1, 1]
+    assert len(runs) == len(df) - 2
+    pd.testing.assert_frame_equal(expand_ticks(runs), df)
+
+
+def test_compacted_file_loads_like_original(tmp_path):
+    data_file = str(tmp_path / 'market_data_20250101.csv')
+    df = _with_repeats(read_market_csv(TEST_DATA_FILE))
+    df.assign(**{col: df[col].dt.strftime('%Y-%m-%d %H:%M:%S') for col in ['Timestamp', 'TargetTime', 'Expiration']}).to_csv(data_file, index=False)
+    expected = read_market_csv(data_file)
+
+    assert compact_data_file(data_file) == (len(df), len(df) - 2)
+    pd.testing.assert_frame_equal(read_market_csv(data_file), expected)
+    pd.testing.assert_frame_equal(pd.concat(iter_market_data_chunks(data_file, chunk_rows=2), ignore_index=True), expected)
+
+    entry = build_file_index(data_file).iloc[0]
+    assert entry['ByteStart'] == -1
+    rows = load_market_rows(data_file, [(entry['RowStart'], entry['RowStop'], -1, -1)], ['Timestamp', 'UpAsk'])
+    pd.testing.assert_frame_equal(rows, expected[['Timestamp', 'UpAsk']].iloc[entry['RowStart']:entry['RowStop']].reset_index(drop=True))
+
+    # A backtest sees the same ticks
+    results = []
+    for market_data in [expected, read_market_csv(data_file)]:
+        backtester = Backtester()
+        backtester.set_market_data(market_data)
+        backtester.run_strategy(RebalancingStrategy())
+        results.append((backtester.capital, backtester.transactions))
+    assert results[0] == results[1]
+
+
+def test_encode_runs_matches_compact_ticks():
+    start = datetime.datetime(2025, 1, 1, 10, 0, 0)
+    second = datetime.timedelta(seconds=1)
+    rows = [[start, 'm', 0.5], [start, 'm', 0.5], [start + second, 'm', 0.5], [start + 2 * second, 'm', 0.5], [start + 3 * second, 'm', 0.6]]
+    runs = encode_runs(rows)
+    assert [run[-1] for run in runs] == [2, 2, None]
+    assert runs[0][-2] == start and runs[1][-2] == start + 2 * second
@@ -0,0 +1,58 @@
+import os
+import random
+import pandas as pd
+from src.storage.depth_store import DepthReader, DepthWriter
+
+TARGET_TIME = pd.Timestamp('2025-12-26 10:30:00', tz='UTC')
+EXPIRATION = pd.Timestamp('2025-12-26 10:45:00', tz='UTC')
+START = pd.Timestamp('2025-12-26 10:34:14', tz='UTC')
+
+
+def random_books(n, seed=0):
+    """n captures of a slowly changing book: ({price: size} bids, asks) per capture."""
+    rng = random.Random(seed)
+    bids = {round(0.40 + i / 100, 2): float(rng.randint(1, 500)) for i in range(10)}
+    asks = {round(0.51 + i / 100, 2): round(rng.uniform(1, 500), 2) for i in range(10)}
+    books = []
+    for _ in range(n):
+        for side in (bids, asks):
+            for _ in range(rng.randint(0, 3)):
+                price = rng.choice(sorted(side))
+                if rng.random() < 0.2 and len(side) > 3:
+                    del side[price]
+                else:
+                    side[price] = round(rng.uniform(0, 800), 2) or 1.0
+        books.append((dict(bids), dict(asks)))
+    return books
+
+
+def expected_levels(bids, asks, levels):
+    return sorted(bids.items(), reverse=True)[:levels], sorted(asks.items())[:levels]
+
+
+def test_reader_rebuilds_every_capture(tmp_path):
+    path = str(tmp_path / 'depth' / 'market_data_20251226.depth')
+    books = random_books(50)
+    writer = DepthWriter(path, levels=8, keyframe_interval=10)
+    # Levels arrive unordered, as the API sends them
+    writer.write_books((START + pd.Timedelta(seconds=i), TARGET_TIME, EXPIRATION, 'Up',
+                        list(bids.items())[::-1], list(asks.items()))
+                       for i, (bids, asks) in enumerate(books[:30]))
+    # Reopening continues the file
+    DepthWriter(path).write_books((START + pd.Timedelta(seconds=i), TARGET_TIME, EXPIRATION, 'Up', *map(dict.items, books[i]))
+                                  for i in range(30, 50))
+
+    reader = DepthReader(path)
+    assert reader.markets() == [(TARGET_TIME, EXPIRATION, 'Up')]
+    for i, (timestamp, bids, asks) in enumerate(reader.iter_books(TARGET_TIME, EXPIRATION, 'Up')):
+        assert timestamp == START + pd.Timedelta(seconds=i)
+        assert (bids, asks) == expected_levels(*books[i], 8)
+
+    # Between captures the last one applies; before the first there is no book
+    captured_at, bids, asks = reader.book_at(TARGET_TIME, EXPIRATION, 'Up', START + pd.Timedelta(seconds=24.5))
+    assert captured_at == START + pd.Timedelta(seconds=24)
+    assert (bids, asks) == expected_levels(*books[24], 8)
+    assert reader.book_at(TARGET_TIME, EXPIRATION, 'Up', START - pd.Timedelta(seconds=1)) is None
+
+    # Deltas keep the file far smaller than full snapshots
+    assert os.path.getsize(path) < 50 * 16 * 6
@@ -0,0 +1,79 @@
+import shutil
+import pandas as pd
+import pytest
+import src.config as config
+from src.storage.market_index import MarketIndex, build_file_index, load_date_range, load_file_index
+from src.storage.market_store import convert_data_file, read_market_csv
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+FIRST_MARKET = (pd.Timestamp('2025-12-26 10:45', tz='UTC'), pd.Timestamp('2025-12-26 10:45', tz='UTC'))
+SECOND_MARKET = (pd.Timestamp('2025-12-26 11:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00', tz='UTC'))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    shutil.copy(TEST_DATA_FILE, tmp_path / 'market_data_20251226.csv')
+    # The next day's file holds the rest of the 11:00 market and a new one
+    next_day = read_market_csv(TEST_DATA_FILE).iloc[4:6].copy()
+    next_day['Timestamp'] += pd.Timedelta(minutes=1)
+    extra = next_day.iloc[[0]].copy()
+    for col in ('Timestamp', 'TargetTime', 'Expiration'):
+        extra[col] += pd.Timedelta(days=1)
+    next_day = pd.concat([next_day, extra], ignore_index=True)
+    for col in ('Timestamp', 'TargetTime', 'Expiration'):
+        next_day[col] = next_day[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+    next_day.to_csv(tmp_path / 'market_data_20251227.csv', index=False)
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_file_index_records_rows_and_bytes(data_dir):
+    data_file = str(data_dir / 'market_data_20251226.csv')
+    entries = build_file_index(data_file)
+    assert entries['Rows'].tolist() == [4, 3]
+    assert entries['RowStart'].tolist() == [0, 4]
+    assert entries['RowStop'].tolist() == [4, 7]
+
+    with open(data_file, 'rb') as f:
+        data = f.read()
+    second = entries.iloc[1]
+    assert data[second['ByteStart']:second['ByteStop']].startswith(b'2025-12-26 10:45:14')
+    assert second['ByteStop'] == len(data)
+
+    # The first load writes the sidecar, the second reads it back
+    load_file_index(data_file)
+    assert (data_dir / 'cache' / 'market_data_20251226.index.csv').exists()
+    pd.testing.assert_frame_equal(load_file_index(data_file), entries)
+
+
+def test_markets_are_selected_by_file_date(data_dir):
+    index = MarketIndex.for_dates(20251226, 20251226)
+    assert len(index.data_files) == 2  # plus the next day, to complete straddling markets
+    assert index.markets(20251226, 20251226) == [FIRST_MARKET, SECOND_MARKET]
+    assert index.markets(market=SECOND_MARKET) == [SECOND_MARKET]
+    assert len(index.markets(20251227)) == 2
+    assert index.markets(pd.Timestamp('2025-12-26 10:45:10', tz='UTC')) == [SECOND_MARKET] + index.markets(20251227)[1:]
+
+
+def test_load_date_range_matches_whole_file(data_dir):
+    expected = read_market_csv(str(data_dir / 'market_data_20251226.csv'))
+    df = load_date_range(20251226, 20251226)
+    assert len(df) == len(expected) + 2  # the 11:00 market's rows from the next file
+    pd.testing.assert_frame_equal(df.iloc[:len(expected)], expected)
+
+    single = load_date_range(20251226, 20251226, market=FIRST_MARKET, columns=['Timestamp', 'UpAsk'])
+    assert list(single.columns) == ['Timestamp', 'UpAsk']
+    pd.testing.assert_frame_equal(single, expected[['Timestamp', 'UpAsk']].iloc[:4])
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather', 'ticks'])
+def test_load_reads_store_copies(data_dir, fmt):
+    if fmt != 'ticks':
+        pytest.importorskip('pyarrow')
+    data_file = str(data_dir / 'market_data_20251226.csv')
+    expected = load_date_range(20251226, 20251226, market=SECOND_MARKET)
+    convert_data_file(data_file, fmt)
+    actual = load_date_range(20251226, 20251226, market=SECOND_MARKET)
+    assert sorted(actual.columns) == sorted(expected.columns)
+    for col in expected.columns:
+        assert (actual[col].to_numpy() == expected[col].to_numpy()).all(), col
@@ -0,0 +1,52 @@
+import os
+import shutil
+import pandas as pd
+import pytest
+import src.config as config
+from src.storage.market_store import (
+    convert_data_file, find_store_file, iter_market_data_chunks, load_market_data, read_market_csv
+)
+
+pytest.importorskip('pyarrow')
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'market_data_20251226.csv'
+    shutil.copy(TEST_DATA_FILE, path)
+    return str(path)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_store_round_trips_csv(data_file, fmt):
+    expected = read_market_csv(data_file)
+    assert str(expected['Timestamp'].dt.tz) == 'UTC'
+
+    store_file = convert_data_file(data_file, fmt)
+    assert store_file == config.get_store_filename(data_file, fmt)
+    assert find_store_file(data_file) == store_file
+    pd.testing.assert_frame_equal(load_market_data(data_file), expected)
+
+    chunks = list(iter_market_data_chunks(data_file, chunk_rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_columns_are_projected_in_order(data_file):
+    convert_data_file(data_file, 'parquet')
+    for df in (load_market_data(data_file, columns=['UpAsk', 'Timestamp', 'NotAColumn']),
+               read_market_csv(data_file, columns=['UpAsk', 'Timestamp', 'NotAColumn'])):
+        assert list(df.columns) == ['UpAsk', 'Timestamp']
+
+
+def test_stale_store_falls_back_to_csv(data_file):
+    store_file = convert_data_file(data_file, 'parquet')
+    os.utime(store_file, (0, 0))
+    assert find_store_file(data_file) is None
+
+    os.remove(data_file)
+    assert find_store_file(data_file) == store_file
+    with pytest.raises(FileNotFoundError):
+        load_market_data(os.path.join(os.path.dirname(data_file), 'market_data_20000101.csv'))
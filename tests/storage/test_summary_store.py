@@ -0,0 +1,26 @@
+import pandas as pd
+import src.config as config
+from src.storage.market_store import read_market_csv
+from src.storage.summary_store import append_summary_file, build_summary, merge_summaries, read_summary_file
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+def test_merged_batches_equal_one_pass():
+    df = read_market_csv(TEST_DATA_FILE)
+    expected = build_summary(df)
+    merged = pd.DataFrame()
+    for start in range(0, len(df), 2):
+        merged = merge_summaries([merged, build_summary(df.iloc[start:start + 2])])
+    pd.testing.assert_frame_equal(merged, expected, check_dtype=False)
+
+
+def test_appended_batches_are_merged_when_read(tmp_path):
+    df = read_market_csv(TEST_DATA_FILE)
+    data_file = str(tmp_path / 'market_data_20251226.csv')
+    for start in range(0, len(df), 3):
+        append_summary_file(data_file, build_summary(df.iloc[start:start + 3]))
+
+    summary_file = config.get_sidecar_filename(data_file, 'summary')
+    assert len(pd.read_csv(summary_file)) > df.groupby(['TargetTime', 'Expiration']).ngroups
+    pd.testing.assert_frame_equal(read_summary_file(summary_file), build_summary(df), check_dtype=False)
@@ -0,0 +1,48 @@
+import pandas as pd
+import src.config as config
+from src.storage.market_index import load_date_range
+from src.storage.market_store import read_market_csv
+from src.storage.tick_db import TickDatabase
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+SECOND_MARKET = (pd.Timestamp('2025-12-26 11:00', tz='UTC'), pd.Timestamp('2025-12-26 11:00', tz='UTC'))
+
+
+def _write_data_file(tmp_path):
+    """The test data with every logger column (the fields it lacks are zero)."""
+    data_file = str(tmp_path / 'market_data_20251226.csv')
+    pd.read_csv(TEST_DATA_FILE).reindex(columns=config.MARKET_DATA_COLUMNS, fill_value=0.0).to_csv(data_file, index=False)
+    return data_file
+
+
+def test_import_and_query_match_the_csv(tmp_path):
+    data_file = _write_data_file(tmp_path)
+    expected = read_market_csv(data_file)
+
+    with TickDatabase(str(tmp_path / 'ticks.sqlite')) as db:
+        assert db.import_csv(data_file) == len(expected)
+        assert db.import_csv(data_file) == len(expected)  # re-importing replaces the day
+        assert db.file_dates() == [20251226]
+        pd.testing.assert_frame_equal(db.query(20251226, 20251226), expected)
+        assert db.query(20251227, None).empty
+
+        market = db.query(market=SECOND_MARKET, columns=['Timestamp', 'UpAsk'])
+        pd.testing.assert_frame_equal(market, expected.loc[expected['TargetTime'] == SECOND_MARKET[0], ['Timestamp', 'UpAsk']].reset_index(drop=True))
+
+        window = db.query(expected['Timestamp'].iloc[1], expected['Timestamp'].iloc[3])
+        pd.testing.assert_frame_equal(window, expected.iloc[1:3].reset_index(drop=True))
+
+
+def test_logger_rows_and_date_range_loads(tmp_path, monkeypatch):
+    data_file = _write_data_file(tmp_path)
+    rows = pd.read_csv(data_file).values.tolist()
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(config, 'TICK_DB_FILE', str(tmp_path / 'ticks.sqlite'))
+
+    with TickDatabase() as db:
+        db.insert_rows(rows[:3], data_file)
+        db.insert_rows(rows[3:], data_file)
+    expected = load_date_range(20251226, 20251226)
+    monkeypatch.setattr(config, 'TICK_DB_ENABLED', True)
+    pd.testing.assert_frame_equal(load_date_range(20251226, 20251226), expected)
+    pd.testing.assert_frame_equal(load_date_range(20251226, 20251226, SECOND_MARKET, ['UpBid']), expected.loc[expected['TargetTime'] == SECOND_MARKET[0], ['UpBid']].reset_index(drop=True))
@@ -0,0 +1,79 @@
+import shutil
+import struct
+import numpy as np
+import pandas as pd
+import pytest
+import src.config as config
+from src.storage.market_store import (
+    convert_data_file, find_store_file, iter_market_data_chunks, load_market_data, read_market_csv
+)
+from src.storage.tick_store import TICK_DTYPE, TICK_MAGIC, TickFile, write_tick_file
+
+TEST_DATA_FILE = 'tests/data/test_market_data.csv'
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'market_data_20251226.csv'
+    shutil.copy(TEST_DATA_FILE, path)
+    return str(path)
+
+
+def _assert_same_values(actual, expected):
+    # Tick files always return the logger's column order
+    assert sorted(actual.columns) == sorted(expected.columns)
+    for col in expected.columns:
+        assert (actual[col].to_numpy() == expected[col].to_numpy()).all(), col
+
+
+def test_tick_file_is_memory_mapped_and_round_trips(data_file, tmp_path):
+    expected = read_market_csv(data_file)
+    path = write_tick_file(expected, str(tmp_path / 'day.ticks'))
+
+    tick_file = TickFile(path)
+    assert len(tick_file) == len(expected)
+    assert isinstance(tick_file.records, np.memmap)
+    assert tick_file.records.dtype == TICK_DTYPE
+    assert tick_file.column('MarketId').tolist() == [0, 0, 0, 0, 1, 1, 1]
+    assert tick_file.column('Timestamp')[0] == expected['Timestamp'].iloc[0].value // 1_000_000
+
+    _assert_same_values(tick_file.to_frame(), expected)
+    _assert_same_values(tick_file.to_frame(['UpAsk', 'Expiration'], start=3, stop=5),
+                        expected[['UpAsk', 'Expiration']].iloc[3:5].reset_index(drop=True))
+
+
+def test_loaders_read_tick_store(data_file):
+    expected = read_market_csv(data_file)
+    convert_data_file(data_file, 'ticks')
+
+    _assert_same_values(load_market_data(data_file), expected)
+    chunks = list(iter_market_data_chunks(data_file, chunk_rows=4))
+    assert [len(chunk) for chunk in chunks] == [4, 3]
+    _assert_same_values(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'bogus.ticks'
+    path.write_bytes(b'\0' * 128)
+    with pytest.raises(ValueError):
+        TickFile(str(path))
+
+
+def test_large_liquidity_round_trips_exactly(data_file, tmp_path):
+    expected = read_market_csv(data_file)
+    # Well past float32's exact range at 3 decimals (~16,777)
+    expected['UpAskLiquidity'] = np.round(np.linspace(20_000.001, 9_876_543.219, len(expected)), 3)
+    path = write_tick_file(expected, str(tmp_path / 'day.ticks'))
+    _assert_same_values(TickFile(path).to_frame(), expected)
+
+
+def test_older_tick_files_are_skipped(data_file, monkeypatch, capsys):
+    monkeypatch.setattr(config, 'STORE_FORMAT', 'ticks')
+    store_file = convert_data_file(data_file, 'ticks')
+    assert find_store_file(data_file) == store_file
+
+    with open(store_file, 'r+b') as f:
+        f.write(struct.pack('<8sI', TICK_MAGIC, 1))  # a version 1 header
+    assert find_store_file(data_file) is None
+    assert 'older tick file layout' in capsys.readouterr().out
+    _assert_same_values(load_market_data(data_file), read_market_csv(data_file))
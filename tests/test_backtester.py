@@ -1,6 +1,9 @@
+import json
+import os
 import pytest
 import pandas as pd
-from src.analysis.backtester import Backtester
+import logging
+from src.analysis.backtester import Backtester, CONSOLE_LOGGER_NAME, FILE_LOGGER_NAME
 from src.analysis.strategies.base_strategy import Strategy
 
 TEST_DATA_FILE = 'tests/data/test_market_data.csv'
@@ -180,3 +183,111 @@ def test_trade_at_expiration():
 
     assert len(backtester.transactions) == 0
     print("Trade at expiration correctly rejected.")
+
+def test_columnar_engine_matches_pandas_engine():
+    print("Testing that the columnar engine reproduces the pandas engine...")
+
+    class EveryRowStrategy(Strategy):
+        def decide(self, data_point, capital):
+            if data_point['UpAsk'] < 0.6:
+                return ('Up', 1, data_point['UpAsk'], 0)
+            return ('Down', 1, data_point.get('DownAsk'), 0)
+
+    results = {}
+    for engine in ('pandas', 'columnar'):
+        backtester = Backtester(initial_capital=100)
+        backtester.load_data(TEST_DATA_FILE)
+        backtester.run_strategy(EveryRowStrategy(), engine=engine)
+        results[engine] = (backtester.capital, backtester.transactions)
+
+    assert results['columnar'] == results['pandas']
+    print("Columnar engine matches the pandas engine.")
+
+def test_unknown_engine_rejected():
+    backtester = Backtester()
+    backtester.load_data(TEST_DATA_FILE)
+    with pytest.raises(ValueError):
+        backtester.run_strategy(Strategy(), engine='spark')
+
+def test_apply_slippage_batch_matches_single_lookups():
+    print("Testing batch slippage pricing...")
+    backtester = Backtester(slippage_seconds=2)
+    backtester.load_data(TEST_DATA_FILE)
+
+    market1_id = (pd.to_datetime('2025-12-26 10:45:00+00:00'), pd.to_datetime('2025-12-26 10:45:00+00:00'))
+    market2_id = (pd.to_datetime('2025-12-26 11:00:00+00:00'), pd.to_datetime('2025-12-26 11:00:00+00:00'))
+    fills = [
+        (pd.to_datetime('2025-12-26 10:34:14+00:00'), market1_id, 'Up', 0.5),
+        (pd.to_datetime('2025-12-26 10:45:14+00:00'), market2_id, 'Down', 0.52),
+        (pd.to_datetime('2025-12-26 10:34:14+00:00'), market1_id, 'Down', 0.52),
+        (pd.to_datetime('2025-12-26 12:00:00+00:00'), market2_id, 'Up', 0.4), # No future data
+    ]
+
+    expected = [backtester._apply_slippage(*fill) for fill in fills]
+    assert backtester.apply_slippage_batch(fills) == expected
+    assert expected[0] == 0.55
+    assert expected[3] == 0.4
+    print("Batch slippage pricing matches single lookups.")
+
+def test_journal_log_mode_writes_trades_as_jsonl(backtest_log_dir):
+    with Backtester(log_mode='journal') as backtester:
+        backtester.load_data(TEST_DATA_FILE)
+        backtester.run_strategy(DummyStrategy(trade_decision=('Up', 10, 0.5)))
+        journal_file = backtester.journal.filename
+    assert os.path.dirname(journal_file) == str(backtest_log_dir)
+
+    with open(journal_file) as f:
+        entries = [json.loads(line) for line in f]
+    assert [e['type'] for e in entries] == [t['Type'] for t in backtester.transactions]
+    assert entries[0]['quantity'] == 10 and entries[1]['winning_side'] == 'Up'
+    assert backtester.logger.handlers == [] and backtester.console_logger.handlers == []
+
+def test_off_log_mode_writes_no_files(backtest_log_dir):
+    with Backtester(log_mode='off') as backtester:
+        backtester.load_data(TEST_DATA_FILE)
+        backtester.run_strategy(DummyStrategy(trade_decision=('Up', 10, 0.5)))
+
+    assert len(backtester.transactions) == 2
+    assert not os.path.exists(backtest_log_dir)
+
+def test_backtesters_share_loggers_but_not_handlers(capsys):
+    with Backtester(log_mode='off') as first, Backtester(log_mode='off') as second:
+        assert first.console_logger.logger is second.console_logger.logger is logging.getLogger(CONSOLE_LOGGER_NAME)
+        first.console_logger.info('first run')
+        second.console_logger.info('second run')
+        handlers = first.console_logger.handlers + second.console_logger.handlers
+
+    # Each message went through its own Backtester's console handler only
+    assert capsys.readouterr().err.count('first run') == 1
+    assert not set(handlers) & set(logging.getLogger(CONSOLE_LOGGER_NAME).handlers)
+
+def test_unclosed_backtester_detaches_its_handlers_when_collected():
+    backtester = Backtester(log_mode='summary')
+    handlers = backtester.logger.handlers + backtester.console_logger.handlers
+    del backtester
+
+    shared = logging.getLogger(FILE_LOGGER_NAME).handlers + logging.getLogger(CONSOLE_LOGGER_NAME).handlers
+    assert not set(handlers) & set(shared)
+
+def test_unknown_log_mode_rejected():
+    with pytest.raises(ValueError):
+        Backtester(log_mode='verbose')
+
+def test_winning_and_losing_trades_counted_per_lot():
+    # Figures for 2025-12-26 from the code before open lots were netted per
+    # (market, side), with load_data's Timestamp sort made stable
+    from src.analysis.strategies.rebalancing_strategy import RebalancingStrategy
+    from src.analysis.strategies.avg_arbitrage_strategy import AvgArbitrageStrategy
+
+    expected = [
+        (RebalancingStrategy(), (71, 77)),
+        (AvgArbitrageStrategy(margin=0.025, initial_trade_capital_percentage=0.08,
+                              max_capital_allocation_percentage=0.70), (157, 171)),
+    ]
+    backtester = Backtester(initial_capital=1000, log_mode='off')
+    backtester.show_progress = False
+    backtester.load_data('data/market_data_20251226.csv')
+    for strategy, counts in expected:
+        backtester.reset()
+        backtester.run_strategy(strategy)
+        assert backtester._count_winning_trades() == counts